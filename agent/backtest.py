@@ -0,0 +1,353 @@
+import itertools
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Parameters that change how sentiment is aggregated; configs sharing them share features
+FEATURE_PARAMS = ("frequency", "lookback")
+
+# Configs per task when a sweep is spread over worker processes
+CHUNK_SIZE = 2048
+
+# Per-signal statistics. Signals on nearby bars hold overlapping positions, so
+# sum_trade_return adds up overlapping exposure rather than compounding one
+# portfolio, and t_stat (mean / std * sqrt(trades)) is the significance of the
+# mean trade return, not an annualized Sharpe ratio
+METRICS = ["trades", "hit_rate", "mean_return", "sum_trade_return", "t_stat"]
+
+
+class StrategyConfig(BaseModel):
+    """Parameters of a sentiment-driven signal strategy"""
+    frequency: str = "1h"  # Bar size used to aggregate sentiment and prices
+    lookback: int = 24  # Bars of sentiment combined into each decision
+    min_articles: int = 1  # Minimum analyses in the lookback window
+    min_confidence: float = 0.6  # Minimum mean confidence, like the agent's confidence > 0.6 filter
+    buy_threshold: float = 0.3  # Weighted sentiment above which to buy
+    sell_threshold: float = -0.3  # Weighted sentiment below which to sell
+    holding_period: int = 24  # Bars each signal is held
+    allow_short: bool = True  # Sell signals open short positions instead of staying flat
+    fee_bps: float = 10.0  # Round-trip cost per trade in basis points
+
+
+def load_prices(path: str) -> pd.DataFrame:
+    """
+    Load OHLC prices from CSV
+
+    Args:
+        path: A CSV with an "asset" column, or a directory of {asset}.csv files
+
+    Returns:
+        DataFrame with asset, timestamp (UTC) and close columns
+    """
+    path = Path(path)
+    files = sorted(path.glob("*.csv")) if path.is_dir() else [path]
+
+    frames = []
+    for file in files:
+        frame = pd.read_csv(file)
+        frame.columns = [column.strip().lower() for column in frame.columns]
+        time_column = next((c for c in ("timestamp", "date", "time", "datetime") if c in frame.columns), None)
+        if time_column is None or "close" not in frame.columns:
+            raise ValueError(f"{file} needs a timestamp/date column and a close column")
+
+        timestamps = frame[time_column]
+        if pd.api.types.is_numeric_dtype(timestamps):
+            # Unix seconds or milliseconds
+            unit = "ms" if timestamps.max() > 1e11 else "s"
+            timestamps = pd.to_datetime(timestamps, unit=unit, utc=True)
+        else:
+            timestamps = pd.to_datetime(timestamps, utc=True)
+
+        frames.append(pd.DataFrame({
+            "asset": frame["asset"] if "asset" in frame.columns else file.stem,
+            "timestamp": timestamps,
+            "close": frame["close"].astype(float),
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_sentiment(path: str) -> pd.DataFrame:
+    """
+    Load recorded sentiment analyses from CSV
+
+    Args:
+        path: CSV with timestamp, sentiment_score, confidence and either an
+              "asset" column or an "entities" column (JSON list or ';'-separated)
+
+    Returns:
+        DataFrame with timestamp (UTC), asset, sentiment_score and confidence columns
+    """
+    frame = pd.read_csv(path)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+
+    if "asset" not in frame.columns:
+        def split(entities):
+            if isinstance(entities, str) and entities.startswith("["):
+                return json.loads(entities)
+            return [e.strip() for e in str(entities).split(";") if e.strip()]
+
+        frame["asset"] = frame["entities"].map(split)
+        frame = frame.explode("asset").dropna(subset=["asset"])
+
+    return frame[["timestamp", "asset", "sentiment_score", "confidence"]].reset_index(drop=True)
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[StrategyConfig]:
+    """
+    Build every combination of the given parameter values
+
+    Args:
+        grid: Mapping of StrategyConfig field name to candidate values
+
+    Returns:
+        List of StrategyConfig objects
+    """
+    names = list(grid)
+    return [StrategyConfig(**dict(zip(names, values))) for values in itertools.product(*grid.values())]
+
+
+class Features:
+    """Aligned sentiment features and prices for one aggregation setting, flattened across assets"""
+
+    def __init__(self, score: np.ndarray, confidence: np.ndarray, count: np.ndarray,
+                 close: np.ndarray, asset_ids: np.ndarray):
+        self.score = score
+        self.confidence = confidence
+        self.count = count
+        self.close = close
+        self.asset_ids = asset_ids
+
+    def forward_returns(self, holding_period: int) -> np.ndarray:
+        """Return from each bar's close to the close holding_period bars later, NaN across asset boundaries"""
+        returns = np.full(len(self.close), np.nan)
+        if holding_period < len(self.close):
+            future = self.close[holding_period:]
+            same_asset = self.asset_ids[holding_period:] == self.asset_ids[:-holding_period]
+            returns[:-holding_period] = np.where(same_asset, future / self.close[:-holding_period] - 1.0, np.nan)
+        return returns
+
+
+# Columns of the parameter matrix passed to evaluate()
+PARAM_COLUMNS = ["min_confidence", "min_articles", "buy_threshold", "sell_threshold",
+                 "allow_short", "fee_bps", "holding_period"]
+
+
+def param_matrix(configs: List[StrategyConfig]) -> np.ndarray:
+    """Pack the per-config parameters into a float array, cheap to ship to worker processes"""
+    return np.array([[float(getattr(config, name)) for name in PARAM_COLUMNS] for config in configs])
+
+
+def _suffix(prefix: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Sum of elements [index:] given a prefix-sum array with a leading zero"""
+    return prefix[-1] - prefix[index]
+
+
+def evaluate(features: Features, params: np.ndarray) -> np.ndarray:
+    """
+    Evaluate many configs that share the same features
+
+    For each holding period and eligibility filter, eligible bars are sorted by
+    score once and prefix sums of forward returns are built. A buy threshold then
+    selects a suffix and a sell threshold a prefix of that order, so every
+    threshold pair is scored with a binary search instead of a pass over the bars.
+    Every eligible bar is its own trade, so the metrics describe signals, not
+    the P&L of a single account (see METRICS).
+
+    Args:
+        features: Aligned features for the configs' aggregation setting
+        params: Parameter matrix from param_matrix()
+
+    Returns:
+        Array of shape (len(params), len(METRICS))
+    """
+    results = np.zeros((len(params), len(METRICS)))
+    min_confidence, min_articles, buy_threshold, sell_threshold, allow_short, fee_bps, holding_periods = params.T
+    fee = fee_bps / 10000.0
+
+    for holding_period in np.unique(holding_periods):
+        forward = features.forward_returns(int(holding_period))
+        valid = ~np.isnan(features.score) & ~np.isnan(forward)
+        in_holding = holding_periods == holding_period
+
+        filters = np.unique(np.column_stack([min_confidence[in_holding], min_articles[in_holding]]), axis=0)
+        for confidence_floor, article_floor in filters:
+            block = np.flatnonzero(in_holding & (min_confidence == confidence_floor) & (min_articles == article_floor))
+            eligible = valid & (features.confidence > confidence_floor) & (features.count >= article_floor)
+
+            order = np.argsort(features.score[eligible], kind="stable")
+            score = features.score[eligible][order]
+            returns = forward[eligible][order]
+
+            def prefix(values):
+                return np.concatenate([[0.0], np.cumsum(values)])
+
+            sums = prefix(returns)
+            squares = prefix(returns ** 2)
+            gains = prefix(returns > 0)
+            losses = prefix(returns < 0)
+
+            # Longs are bars with score > buy, shorts bars with score < sell; bars that
+            # satisfy both net out to no position
+            buy_start = np.searchsorted(score, buy_threshold[block], side="right")
+            sell_end = np.where(allow_short[block] > 0, np.searchsorted(score, sell_threshold[block], side="left"), 0)
+            long_start = np.maximum(buy_start, sell_end)
+            short_end = np.minimum(sell_end, buy_start)
+
+            n_long = len(score) - long_start
+            n_short = short_end
+            long_sum = _suffix(sums, long_start)
+            short_sum = sums[short_end]
+            long_squares = _suffix(squares, long_start)
+            short_squares = squares[short_end]
+            block_fee = fee[block]
+
+            trades = n_long + n_short
+            safe_trades = np.maximum(trades, 1)
+            total = long_sum - short_sum - trades * block_fee
+            mean = total / safe_trades
+            # Sum of squared trade returns: (r - fee)^2 for longs, (-r - fee)^2 for shorts
+            sum_squares = (long_squares - 2 * block_fee * long_sum + short_squares + 2 * block_fee * short_sum
+                           + trades * block_fee ** 2)
+            std = np.sqrt(np.maximum(sum_squares / safe_trades - mean ** 2, 0.0))
+            hits = _suffix(gains, long_start) + losses[short_end]
+
+            results[block, 0] = trades
+            results[block, 1] = hits / safe_trades
+            results[block, 2] = mean
+            results[block, 3] = total
+            results[block, 4] = np.divide(mean * np.sqrt(trades), std, out=np.zeros_like(mean), where=std > 0)
+
+    return results
+
+
+class Backtester:
+    def __init__(self, sentiment: pd.DataFrame, prices: pd.DataFrame):
+        """
+        Initialize the backtester
+
+        Args:
+            sentiment: Recorded analyses with timestamp, asset, sentiment_score and confidence
+                       (e.g. HistoryStore.load() or load_sentiment())
+            prices: Prices with asset, timestamp and close (e.g. load_prices())
+        """
+        self.sentiment = sentiment.copy()
+        self.prices = prices.copy()
+        # Match assets case-insensitively between sentiment and price data
+        self.sentiment["asset"] = self.sentiment["asset"].str.lower()
+        self.prices["asset"] = self.prices["asset"].str.lower()
+        self.sentiment["timestamp"] = pd.to_datetime(self.sentiment["timestamp"], utc=True)
+        self.prices["timestamp"] = pd.to_datetime(self.prices["timestamp"], utc=True)
+        self.features_cache = {}
+
+    def features(self, frequency: str, lookback: int) -> Features:
+        """
+        Aggregate sentiment onto price bars
+
+        Sentiment in bar t (timestamps in [t, t + frequency)) is only used for a
+        decision at the close of bar t, so there is no look-ahead.
+
+        Args:
+            frequency: Pandas offset string for the bar size
+            lookback: Number of bars of sentiment combined per decision
+
+        Returns:
+            Features flattened across assets
+        """
+        key = (frequency, lookback)
+        if key in self.features_cache:
+            return self.features_cache[key]
+
+        prices = self.prices.assign(bar=self.prices["timestamp"].dt.floor(frequency))
+        bars = prices.sort_values("timestamp").groupby(["asset", "bar"])["close"].last()
+
+        sentiment = self.sentiment.assign(
+            bar=self.sentiment["timestamp"].dt.floor(frequency),
+            weighted=self.sentiment["sentiment_score"] * self.sentiment["confidence"],
+        )
+        aggregated = sentiment.groupby(["asset", "bar"]).agg(
+            weighted=("weighted", "sum"),
+            confidence=("confidence", "sum"),
+            count=("confidence", "size"),
+        )
+
+        frame = pd.DataFrame({"close": bars}).join(aggregated, how="left").fillna(
+            {"weighted": 0.0, "confidence": 0.0, "count": 0})
+        rolled = frame.groupby(level="asset")[["weighted", "confidence", "count"]].rolling(
+            lookback, min_periods=1).sum().droplevel(0)
+        frame[["weighted", "confidence", "count"]] = rolled
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = (frame["weighted"] / frame["confidence"]).to_numpy()
+            confidence = (frame["confidence"] / frame["count"]).to_numpy()
+
+        features = Features(
+            score=score,
+            confidence=np.nan_to_num(confidence),
+            count=frame["count"].to_numpy(),
+            close=frame["close"].to_numpy(dtype=float),
+            asset_ids=pd.factorize(frame.index.get_level_values("asset"))[0],
+        )
+        self.features_cache[key] = features
+        return features
+
+    def run(self, config: StrategyConfig) -> Dict[str, float]:
+        """
+        Backtest a single strategy config
+
+        Returns:
+            Dictionary of metrics
+        """
+        return self.sweep([config]).iloc[0][METRICS].to_dict()
+
+    def sweep(self, configs: Union[List[StrategyConfig], Dict[str, Sequence]],
+              workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Backtest many strategy configs
+
+        Args:
+            configs: List of configs, or a parameter grid for expand_grid()
+            workers: Number of worker processes (evaluates in-process if None or 1)
+
+        Returns:
+            DataFrame with one row per config: its parameters plus trades, hit_rate,
+            mean_return, sum_trade_return and t_stat, sorted by sum_trade_return
+        """
+        if isinstance(configs, dict):
+            configs = expand_grid(configs)
+
+        groups = {}
+        for index, config in enumerate(configs):
+            key = tuple(getattr(config, name) for name in FEATURE_PARAMS)
+            groups.setdefault(key, []).append(index)
+
+        params = param_matrix(configs)
+        tasks = []
+        for (frequency, lookback), indices in groups.items():
+            features = self.features(frequency, lookback)
+            for start in range(0, len(indices), CHUNK_SIZE):
+                chunk = np.array(indices[start:start + CHUNK_SIZE])
+                tasks.append((chunk, features))
+
+        results = np.zeros((len(configs), len(METRICS)))
+        if workers and workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [(chunk, executor.submit(evaluate, features, params[chunk])) for chunk, features in tasks]
+                for chunk, future in futures:
+                    results[chunk] = future.result()
+        else:
+            for chunk, features in tasks:
+                results[chunk] = evaluate(features, params[chunk])
+
+        frame = pd.DataFrame([config.model_dump() for config in configs])
+        frame[METRICS] = results
+        frame["trades"] = frame["trades"].astype(int)
+        return frame.sort_values("sum_trade_return", ascending=False).reset_index(drop=True)
@@ -20,6 +20,12 @@ CRYPTO_NEWS_API_KEY = os.getenv("CRYPTO_NEWS_API_KEY", "")
 
 # OpenAI configuration
 OPENAI_API_KEY = get_required_env_var("OPEN_AI_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # e.g. http://127.0.0.1:8100/v1 for script/stub_openai_server.py
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+OPENAI_FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")  # Bulk batches and hedged requests
+OPENAI_BULK_BATCH_SIZE = int(os.getenv("OPENAI_BULK_BATCH_SIZE", "30"))  # Sentiment batches this large use the fast model
+OPENAI_HEDGE_AFTER = float(os.getenv("OPENAI_HEDGE_AFTER", "20"))  # Seconds, until a model's p95 is known
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
 
 # Twitter API configuration
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY", "")
@@ -38,5 +44,66 @@ TOP_CRYPTOCURRENCIES = [
     "Cardano", "Avalanche", "Dogecoin", "Polkadot", "Polygon"
 ]
 
+# Other names and tickers for each tracked asset; all-caps tickers only match in capitals
+ASSET_ALIASES = {
+    "Bitcoin": ["BTC", "XBT"],
+    "Ethereum": ["ETH", "Ether"],
+    "Solana": ["SOL"],
+    "BNB": ["Binance Coin"],
+    "XRP": ["Ripple"],
+    "Cardano": ["ADA"],
+    "Avalanche": ["AVAX"],
+    "Dogecoin": ["DOGE"],
+    "Polkadot": ["DOT"],
+    "Polygon": ["MATIC", "POL"],
+}
+
+# Drop articles that mention none of the tracked assets before any OpenAI call
+FILTER_UNTRACKED_ARTICLES = os.getenv("FILTER_UNTRACKED_ARTICLES", "true").lower() == "true"
+
 # Polling interval in seconds
-POLLING_INTERVAL = 3600  # 1 hour 
\ No newline at end of file
+POLLING_INTERVAL = 3600  # 1 hour
+
+# Feeds watched by the adaptive scheduler (comma-separated, defaults to FEED_URL)
+FEED_URLS = [url.strip() for url in os.getenv("FEED_URLS", FEED_URL).split(",") if url.strip()]
+
+# Adaptive polling configuration
+MIN_POLL_INTERVAL = int(os.getenv("MIN_POLL_INTERVAL", "60"))  # 1 minute
+MAX_POLL_INTERVAL = int(os.getenv("MAX_POLL_INTERVAL", str(4 * POLLING_INTERVAL)))  # Quiet feeds save budget for bursts
+# Average feed requests per hour across all feeds; defaults to the fixed-interval volume of one request per feed per hour
+POLL_BUDGET_PER_HOUR = float(os.getenv("POLL_BUDGET_PER_HOUR", str(len(FEED_URLS))))
+POLL_BURST_HOURS = float(os.getenv("POLL_BURST_HOURS", "4"))  # Hours of budget that can be saved up for a burst
+POLL_JITTER = 0.1  # +/- 10% of each interval
+
+# Analysis batching: run a cycle once enough articles are queued or the oldest one has waited too long
+MIN_BATCH_SIZE = int(os.getenv("MIN_BATCH_SIZE", "5"))
+MAX_BATCH_LATENCY = int(os.getenv("MAX_BATCH_LATENCY", "300"))  # 5 minutes
+# Cap on analysis cycles per hour; 0 for no cap
+MAX_BATCHES_PER_HOUR = int(os.getenv("MAX_BATCHES_PER_HOUR", "0")) or None
+ 
+
+# HTTP API configuration (serve mode)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", "30"))  # seconds
+
+# Local sentiment/signal history (partitioned Parquet)
+HISTORY_DIR = os.getenv("HISTORY_DIR", str(root_dir / "data" / "history"))
+
+# Shared coordination store for sharded workers (SQLite)
+COORDINATION_DB = os.getenv("COORDINATION_DB", str(root_dir / "data" / "coordination.db"))
+
+# Networks to record every sentiment on in parallel, primary first, as NAME or NAME=CONTRACT_ADDRESS
+# (e.g. "polygon-amoy,polygon,anvil=0x5FbDB2315678afecb367f032d93F642f64180aa3"); empty for --network only
+CHAIN_NETWORKS = [spec.strip() for spec in os.getenv("CHAIN_NETWORKS", "").split(",") if spec.strip()]
+
+# Write-ahead journal of cycle progress, replayed on startup to resume interrupted work
+JOURNAL_PATH = os.getenv("JOURNAL_PATH", str(root_dir / "data" / "journal.jsonl"))
+
+# Logging: records are written by a background thread to a rotating, gzip-compressed file
+LOG_FILE = os.getenv("LOG_FILE", str(root_dir / "logs" / "vypersense.log"))  # Empty to log to the console only
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"  # JSON lines instead of plain text
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "10"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN") or None  # e.g. "midnight" to rotate daily instead of by size
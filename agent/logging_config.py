@@ -0,0 +1,121 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Optional, TextIO
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that aren't user data passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments here, so later changes to them don't leak into the
+        # message; timestamps, formatting and I/O all happen on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _Listener(QueueListener):
+    def stop(self):
+        # Called from both the caller's shutdown path and atexit
+        if self._thread is not None:
+            super().stop()
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+def configure_logging(log_file: Optional[str] = None, level: str = "INFO", json_format: bool = False,
+                      max_bytes: int = 10 * 1024 * 1024, backup_count: int = 10, rotate_when: Optional[str] = None,
+                      compress: bool = True, stream: Optional[TextIO] = sys.stderr) -> QueueListener:
+    """
+    Route all logging through a queue to a background thread
+
+    The calling thread only enqueues the record; formatting, the console and
+    the rotating log file are handled by a QueueListener thread, so logging
+    never blocks the pipeline on disk I/O.
+
+    Args:
+        log_file: Path of the log file, or None to log to the console only
+        level: Root logger level name
+        json_format: Write JSON lines instead of plain text
+        max_bytes: Rotate the file once it reaches this size (ignored when rotate_when is set)
+        backup_count: Number of rotated files to keep
+        rotate_when: Rotate on time instead of size, as for TimedRotatingFileHandler (e.g. 'midnight')
+        compress: Gzip rotated files
+        stream: Console stream, or None to disable console output
+
+    Returns:
+        The running listener; call stop() to flush queued records (also done at exit)
+    """
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+
+    if stream is not None:
+        handlers.append(logging.StreamHandler(stream))
+
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if rotate_when:
+            file_handler = TimedRotatingFileHandler(log_file, when=rotate_when, backupCount=backup_count,
+                                                    encoding="utf-8", utc=True)
+        else:
+            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                               encoding="utf-8")
+        if compress:
+            file_handler.namer = _gzip_namer
+            file_handler.rotator = _gzip_rotator
+        handlers.append(file_handler)
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+    listener = _Listener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
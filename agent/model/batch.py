@@ -0,0 +1,281 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from agent.model.sentiment import SentimentAnalysis, TradingSignal
+
+
+def _encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Intern repeated strings as int32 codes into a vocabulary"""
+    codes, vocabulary = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    return codes.astype(np.int32), [str(value) for value in vocabulary]
+
+
+def _encode_lists(lists: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Flatten lists of strings into offsets plus interned codes (CSR layout)"""
+    lengths = np.fromiter((len(values) for values in lists), dtype=np.int64, count=len(lists))
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = [value for values in lists for value in values]
+    codes, vocabulary = _encode(flat) if flat else (np.zeros(0, dtype=np.int32), [])
+    return offsets, codes, vocabulary
+
+
+def _decode_lists(offsets: np.ndarray, codes: np.ndarray, vocabulary: List[str]) -> List[List[str]]:
+    flat = [vocabulary[code] for code in codes.tolist()]
+    bounds = offsets.tolist()
+    return [flat[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _to_micros(timestamps: Iterable[datetime]) -> np.ndarray:
+    # Naive datetimes are local time, as produced by datetime.now()
+    return np.array([round(timestamp.timestamp() * 1_000_000) for timestamp in timestamps], dtype=np.int64)
+
+
+def _from_micros(micros: np.ndarray) -> List[datetime]:
+    return [datetime.fromtimestamp(value / 1_000_000) for value in micros.tolist()]
+
+
+def _strings_nbytes(values: Iterable[Optional[str]]) -> int:
+    return sum(len(value.encode("utf-8")) for value in values if value is not None)
+
+
+class SentimentBatch:
+    def __init__(self, timestamps: np.ndarray, sentiment_scores: np.ndarray, confidences: np.ndarray,
+                 headlines: np.ndarray, summaries: np.ndarray, source_codes: np.ndarray, sources: List[str],
+                 entity_offsets: np.ndarray, entity_codes: np.ndarray, entities: List[str],
+                 article_ids: Optional[np.ndarray] = None):
+        """
+        Columnar container for many sentiment analyses
+
+        Numeric fields are NumPy arrays; sources and entities are interned into
+        vocabularies so each distinct string is stored once. Entities use a CSR
+        layout: the entities of row i are entity_codes[entity_offsets[i]:entity_offsets[i + 1]].
+        Building a batch does not validate, so only build batches from data that was already checked.
+
+        Args:
+            timestamps: UTC epoch microseconds (int64)
+            sentiment_scores: Sentiment scores (float64)
+            confidences: Confidence scores (float64)
+            headlines: Headlines (object array)
+            summaries: Summaries (object array)
+            source_codes: Index of each row's source in `sources` (int32)
+            sources: Source vocabulary
+            entity_offsets: Row boundaries into entity_codes (int64, length n + 1)
+            entity_codes: Index of each entity in `entities` (int32)
+            entities: Entity vocabulary
+            article_ids: IDs of the analyzed articles (object array, None where unknown);
+                         all None if not given
+        """
+        self.timestamps = timestamps
+        self.sentiment_scores = sentiment_scores
+        self.confidences = confidences
+        self.headlines = headlines
+        self.summaries = summaries
+        self.source_codes = source_codes
+        self.sources = sources
+        self.entity_offsets = entity_offsets
+        self.entity_codes = entity_codes
+        self.entities = entities
+        self.article_ids = article_ids if article_ids is not None else np.full(len(timestamps), None, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_models(cls, analyses: Sequence[SentimentAnalysis]) -> "SentimentBatch":
+        source_codes, sources = _encode([analysis.source for analysis in analyses])
+        entity_offsets, entity_codes, entities = _encode_lists([analysis.entities for analysis in analyses])
+        return cls(
+            timestamps=_to_micros(analysis.timestamp for analysis in analyses),
+            sentiment_scores=np.array([analysis.sentiment_score for analysis in analyses], dtype=np.float64),
+            confidences=np.array([analysis.confidence for analysis in analyses], dtype=np.float64),
+            headlines=np.array([analysis.headline for analysis in analyses], dtype=object),
+            summaries=np.array([analysis.summary for analysis in analyses], dtype=object),
+            source_codes=source_codes,
+            sources=sources,
+            entity_offsets=entity_offsets,
+            entity_codes=entity_codes,
+            entities=entities,
+            article_ids=np.array([analysis.article_id for analysis in analyses], dtype=object),
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "SentimentBatch":
+        """
+        Build a batch from a history frame (one row per asset, as returned by HistoryStore.load)
+
+        Each row becomes one analysis whose only entity is its asset.
+        """
+        count = len(frame)
+        timestamps = pd.to_datetime(frame["timestamp"], utc=True)
+        source_codes, sources = _encode(frame["source"].fillna("").to_numpy(dtype=object)) \
+            if "source" in frame.columns else (np.zeros(count, dtype=np.int32), [""])
+        entity_codes, entities = _encode(frame["asset"].to_numpy(dtype=object))
+        return cls(
+            timestamps=timestamps.dt.tz_convert(None).to_numpy(dtype="datetime64[us]").astype(np.int64),
+            sentiment_scores=frame["sentiment_score"].to_numpy(dtype=np.float64),
+            confidences=frame["confidence"].to_numpy(dtype=np.float64),
+            headlines=frame["headline"].to_numpy(dtype=object) if "headline" in frame.columns
+            else np.full(count, "", dtype=object),
+            summaries=frame["summary"].to_numpy(dtype=object) if "summary" in frame.columns
+            else np.full(count, "", dtype=object),
+            source_codes=source_codes,
+            sources=sources,
+            entity_offsets=np.arange(count + 1, dtype=np.int64),
+            entity_codes=entity_codes,
+            entities=entities,
+        )
+
+    def to_models(self) -> List[SentimentAnalysis]:
+        """
+        Convert back to SentimentAnalysis objects
+
+        Values are already plain Python types here, and pydantic-core validates
+        these flat models faster than model_construct builds them (see
+        script/bench_batch.py), so the regular constructor is used.
+
+        Returns:
+            List of SentimentAnalysis objects with naive local timestamps
+        """
+        timestamps = _from_micros(self.timestamps)
+        scores = self.sentiment_scores.tolist()
+        confidences = self.confidences.tolist()
+        sources = [self.sources[code] for code in self.source_codes.tolist()]
+        entities = _decode_lists(self.entity_offsets, self.entity_codes, self.entities)
+        return [
+            SentimentAnalysis(
+                headline=self.headlines[i],
+                source=sources[i],
+                timestamp=timestamps[i],
+                sentiment_score=scores[i],
+                confidence=confidences[i],
+                entities=entities[i],
+                summary=self.summaries[i],
+                article_id=self.article_ids[i],
+            )
+            for i in range(len(self))
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Flatten to one row per entity, in the layout of the sentiment history store
+
+        Analyses without entities get an empty asset, as in HistoryStore.append.
+        """
+        lengths = np.diff(self.entity_offsets)
+        rows = np.repeat(np.arange(len(self)), np.maximum(lengths, 1))
+        entity_vocabulary = np.array(self.entities + [""], dtype=object)
+
+        # Rows with no entities point at the trailing "" entry
+        assets = np.full(len(rows), len(self.entities), dtype=np.int64)
+        has_entities = np.repeat(lengths > 0, np.maximum(lengths, 1))
+        assets[has_entities] = self.entity_codes
+
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(self.timestamps[rows], unit="us", utc=True),
+            "asset": entity_vocabulary[assets],
+            "sentiment_score": self.sentiment_scores[rows],
+            "confidence": self.confidences[rows],
+            "headline": self.headlines[rows],
+            "source": np.array(self.sources, dtype=object)[self.source_codes[rows]]
+            if self.sources else np.full(len(rows), "", dtype=object),
+            "summary": self.summaries[rows],
+        })
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including string payloads"""
+        arrays = (self.timestamps, self.sentiment_scores, self.confidences, self.headlines, self.summaries,
+                  self.article_ids, self.source_codes, self.entity_offsets, self.entity_codes)
+        return (sum(array.nbytes for array in arrays)
+                + _strings_nbytes(self.headlines) + _strings_nbytes(self.summaries)
+                + _strings_nbytes(self.article_ids)
+                + _strings_nbytes(self.sources) + _strings_nbytes(self.entities))
+
+
+class SignalBatch:
+    def __init__(self, timestamps: np.ndarray, sentiment_scores: np.ndarray, confidences: np.ndarray,
+                 cryptocurrency_codes: np.ndarray, cryptocurrencies: List[str],
+                 signal_type_codes: np.ndarray, signal_types: List[str], reasonings: np.ndarray,
+                 image_urls: np.ndarray, source_offsets: np.ndarray, source_codes: np.ndarray, sources: List[str]):
+        """
+        Columnar container for many trading signals
+
+        Same layout as SentimentBatch: cryptocurrencies, signal types and sources
+        are interned, and sources use offsets into source_codes.
+        """
+        self.timestamps = timestamps
+        self.sentiment_scores = sentiment_scores
+        self.confidences = confidences
+        self.cryptocurrency_codes = cryptocurrency_codes
+        self.cryptocurrencies = cryptocurrencies
+        self.signal_type_codes = signal_type_codes
+        self.signal_types = signal_types
+        self.reasonings = reasonings
+        self.image_urls = image_urls
+        self.source_offsets = source_offsets
+        self.source_codes = source_codes
+        self.sources = sources
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_models(cls, signals: Sequence[TradingSignal]) -> "SignalBatch":
+        cryptocurrency_codes, cryptocurrencies = _encode([signal.cryptocurrency for signal in signals])
+        signal_type_codes, signal_types = _encode([signal.signal_type for signal in signals])
+        source_offsets, source_codes, sources = _encode_lists([signal.sources for signal in signals])
+        return cls(
+            timestamps=_to_micros(signal.timestamp for signal in signals),
+            sentiment_scores=np.array([signal.sentiment_score for signal in signals], dtype=np.float64),
+            confidences=np.array([signal.confidence for signal in signals], dtype=np.float64),
+            cryptocurrency_codes=cryptocurrency_codes,
+            cryptocurrencies=cryptocurrencies,
+            signal_type_codes=signal_type_codes,
+            signal_types=signal_types,
+            reasonings=np.array([signal.reasoning for signal in signals], dtype=object),
+            image_urls=np.array([signal.image_url for signal in signals], dtype=object),
+            source_offsets=source_offsets,
+            source_codes=source_codes,
+            sources=sources,
+        )
+
+    def to_models(self) -> List[TradingSignal]:
+        """
+        Convert back to TradingSignal objects
+
+        Returns:
+            List of TradingSignal objects with naive local timestamps
+        """
+        timestamps = _from_micros(self.timestamps)
+        scores = self.sentiment_scores.tolist()
+        confidences = self.confidences.tolist()
+        cryptocurrencies = [self.cryptocurrencies[code] for code in self.cryptocurrency_codes.tolist()]
+        signal_types = [self.signal_types[code] for code in self.signal_type_codes.tolist()]
+        sources = _decode_lists(self.source_offsets, self.source_codes, self.sources)
+        return [
+            TradingSignal(
+                cryptocurrency=cryptocurrencies[i],
+                signal_type=signal_types[i],
+                confidence=confidences[i],
+                sentiment_score=scores[i],
+                reasoning=self.reasonings[i],
+                timestamp=timestamps[i],
+                sources=sources[i],
+                image_url=self.image_urls[i],
+            )
+            for i in range(len(self))
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including string payloads"""
+        arrays = (self.timestamps, self.sentiment_scores, self.confidences, self.cryptocurrency_codes,
+                  self.signal_type_codes, self.reasonings, self.image_urls, self.source_offsets, self.source_codes)
+        return (sum(array.nbytes for array in arrays)
+                + _strings_nbytes(self.reasonings) + _strings_nbytes(self.image_urls)
+                + _strings_nbytes(self.cryptocurrencies) + _strings_nbytes(self.signal_types)
+                + _strings_nbytes(self.sources))
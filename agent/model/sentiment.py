@@ -12,6 +12,7 @@ class SentimentAnalysis(BaseModel):
     confidence: float  # 0.0 to 1.0
     entities: List[str]
     summary: str
+    article_id: Optional[str] = None  # ID of the analyzed article, echoed back by the model
     
     
 class TradingSignal(BaseModel):
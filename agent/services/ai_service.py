@@ -2,18 +2,238 @@ import json
 import logging
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Iterator, Optional
+from openai import OpenAI, AsyncOpenAI
 import requests
 
 from agent.model.sentiment import SentimentAnalysis, TradingSignal
+from agent.services.json_stream import JsonArrayStreamParser
+from agent.services.model_router import ModelRouter, HIGH, NORMAL
 
 logger = logging.getLogger(__name__)
 
 
 class AIService:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, base_url: Optional[str] = None, router: Optional[ModelRouter] = None):
+        """
+        Initialize the OpenAI-backed analysis service
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Alternative API endpoint, e.g. a local stub server
+            router: Model router for chat completions (a default one is created if None)
+        """
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.router = router or ModelRouter(AsyncOpenAI(api_key=api_key, base_url=base_url))
+
+    def _sentiment_request(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the chat completion arguments for sentiment analysis; the router picks the model"""
+        functions = [
+            {
+                "name": "analyze_crypto_sentiment",
+                "description": "Analyze sentiment of cryptocurrency news articles",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "analyses": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "article_id": {
+                                        "type": "string",
+                                        "description": "The id of the analyzed article, copied exactly from the input",
+                                    },
+                                    "headline": {
+                                        "type": "string",
+                                        "description": "The news headline",
+                                    },
+                                    "source": {
+                                        "type": "string",
+                                        "description": "Source of the article",
+                                    },
+                                    "sentiment_score": {
+                                        "type": "number",
+                                        "description": "Sentiment score from -1.0 (negative) to 1.0 (positive)",
+                                    },
+                                    "confidence": {
+                                        "type": "number",
+                                        "description": "Confidence in the sentiment analysis from 0.0 to 1.0",
+                                    },
+                                    "entities": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                        "description": "Cryptocurrency entities mentioned in the article",
+                                    },
+                                    "summary": {
+                                        "type": "string",
+                                        "description": "Brief summary of the sentiment analysis",
+                                    },
+                                },
+                                "required": ["article_id", "headline", "source", "sentiment_score", "confidence",
+                                             "entities", "summary"],
+                            },
+                        }
+                    },
+                    "required": ["analyses"],
+                },
+            }
+        ]
+
+        # Prepare articles for analysis
+        article_data = []
+        for article in articles:
+            data = {
+                "id": article["id"],
+                "title": article["title"],
+                "summary": article["summary"],
+                "source": article["source"],
+                "link": article["link"],
+                "published": article["published"].isoformat() if isinstance(article["published"], datetime) else article["published"]
+            }
+            # Assets found by the entity router, as a hint for entity extraction
+            if article.get("entities"):
+                data["mentioned_assets"] = article["entities"]
+            article_data.append(data)
+
+        return dict(
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are an expert cryptocurrency analyst with deep knowledge of market sentiment.
+                    Analyze each news article for sentiment regarding cryptocurrencies.
+                    For each article:
+                    1. Determine the overall sentiment (positive, negative, or neutral)
+                    2. Assign a sentiment score from -1.0 (very negative) to 1.0 (very positive)
+                    3. Identify which cryptocurrencies are mentioned
+                    4. Provide a brief summary of the sentiment analysis
+                    5. Assign a confidence score from 0.0 to 1.0 based on how clear the sentiment is
+                    
+                    Be precise and objective in your analysis. Focus on market implications rather than
+                    technological achievements unless they have clear market impact.""",
+                },
+                {
+                    "role": "user",
+                    "content": f"Analyze the sentiment of these cryptocurrency news articles: {json.dumps(article_data)}",
+                },
+            ],
+            functions=functions,
+            function_call={"name": "analyze_crypto_sentiment"},
+        )
+
+    def _signals_request(self, sentiment_analyses: List[SentimentAnalysis],
+                         top_cryptocurrencies: List[str]) -> Dict[str, Any]:
+        """Build the chat completion arguments for trading signal generation; the router picks the model"""
+        functions = [
+            {
+                "name": "generate_trading_signals",
+                "description": "Generate trading signals based on sentiment analyses",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "signals": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "cryptocurrency": {
+                                        "type": "string",
+                                        "description": "Name of the cryptocurrency",
+                                    },
+                                    "signal_type": {
+                                        "type": "string",
+                                        "description": "Type of trading signal: buy, sell, or hold",
+                                        "enum": ["buy", "sell", "hold"]
+                                    },
+                                    "confidence": {
+                                        "type": "number",
+                                        "description": "Confidence in the trading signal from 0.0 to 1.0",
+                                    },
+                                    "sentiment_score": {
+                                        "type": "number",
+                                        "description": "Overall sentiment score from -1.0 to 1.0",
+                                    },
+                                    "reasoning": {
+                                        "type": "string",
+                                        "description": "Reasoning behind the trading signal",
+                                    },
+                                    "sources": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                        "description": "Sources supporting this trading signal",
+                                    },
+                                },
+                                "required": ["cryptocurrency", "signal_type", "confidence", "sentiment_score", "reasoning", "sources"],
+                            },
+                        }
+                    },
+                    "required": ["signals"],
+                },
+            }
+        ]
+
+        # Prepare sentiment analyses for signal generation
+        sentiment_data = []
+        for analysis in sentiment_analyses:
+            sentiment_data.append({
+                "headline": analysis.headline,
+                "source": analysis.source,
+                "sentiment_score": analysis.sentiment_score,
+                "confidence": analysis.confidence,
+                "entities": analysis.entities,
+                "summary": analysis.summary,
+                "timestamp": analysis.timestamp.isoformat()
+            })
+
+        return dict(
+            messages=[
+                {
+                    "role": "system",
+                    "content": f"""You are an expert cryptocurrency trader who generates trading signals based on news sentiment.
+                    Focus on these top cryptocurrencies: {', '.join(top_cryptocurrencies)}.
+                    For each cryptocurrency that has significant sentiment data:
+                    1. Determine if the overall sentiment suggests a buy, sell, or hold signal
+                    2. Assign a confidence score from 0.0 to 1.0 based on the strength of the signal
+                    3. Calculate an overall sentiment score from -1.0 to 1.0
+                    4. Provide clear reasoning for the trading signal
+                    5. List the sources supporting this signal
+                    
+                    Be conservative with your signals - only suggest buy or sell when there is strong evidence.
+                    Otherwise, suggest hold. Consider both the sentiment score and confidence in your analysis.""",
+                },
+                {
+                    "role": "user",
+                    "content": f"Generate trading signals based on these sentiment analyses: {json.dumps(sentiment_data)}",
+                },
+            ],
+            functions=functions,
+            function_call={"name": "generate_trading_signals"},
+        )
+
+    @staticmethod
+    def _to_sentiment_analysis(analysis: Dict[str, Any]) -> SentimentAnalysis:
+        return SentimentAnalysis(
+            headline=analysis["headline"],
+            source=analysis["source"],
+            timestamp=datetime.now(),
+            sentiment_score=analysis["sentiment_score"],
+            confidence=analysis["confidence"],
+            entities=analysis["entities"],
+            summary=analysis["summary"],
+            article_id=analysis.get("article_id")
+        )
+
+    @staticmethod
+    def _to_trading_signal(signal: Dict[str, Any]) -> TradingSignal:
+        return TradingSignal(
+            cryptocurrency=signal["cryptocurrency"],
+            signal_type=signal["signal_type"],
+            confidence=signal["confidence"],
+            sentiment_score=signal["sentiment_score"],
+            reasoning=signal["reasoning"],
+            timestamp=datetime.now(),
+            sources=signal["sources"]
+        )
 
     def analyze_sentiment(self, articles: List[Dict[str, Any]]) -> List[SentimentAnalysis]:
         """
@@ -29,111 +249,17 @@ class AIService:
             if not articles:
                 return []
                 
-            functions = [
-                {
-                    "name": "analyze_crypto_sentiment",
-                    "description": "Analyze sentiment of cryptocurrency news articles",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "analyses": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "headline": {
-                                            "type": "string",
-                                            "description": "The news headline",
-                                        },
-                                        "source": {
-                                            "type": "string",
-                                            "description": "Source of the article",
-                                        },
-                                        "sentiment_score": {
-                                            "type": "number",
-                                            "description": "Sentiment score from -1.0 (negative) to 1.0 (positive)",
-                                        },
-                                        "confidence": {
-                                            "type": "number",
-                                            "description": "Confidence in the sentiment analysis from 0.0 to 1.0",
-                                        },
-                                        "entities": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "Cryptocurrency entities mentioned in the article",
-                                        },
-                                        "summary": {
-                                            "type": "string",
-                                            "description": "Brief summary of the sentiment analysis",
-                                        },
-                                    },
-                                    "required": ["headline", "source", "sentiment_score", "confidence", "entities", "summary"],
-                                },
-                            }
-                        },
-                        "required": ["analyses"],
-                    },
-                }
-            ]
-
-            # Prepare articles for analysis
-            article_data = []
-            for article in articles:
-                article_data.append({
-                    "title": article["title"],
-                    "summary": article["summary"],
-                    "source": article["source"],
-                    "link": article["link"],
-                    "published": article["published"].isoformat() if isinstance(article["published"], datetime) else article["published"]
-                })
-
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert cryptocurrency analyst with deep knowledge of market sentiment.
-                        Analyze each news article for sentiment regarding cryptocurrencies.
-                        For each article:
-                        1. Determine the overall sentiment (positive, negative, or neutral)
-                        2. Assign a sentiment score from -1.0 (very negative) to 1.0 (very positive)
-                        3. Identify which cryptocurrencies are mentioned
-                        4. Provide a brief summary of the sentiment analysis
-                        5. Assign a confidence score from 0.0 to 1.0 based on how clear the sentiment is
-                        
-                        Be precise and objective in your analysis. Focus on market implications rather than
-                        technological achievements unless they have clear market impact.""",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze the sentiment of these cryptocurrency news articles: {json.dumps(article_data)}",
-                    },
-                ],
-                functions=functions,
-                function_call={"name": "analyze_crypto_sentiment"},
-            )
+            response = self.router.complete(self._sentiment_request(articles), len(articles), NORMAL)
 
             result = json.loads(response.choices[0].message.function_call.arguments)
             
             # Convert to SentimentAnalysis objects
-            sentiment_analyses = []
-            for analysis in result["analyses"]:
-                sentiment_analyses.append(
-                    SentimentAnalysis(
-                        headline=analysis["headline"],
-                        source=analysis["source"],
-                        timestamp=datetime.now(),
-                        sentiment_score=analysis["sentiment_score"],
-                        confidence=analysis["confidence"],
-                        entities=analysis["entities"],
-                        summary=analysis["summary"]
-                    )
-                )
+            sentiment_analyses = [self._to_sentiment_analysis(analysis) for analysis in result["analyses"]]
             
             return sentiment_analyses
 
         except Exception as e:
-            logger.error(f"Error in sentiment analysis: {str(e)}")
+            logger.error("Error in sentiment analysis: %s", e)
             return []
 
     def generate_trading_signals(self, sentiment_analyses: List[SentimentAnalysis], 
@@ -152,116 +278,77 @@ class AIService:
             if not sentiment_analyses:
                 return []
                 
-            functions = [
-                {
-                    "name": "generate_trading_signals",
-                    "description": "Generate trading signals based on sentiment analyses",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "signals": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "cryptocurrency": {
-                                            "type": "string",
-                                            "description": "Name of the cryptocurrency",
-                                        },
-                                        "signal_type": {
-                                            "type": "string",
-                                            "description": "Type of trading signal: buy, sell, or hold",
-                                            "enum": ["buy", "sell", "hold"]
-                                        },
-                                        "confidence": {
-                                            "type": "number",
-                                            "description": "Confidence in the trading signal from 0.0 to 1.0",
-                                        },
-                                        "sentiment_score": {
-                                            "type": "number",
-                                            "description": "Overall sentiment score from -1.0 to 1.0",
-                                        },
-                                        "reasoning": {
-                                            "type": "string",
-                                            "description": "Reasoning behind the trading signal",
-                                        },
-                                        "sources": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "Sources supporting this trading signal",
-                                        },
-                                    },
-                                    "required": ["cryptocurrency", "signal_type", "confidence", "sentiment_score", "reasoning", "sources"],
-                                },
-                            }
-                        },
-                        "required": ["signals"],
-                    },
-                }
-            ]
-
-            # Prepare sentiment analyses for signal generation
-            sentiment_data = []
-            for analysis in sentiment_analyses:
-                sentiment_data.append({
-                    "headline": analysis.headline,
-                    "source": analysis.source,
-                    "sentiment_score": analysis.sentiment_score,
-                    "confidence": analysis.confidence,
-                    "entities": analysis.entities,
-                    "summary": analysis.summary,
-                    "timestamp": analysis.timestamp.isoformat()
-                })
-
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"""You are an expert cryptocurrency trader who generates trading signals based on news sentiment.
-                        Focus on these top cryptocurrencies: {', '.join(top_cryptocurrencies)}.
-                        For each cryptocurrency that has significant sentiment data:
-                        1. Determine if the overall sentiment suggests a buy, sell, or hold signal
-                        2. Assign a confidence score from 0.0 to 1.0 based on the strength of the signal
-                        3. Calculate an overall sentiment score from -1.0 to 1.0
-                        4. Provide clear reasoning for the trading signal
-                        5. List the sources supporting this signal
-                        
-                        Be conservative with your signals - only suggest buy or sell when there is strong evidence.
-                        Otherwise, suggest hold. Consider both the sentiment score and confidence in your analysis.""",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Generate trading signals based on these sentiment analyses: {json.dumps(sentiment_data)}",
-                    },
-                ],
-                functions=functions,
-                function_call={"name": "generate_trading_signals"},
+            response = self.router.complete(
+                self._signals_request(sentiment_analyses, top_cryptocurrencies), len(sentiment_analyses), HIGH
             )
 
             result = json.loads(response.choices[0].message.function_call.arguments)
             
             # Convert to TradingSignal objects
-            trading_signals = []
-            for signal in result["signals"]:
-                trading_signals.append(
-                    TradingSignal(
-                        cryptocurrency=signal["cryptocurrency"],
-                        signal_type=signal["signal_type"],
-                        confidence=signal["confidence"],
-                        sentiment_score=signal["sentiment_score"],
-                        reasoning=signal["reasoning"],
-                        timestamp=datetime.now(),
-                        sources=signal["sources"]
-                    )
-                )
+            trading_signals = [self._to_trading_signal(signal) for signal in result["signals"]]
             
             return trading_signals
 
         except Exception as e:
-            logger.error(f"Error generating trading signals: {str(e)}")
+            logger.error("Error generating trading signals: %s", e)
             return []
             
+    def _stream_items(self, request: Dict[str, Any], key: str, batch_size: int,
+                      priority: str) -> Iterator[Dict[str, Any]]:
+        """Yield each element of the function-call array `key` as soon as it is complete"""
+        parser = JsonArrayStreamParser(key)
+        for chunk in self.router.stream(request, batch_size, priority):
+            if not chunk.choices:
+                continue
+            function_call = chunk.choices[0].delta.function_call
+            if function_call is None or not function_call.arguments:
+                continue
+            yield from parser.feed(function_call.arguments)
+
+    def stream_sentiment(self, articles: List[Dict[str, Any]]) -> Iterator[SentimentAnalysis]:
+        """
+        Analyze the sentiment of cryptocurrency news articles, yielding each
+        analysis as soon as the model finishes writing it
+
+        Args:
+            articles: List of article dictionaries
+
+        Yields:
+            SentimentAnalysis objects in the order the model produces them
+        """
+        if not articles:
+            return
+
+        try:
+            request = self._sentiment_request(articles)
+            for analysis in self._stream_items(request, "analyses", len(articles), NORMAL):
+                yield self._to_sentiment_analysis(analysis)
+        except Exception as e:
+            logger.error("Error in streamed sentiment analysis: %s", e)
+
+    def stream_trading_signals(self, sentiment_analyses: List[SentimentAnalysis],
+                               top_cryptocurrencies: List[str]) -> Iterator[TradingSignal]:
+        """
+        Generate trading signals, yielding each signal as soon as the model
+        finishes writing it
+
+        Args:
+            sentiment_analyses: List of SentimentAnalysis objects
+            top_cryptocurrencies: List of top cryptocurrencies to focus on
+
+        Yields:
+            TradingSignal objects in the order the model produces them
+        """
+        if not sentiment_analyses:
+            return
+
+        try:
+            request = self._signals_request(sentiment_analyses, top_cryptocurrencies)
+            for signal in self._stream_items(request, "signals", len(sentiment_analyses), HIGH):
+                yield self._to_trading_signal(signal)
+        except Exception as e:
+            logger.error("Error in streamed trading signal generation: %s", e)
+
     def generate_visualization(self, trading_signal: TradingSignal) -> Optional[str]:
         """
         Generate a visualization image for a trading signal
@@ -314,5 +401,5 @@ class AIService:
             return image_url
 
         except Exception as e:
-            logger.error(f"Error generating visualization: {str(e)}")
+            logger.error("Error generating visualization: %s", e)
             return None 
\ No newline at end of file
@@ -26,9 +26,9 @@ class BlockchainService:
                     raise e
                 
             self.network = config.networks.get_network(DEFAULT_NETWORK_NAME)
-            logger.info(f"Connected to blockchain network: {self.network.name}")
+            logger.info("Connected to blockchain network: %s", self.network.name)
         except Exception as e:
-            logger.error(f"Failed to connect to blockchain network: {str(e)}")
+            logger.error("Failed to connect to blockchain network: %s", e)
             
     def set_network(self, network_name: str) -> bool:
         """
@@ -53,10 +53,10 @@ class BlockchainService:
                     raise e
                 
             self.network = config.networks.get_network(network_name)
-            logger.info(f"Switched to blockchain network: {self.network.name}")
+            logger.info("Switched to blockchain network: %s", self.network.name)
             return True
         except Exception as e:
-            logger.error(f"Failed to switch blockchain network: {str(e)}")
+            logger.error("Failed to switch blockchain network: %s", e)
             return False
             
     def deploy_sentiment_tracker(self, name: str) -> Optional[str]:
@@ -81,11 +81,11 @@ class BlockchainService:
             )
             
             contract_address = sentiment_tracker.address
-            logger.info(f"Deployed VyperSense SentimentTracker contract at {contract_address}")
+            logger.info("Deployed VyperSense SentimentTracker contract at %s", contract_address)
             return contract_address
             
         except Exception as e:
-            logger.error(f"Failed to deploy sentiment tracker contract: {str(e)}")
+            logger.error("Failed to deploy sentiment tracker contract: %s", e)
             return None
             
     def record_sentiment(self, contract_address: str, cryptocurrency: str, 
@@ -111,7 +111,7 @@ class BlockchainService:
             
             # Get the contract instance
             contract = get_config().get_active_network().get_or_deploy_named("SentimentTracker")
-            logger.info(f"Contract: {contract}")
+            logger.info("Contract: %s", contract)
                 
             # Convert sentiment score to int128 (multiply by 100 to preserve 2 decimal places)
             sentiment_int = int(sentiment_score * 100)
@@ -131,19 +131,19 @@ class BlockchainService:
                     sentiment_int,
                     timestamp_u256
                 )
-                logger.info(f"Transaction hash: {tx_hash}")
+                logger.info("Transaction hash: %s", tx_hash)
             except Exception as e:
-                logger.error(f"Invalid argument when recording sentiment: {str(e)}")
+                logger.error("Invalid argument when recording sentiment: %s", e)
                 return False
             
             # Wait for transaction to be mined
             self.network.w3.eth.wait_for_transaction_receipt(tx_hash)
             
-            logger.info(f"Recorded sentiment for {cryptocurrency} on blockchain")
+            logger.info("Recorded sentiment for %s on blockchain", cryptocurrency)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to record sentiment on blockchain: {str(e)}")
+            logger.error("Failed to record sentiment on blockchain: %s", e)
             return False
             
     def get_sentiment_history(self, contract_address: str, cryptocurrency: str) -> list:
@@ -180,5 +180,5 @@ class BlockchainService:
             return formatted_history
             
         except Exception as e:
-            logger.error(f"Failed to get sentiment history: {str(e)}")
+            logger.error("Failed to get sentiment history: %s", e)
             return [] 
\ No newline at end of file
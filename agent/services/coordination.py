@@ -0,0 +1,418 @@
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+WRITER_LEASE = "chain-writer"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    key TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    token INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS chain_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedup_key TEXT UNIQUE NOT NULL,
+    contract_address TEXT,
+    cryptocurrency TEXT NOT NULL,
+    sentiment_score REAL NOT NULL,
+    timestamp INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    writer TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chain_queue_status ON chain_queue (status, id);
+"""
+
+
+def default_worker_id(index: int) -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+class Coordinator:
+    def __init__(self, db_path: str, worker_id: str, claim_ttl: float = 3600, lease_ttl: float = 60,
+                 retry_delay: float = 60):
+        """
+        Initialize the shared coordination store
+
+        Workers share one SQLite database; SQLite's file locks serialize the
+        claim and lease updates, so a key is only ever claimed by one worker.
+
+        Args:
+            db_path: Path of the SQLite database shared by all workers
+            worker_id: Unique identifier of this worker
+            claim_ttl: Seconds after which an unfinished claim may be taken over
+            lease_ttl: Seconds a writer lease lasts without renewal
+            retry_delay: Seconds before a failed chain record is retried, doubling with each attempt
+        """
+        self.db_path = db_path
+        self.worker_id = worker_id
+        self.claim_ttl = claim_ttl
+        self.lease_ttl = lease_ttl
+        self.retry_delay = retry_delay
+        self.local = threading.local()
+        # Fencing token of each lease this worker acquired, by lease name
+        self.tokens: Dict[str, int] = {}
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+            # Databases created before leases carried a fencing token
+            columns = [row["name"] for row in connection.execute("PRAGMA table_info(leases)")]
+            if "token" not in columns:
+                connection.execute("ALTER TABLE leases ADD COLUMN token INTEGER NOT NULL DEFAULT 0")
+            columns = [row["name"] for row in connection.execute("PRAGMA table_info(chain_queue)")]
+            if "next_attempt_at" not in columns:
+                connection.execute("ALTER TABLE chain_queue ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads; keep one per thread
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.row_factory = sqlite3.Row
+            self.local.connection = connection
+        return connection
+
+    def claim(self, key: str) -> bool:
+        """
+        Claim a unit of work (an article, a tweet)
+
+        Args:
+            key: Globally unique key of the work item
+
+        Returns:
+            True if this worker now owns the item, False if another worker has it or it is done
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            """
+            INSERT INTO claims (key, worker, claimed_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET worker = excluded.worker, claimed_at = excluded.claimed_at
+            WHERE claims.done = 0 AND claims.claimed_at < ?
+            """,
+            (key, self.worker_id, now, now - self.claim_ttl),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, key: str):
+        """Mark a claimed item as done so it is never reclaimed"""
+        self._connection().execute(
+            "UPDATE claims SET done = 1 WHERE key = ? AND worker = ?", (key, self.worker_id))
+
+    def acquire_lease(self, name: str = WRITER_LEASE) -> bool:
+        """
+        Acquire or renew a named lease
+
+        Args:
+            name: Lease name
+
+        The lease's fencing token (kept in self.tokens) goes up every time the
+        lease changes hands or is retaken after expiring, so a holder can tell
+        whether anyone else may have held it in between.
+
+        Returns:
+            True if this worker holds the lease until now + lease_ttl
+        """
+        now = time.time()
+        connection = self._connection()
+        cursor = connection.execute(
+            """
+            INSERT INTO leases (name, holder, expires_at, token) VALUES (?, ?, ?, 1)
+            ON CONFLICT(name) DO UPDATE SET
+                token = CASE WHEN leases.holder = excluded.holder AND leases.expires_at >= ?
+                             THEN leases.token ELSE leases.token + 1 END,
+                holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+            """,
+            (name, self.worker_id, now + self.lease_ttl, now, now),
+        )
+        if cursor.rowcount != 1:
+            return False
+        row = connection.execute(
+            "SELECT token FROM leases WHERE name = ? AND holder = ?", (name, self.worker_id)).fetchone()
+        if row is None:
+            return False
+        self.tokens[name] = row["token"]
+        return True
+
+    @contextmanager
+    def keep_lease(self, name: str = WRITER_LEASE):
+        """
+        Renew a held lease from a background thread for the duration of a slow call
+
+        Yields:
+            threading.Event that is set if the lease could not be renewed
+        """
+        done = threading.Event()
+        lost = threading.Event()
+
+        def renew():
+            while not done.wait(self.lease_ttl / 3):
+                try:
+                    if not self.acquire_lease(name):
+                        lost.set()
+                        return
+                except Exception as e:
+                    logger.error("Failed to renew lease %s: %s", name, e)
+
+        thread = threading.Thread(target=renew, name=f"lease-{name}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            done.set()
+            thread.join()
+
+    def release_lease(self, name: str = WRITER_LEASE):
+        self._connection().execute(
+            "DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.worker_id))
+
+    def enqueue_record(self, contract_address: Optional[str], cryptocurrency: str,
+                       sentiment_score: float, timestamp: int) -> bool:
+        """
+        Queue a sentiment record for the elected chain writer
+
+        Returns:
+            True if queued, False if an identical record is already queued
+        """
+        key = hashlib.sha1(f"{cryptocurrency}|{sentiment_score:.2f}|{timestamp}".encode("utf-8")).hexdigest()
+        cursor = self._connection().execute(
+            """
+            INSERT OR IGNORE INTO chain_queue
+                (dedup_key, contract_address, cryptocurrency, sentiment_score, timestamp, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, contract_address, cryptocurrency, sentiment_score, timestamp, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def take_records(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Move up to `limit` pending records that are due to 'submitting' for this writer
+
+        Returns:
+            The taken records, oldest first
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                "SELECT * FROM chain_queue WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (time.time(), limit)).fetchall()
+            connection.executemany(
+                "UPDATE chain_queue SET status = 'submitting', writer = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                [(self.worker_id, time.time(), row["id"]) for row in rows],
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return [dict(row) for row in rows]
+
+    def finish_record(self, record_id: int, success: bool, max_attempts: int = 3):
+        """
+        Mark a taken record as submitted, or return it to the queue until attempts run out
+
+        A failed record isn't taken again for retry_delay seconds, doubled for each earlier attempt.
+        """
+        now = time.time()
+        self._connection().execute(
+            """
+            UPDATE chain_queue
+            SET status = CASE WHEN ? THEN 'submitted' WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                next_attempt_at = ? + ? * (1 << (attempts - 1)),
+                updated_at = ?
+            WHERE id = ? AND writer = ?
+            """,
+            (success, max_attempts, now, self.retry_delay, now, record_id, self.worker_id),
+        )
+
+    def return_record(self, record_id: int):
+        """Put a taken record back in the queue without counting the attempt"""
+        self._connection().execute(
+            "UPDATE chain_queue SET status = 'pending', attempts = attempts - 1, updated_at = ? "
+            "WHERE id = ? AND writer = ?",
+            (time.time(), record_id, self.worker_id),
+        )
+
+    def requeue_abandoned(self, older_than: float, name: str = WRITER_LEASE) -> int:
+        """
+        Return records stuck in 'submitting' by a writer that lost its lease
+
+        Records taken by the current lease holder are never requeued, however
+        long its submission takes.
+
+        Args:
+            older_than: Seconds a record must have been in 'submitting'
+            name: Lease held by the writers
+
+        Returns:
+            Number of records requeued
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            """
+            UPDATE chain_queue SET status = 'pending'
+            WHERE status = 'submitting' AND updated_at < ?
+              AND writer IS NOT (SELECT holder FROM leases WHERE name = ? AND expires_at >= ?)
+            """,
+            (now - older_than, name, now),
+        )
+        return cursor.rowcount
+
+
+class QueuedChainRecorder:
+    """Stands in for BlockchainService in workers: records are queued for the elected writer"""
+
+    def __init__(self, coordinator: Coordinator):
+        self.coordinator = coordinator
+
+    def record_sentiment(self, contract_address: str, cryptocurrency: str,
+                         sentiment_score: float, timestamp: int) -> bool:
+        try:
+            if self.coordinator.enqueue_record(contract_address, cryptocurrency, sentiment_score, timestamp):
+                logger.info("Queued sentiment for %s for the chain writer", cryptocurrency)
+            else:
+                logger.info("Sentiment for %s already queued", cryptocurrency)
+            return True
+        except Exception as e:
+            logger.error("Failed to queue sentiment record: %s", e)
+            return False
+
+
+class ClaimedTwitterService:
+    """Wraps TwitterService so a given tweet is posted by exactly one worker"""
+
+    def __init__(self, twitter_service, coordinator: Coordinator):
+        self.twitter_service = twitter_service
+        self.coordinator = coordinator
+
+    def post_tweet(self, text: str, image_url: Optional[str] = None) -> bool:
+        key = "tweet:" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if not self.coordinator.claim(key):
+            logger.info("Tweet already posted by another worker, skipping")
+            return True
+
+        success = self.twitter_service.post_tweet(text, image_url)
+        if success:
+            self.coordinator.complete(key)
+        return success
+
+
+class ChainWriter:
+    def __init__(self, coordinator: Coordinator, blockchain_service, batch_size: int = 20,
+                 interval: float = 10):
+        """
+        Initialize the chain writer
+
+        Every worker runs one; only the holder of the writer lease submits, so
+        transactions from the shared account never race for nonces. The lease
+        is renewed in the background while a transaction waits for its receipt,
+        and its fencing token is checked before each transaction, so a writer
+        that lost the lease at any point stops submitting.
+
+        Args:
+            coordinator: Shared coordination store
+            blockchain_service: BlockchainService used to submit records
+            batch_size: Maximum records submitted per batch
+            interval: Seconds between queue checks
+        """
+        self.coordinator = coordinator
+        self.blockchain_service = blockchain_service
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="chain-writer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 5)
+
+    def flush(self):
+        """Submit everything queued right now if this worker can take the lease"""
+        if self.coordinator.acquire_lease():
+            self.drain()
+
+    def run(self):
+        is_writer = False
+        while not self.stop_event.is_set():
+            try:
+                leased = self.coordinator.acquire_lease()
+                if leased != is_writer:
+                    logger.info("Elected as chain writer" if leased else "Lost chain writer lease")
+                    is_writer = leased
+                if is_writer:
+                    self.drain()
+            except Exception as e:
+                logger.error("Chain writer error: %s", e)
+            self.stop_event.wait(self.interval)
+
+        if is_writer:
+            self.coordinator.release_lease()
+
+    def drain(self):
+        """Submit queued records while this worker holds the lease"""
+        if not self.coordinator.acquire_lease():
+            return
+        token = self.coordinator.tokens[WRITER_LEASE]
+        self.coordinator.requeue_abandoned(older_than=self.coordinator.lease_ttl * 2)
+
+        while not self.stop_event.is_set():
+            records = self.coordinator.take_records(self.batch_size)
+            if not records:
+                return
+
+            logger.info("Submitting batch of %s sentiment records", len(records))
+            for index, record in enumerate(records):
+                # Renew before each transaction, and stop if another worker may have
+                # held the lease since this drain started
+                if not self.coordinator.acquire_lease() or self.coordinator.tokens[WRITER_LEASE] != token:
+                    logger.warning("Lost chain writer lease mid-batch")
+                    for remaining in records[index:]:
+                        self.coordinator.return_record(remaining["id"])
+                    return
+
+                with self.coordinator.keep_lease() as lost:
+                    success = self.blockchain_service.record_sentiment(
+                        record["contract_address"],
+                        record["cryptocurrency"],
+                        record["sentiment_score"],
+                        record["timestamp"],
+                    )
+                if lost.is_set():
+                    logger.warning("Chain writer lease lapsed while waiting for a receipt")
+                self.coordinator.finish_record(record["id"], success)
+
+                # The failed record waits out its retry delay; the rest of the batch is
+                # left for the next interval rather than sent to an endpoint that just failed
+                if not success:
+                    for remaining in records[index + 1:]:
+                        self.coordinator.return_record(remaining["id"])
+                    return
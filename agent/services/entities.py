@@ -0,0 +1,161 @@
+from collections import deque
+from typing import List, Dict, Any, Iterable
+
+
+def _is_ticker(pattern: str) -> bool:
+    # Short all-caps aliases (SOL, DOT, POL) are only tickers when written in capitals
+    return pattern.isupper() and len(pattern) <= 5
+
+
+def _lower(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') grow when lowercased; keep offsets aligned with the original
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+class EntityRouter:
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        """
+        Initialize the matcher for tracked assets
+
+        All names and aliases are compiled into one Aho-Corasick automaton, so a
+        text is scanned once regardless of how many patterns there are. Names
+        match case-insensitively; short all-caps aliases only match exactly.
+        Matches must start and end on word boundaries.
+
+        Args:
+            aliases: Canonical asset name -> alternative names and tickers
+        """
+        self.assets = list(aliases)
+        # Trie as parallel lists indexed by state; state 0 is the root
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        # Per pattern: (asset, pattern, case-sensitive)
+        self.patterns = []
+        # Whole-name lookups for canonical(): tickers exactly, other names lowercased
+        self.tickers: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+
+        for asset, names in aliases.items():
+            for pattern in dict.fromkeys([asset, *names]):
+                self._add(asset, pattern)
+        self._build()
+
+    def _add(self, asset: str, pattern: str):
+        case_sensitive = _is_ticker(pattern)
+        if case_sensitive:
+            self.tickers.setdefault(pattern, asset)
+        else:
+            self.names.setdefault(_lower(pattern), asset)
+        state = 0
+        for char in pattern.lower():
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(len(self.patterns))
+        self.patterns.append((asset, pattern, case_sensitive))
+
+    def _build(self):
+        # Breadth-first so each state's failure link is final before its children use it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def match(self, text: str) -> List[str]:
+        """
+        Find the tracked assets mentioned in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Canonical asset names in order of first mention, without duplicates
+        """
+        if not text:
+            return []
+
+        goto, fail, output, patterns = self.goto, self.fail, self.output, self.patterns
+        root = goto[0]
+        lowered = _lower(text)
+        length = len(text)
+        found = {}
+        state = 0
+
+        for position, char in enumerate(lowered):
+            if state == 0 and char not in root:
+                continue
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in output[state]:
+                asset, pattern, case_sensitive = patterns[index]
+                if asset in found:
+                    continue
+                start = position - len(pattern) + 1
+                end = position + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < length and text[end].isalnum():
+                    continue
+                if case_sensitive and text[start:end] != pattern:
+                    continue
+                found[asset] = start
+
+        return list(found)
+
+    def canonical(self, name: str) -> str:
+        """
+        Canonical asset name for a whole name, alias or ticker
+
+        Unlike match(), the entire string must be a known name, so e.g.
+        "Bitcoin Cash" or "Ethereum Classic" are not taken for tracked assets.
+
+        Args:
+            name: Asset name, e.g. "BTC" or "bitcoin"
+
+        Returns:
+            The canonical name, or the name unchanged if it isn't a tracked asset
+        """
+        stripped = name.strip()
+        return self.tickers.get(stripped) or self.names.get(_lower(stripped)) or name
+
+    def tag(self, article: Dict[str, Any]) -> List[str]:
+        """Tracked assets mentioned in an article's title or summary"""
+        return self.match(f"{article.get('title') or ''}\n{article.get('summary') or ''}")
+
+
+def group_by_asset(articles: List[Dict[str, Any]], assets: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group tagged articles by the assets they mention
+
+    Args:
+        articles: Articles with an 'entities' list (see NewsService)
+        assets: Tracked assets, in the order groups should be returned
+
+    Returns:
+        Asset -> articles mentioning it, for assets mentioned at least once; an
+        article mentioning several assets appears under each
+    """
+    groups = {asset: [] for asset in assets}
+    for article in articles:
+        for asset in article.get('entities') or []:
+            if asset in groups:
+                groups[asset].append(article)
+    return {asset: grouped for asset, grouped in groups.items() if grouped}
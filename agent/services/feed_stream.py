@@ -0,0 +1,138 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+# Elements that hold one entry, for RSS 2.0/RSS 1.0 and Atom
+ENTRY_TAGS = ("item", "entry")
+FEED_TAGS = ("channel", "feed")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date to naive UTC, like feedparser's *_parsed"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _entry(element: ET.Element, source: str) -> Dict[str, Any]:
+    fields: Dict[str, str] = {}
+    link = None
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom links carry the URL in href; prefer the alternate (default) one
+            href = child.get("href")
+            if href is None:
+                link = link or (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate" or link is None:
+                link = href
+        elif name not in fields:
+            fields[name] = "".join(child.itertext()).strip()
+
+    link = link or ""
+    return {
+        "id": fields.get("guid") or fields.get("id") or link,
+        "title": fields.get("title", ""),
+        "summary": fields.get("description") or fields.get("summary") or fields.get("content") or "",
+        "link": link,
+        "published": _parse_date(fields.get("pubDate") or fields.get("published")
+                                 or fields.get("date") or fields.get("updated")),
+        "source": source,
+    }
+
+
+def iter_feed_entries(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries of an RSS or Atom document as they are parsed
+
+    Only the entry being parsed is kept in memory, and nothing past the last
+    entry the caller asks for is read, so stopping early on a newest-first
+    feed skips both the parsing and the download of the rest.
+
+    Args:
+        stream: Binary file-like object with the feed document
+
+    Yields:
+        Dictionaries with id, title, summary, link, published (naive UTC
+        datetime or None) and source (the feed title)
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML
+    """
+    source = "Unknown"
+    # Open elements, outermost first
+    path: List[ET.Element] = []
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(element)
+            continue
+
+        path.pop()
+        name = _local(element.tag)
+        parent = _local(path[-1].tag) if path else None
+
+        if name in ENTRY_TAGS:
+            yield _entry(element, source)
+            # Drop the finished entry so memory stays flat however long the feed is
+            element.clear()
+            if path:
+                path[-1].remove(element)
+        elif name == "title" and parent in FEED_TAGS and source == "Unknown":
+            source = (element.text or "").strip() or source
+
+
+class RecordingReader:
+    """
+    File-like wrapper that keeps the start of a stream, so a parse that fails early can be retried
+
+    Recording ends when stop() is called (once the first entry has parsed, the
+    document is XML and a later failure is rare) or after max_bytes, so memory
+    stays flat for long feeds. Once it has ended, read_all() is unavailable
+    and the caller has to fetch the document again.
+    """
+
+    def __init__(self, raw: BinaryIO, max_bytes: int = 1024 * 1024):
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.chunks: Optional[List[bytes]] = []
+        self.size = 0
+
+    @property
+    def recording(self) -> bool:
+        return self.chunks is not None
+
+    def stop(self):
+        """Stop recording and release what was kept"""
+        self.chunks = None
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        if self.chunks is not None:
+            self.size += len(data)
+            if self.size > self.max_bytes:
+                self.stop()
+            else:
+                self.chunks.append(data)
+        return data
+
+    def read_all(self) -> bytes:
+        """Everything read so far followed by the rest of the stream"""
+        if self.chunks is None:
+            raise RuntimeError("The start of the stream was not kept")
+        return b"".join(self.chunks) + self.raw.read()
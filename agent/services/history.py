@@ -0,0 +1,372 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from agent.model.batch import SentimentBatch
+from agent.model.sentiment import SentimentAnalysis, TradingSignal
+from agent.services.entities import EntityRouter
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT = "sentiment"
+SIGNALS = "signals"
+
+# Resample rules accepted by HistoryStore.downsample
+FREQUENCIES = {"1m": "1min", "1h": "1h", "1d": "1D"}
+
+SCHEMAS = {
+    SENTIMENT: pa.schema([
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("asset", pa.string()),
+        ("sentiment_score", pa.float64()),
+        ("confidence", pa.float64()),
+        ("headline", pa.string()),
+        ("source", pa.string()),
+        ("summary", pa.string()),
+    ]),
+    SIGNALS: pa.schema([
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("asset", pa.string()),
+        ("signal_type", pa.string()),
+        ("sentiment_score", pa.float64()),
+        ("confidence", pa.float64()),
+        ("reasoning", pa.string()),
+        ("sources", pa.list_(pa.string())),
+        ("image_url", pa.string()),
+    ]),
+}
+
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+# Compaction files; the leading dot keeps them out of the dataset
+COMPACT_TMP = ".compacted.parquet.tmp"
+COMPACT_MANIFEST = ".compaction.json"
+
+
+def to_utc(value: datetime) -> datetime:
+    """Interpret naive datetimes as local time, as produced by datetime.now()"""
+    return value.astimezone(timezone.utc)
+
+
+class HistoryStore:
+    def __init__(self, root: str, entity_router: Optional[EntityRouter] = None):
+        """
+        Initialize the append-only history store
+
+        Data is written as Parquet files partitioned by kind and UTC date:
+        {root}/{kind}/date=YYYY-MM-DD/part-*.parquet
+
+        Args:
+            root: Directory holding the store
+            entity_router: Maps asset aliases and tickers (e.g. "BTC") to their canonical
+                           name before rows are written; names are stored as given without it
+        """
+        self.root = Path(root)
+        self.entity_router = entity_router
+
+    def canonical_asset(self, asset: str) -> str:
+        """The tracked asset an asset name refers to, or the name itself if it isn't tracked"""
+        if not self.entity_router or not asset:
+            return asset
+        return self.entity_router.canonical(asset)
+
+    def _kind_dir(self, kind: str) -> Path:
+        if kind not in SCHEMAS:
+            raise ValueError(f"Unknown history kind: {kind}")
+        return self.root / kind
+
+    def append(self, analyses: Optional[List[SentimentAnalysis]] = None,
+               signals: Optional[List[TradingSignal]] = None) -> int:
+        """
+        Append a cycle's results to the store
+
+        Sentiment analyses are stored once per mentioned entity so per-asset
+        queries don't need to unpack lists.
+
+        Args:
+            analyses: Sentiment analyses produced this cycle
+            signals: Trading signals produced this cycle
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        try:
+            if analyses:
+                rows = []
+                for analysis in analyses:
+                    timestamp = to_utc(analysis.timestamp)
+                    assets = dict.fromkeys(self.canonical_asset(entity) for entity in analysis.entities)
+                    for asset in assets or [""]:
+                        rows.append({
+                            "timestamp": timestamp,
+                            "asset": asset,
+                            "sentiment_score": analysis.sentiment_score,
+                            "confidence": analysis.confidence,
+                            "headline": analysis.headline,
+                            "source": analysis.source,
+                            "summary": analysis.summary,
+                        })
+                written += self._write(SENTIMENT, rows)
+
+            if signals:
+                rows = [{
+                    "timestamp": to_utc(signal.timestamp),
+                    "asset": self.canonical_asset(signal.cryptocurrency),
+                    "signal_type": signal.signal_type,
+                    "sentiment_score": signal.sentiment_score,
+                    "confidence": signal.confidence,
+                    "reasoning": signal.reasoning,
+                    "sources": signal.sources,
+                    "image_url": signal.image_url,
+                } for signal in signals]
+                written += self._write(SIGNALS, rows)
+
+        except Exception as e:
+            logger.error("Failed to append to history store: %s", e)
+
+        return written
+
+    def _write(self, kind: str, rows: List[dict]) -> int:
+        table = pa.Table.from_pylist(rows, schema=SCHEMAS[kind])
+        dates = pc.strftime(table["timestamp"], format="%Y-%m-%d")
+
+        for date in pc.unique(dates).to_pylist():
+            self._write_partition(kind, date, table.filter(pc.equal(dates, date)))
+
+        return table.num_rows
+
+    @staticmethod
+    def _part_name() -> str:
+        return f"part-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+
+    def _write_partition(self, kind: str, date: str, table: pa.Table):
+        directory = self._kind_dir(kind) / f"date={date}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        name = self._part_name()
+        # Write under a temporary name so readers never see a half-written file
+        tmp_path = directory / f".{name}.tmp"
+        pq.write_table(table.sort_by("timestamp"), tmp_path, compression="zstd")
+        os.replace(tmp_path, directory / name)
+
+    def _dataset(self, kind: str) -> Optional[ds.Dataset]:
+        path = self._kind_dir(kind)
+        if not path.exists():
+            return None
+        return ds.dataset(path, format="parquet", partitioning=PARTITIONING,
+                          schema=SCHEMAS[kind].append(pa.field("date", pa.string())))
+
+    def load(self, kind: str = SENTIMENT, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             assets: Optional[Sequence[str]] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Load rows for a time range and set of assets
+
+        Date partitions outside the range are skipped without being opened, and the
+        remaining filters are pushed down to the Parquet row groups.
+
+        Args:
+            kind: "sentiment" or "signals"
+            start: Inclusive start of the range
+            end: Exclusive end of the range
+            assets: Assets to include (all if None)
+            columns: Columns to read (all if None)
+
+        Returns:
+            DataFrame sorted by timestamp
+        """
+        read_columns = list(columns) if columns else SCHEMAS[kind].names
+        if "timestamp" not in read_columns:
+            read_columns = ["timestamp"] + read_columns
+
+        dataset = self._dataset(kind)
+        if dataset is None:
+            return SCHEMAS[kind].empty_table().select(read_columns).to_pandas()
+
+        expression = None
+
+        def combine(condition):
+            return condition if expression is None else expression & condition
+
+        if start is not None:
+            start = to_utc(start)
+            expression = combine(ds.field("date") >= start.strftime("%Y-%m-%d"))
+            expression = combine(ds.field("timestamp") >= pa.scalar(start, pa.timestamp("us", tz="UTC")))
+        if end is not None:
+            end = to_utc(end)
+            expression = combine(ds.field("date") <= end.strftime("%Y-%m-%d"))
+            expression = combine(ds.field("timestamp") < pa.scalar(end, pa.timestamp("us", tz="UTC")))
+        if assets is not None:
+            expression = combine(ds.field("asset").isin([self.canonical_asset(asset) for asset in assets]))
+
+        table = dataset.to_table(columns=read_columns, filter=expression)
+        return table.to_pandas().sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    def load_batch(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   assets: Optional[Sequence[str]] = None) -> SentimentBatch:
+        """
+        Load sentiment rows as a columnar SentimentBatch instead of a list of models
+
+        Args:
+            start: Inclusive start of the range
+            end: Exclusive end of the range
+            assets: Assets to include (all if None)
+
+        Returns:
+            SentimentBatch with one analysis per stored row
+        """
+        return SentimentBatch.from_frame(self.load(SENTIMENT, start, end, assets))
+
+    def rolling(self, asset: str, window: str = "1h", kind: str = SENTIMENT,
+                start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Time-based rolling aggregates for one asset
+
+        Args:
+            asset: Asset name
+            window: Pandas offset string for the window, e.g. "15min", "1h", "1d"
+            kind: "sentiment" or "signals"
+            start: Inclusive start of the range
+            end: Exclusive end of the range
+
+        Returns:
+            DataFrame indexed by timestamp with mean_sentiment, weighted_sentiment,
+            mean_confidence and count over the trailing window
+        """
+        frame = self.load(kind, start, end, [asset], ["sentiment_score", "confidence"])
+        frame = frame.set_index("timestamp")
+        frame["weighted"] = frame["sentiment_score"] * frame["confidence"]
+
+        rolled = frame.rolling(window)
+        result = pd.DataFrame({
+            "mean_sentiment": rolled["sentiment_score"].mean(),
+            "mean_confidence": rolled["confidence"].mean(),
+            "count": rolled["sentiment_score"].count(),
+        })
+        result["weighted_sentiment"] = rolled["weighted"].sum() / rolled["confidence"].sum()
+        return result
+
+    def downsample(self, frequency: str = "1h", kind: str = SENTIMENT, assets: Optional[Sequence[str]] = None,
+                   start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Aggregate rows into fixed time buckets per asset
+
+        Args:
+            frequency: "1m", "1h" or "1d"
+            kind: "sentiment" or "signals"
+            assets: Assets to include (all if None)
+            start: Inclusive start of the range
+            end: Exclusive end of the range
+
+        Returns:
+            DataFrame indexed by (asset, timestamp) with mean, min, max and
+            confidence-weighted sentiment plus row counts; empty buckets are omitted
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency: {frequency}")
+
+        frame = self.load(kind, start, end, assets, ["asset", "sentiment_score", "confidence"])
+        frame["weighted"] = frame["sentiment_score"] * frame["confidence"]
+        frame["timestamp"] = frame["timestamp"].dt.floor(FREQUENCIES[frequency])
+
+        grouped = frame.groupby(["asset", "timestamp"], sort=True, observed=True)
+        result = grouped.agg(
+            mean_sentiment=("sentiment_score", "mean"),
+            min_sentiment=("sentiment_score", "min"),
+            max_sentiment=("sentiment_score", "max"),
+            mean_confidence=("confidence", "mean"),
+            weighted=("weighted", "sum"),
+            confidence_sum=("confidence", "sum"),
+            count=("sentiment_score", "size"),
+        )
+        result["weighted_sentiment"] = result["weighted"] / result["confidence_sum"]
+        return result.drop(columns=["weighted", "confidence_sum"])
+
+    def compact(self, kind: str, date: str) -> bool:
+        """
+        Merge the small per-cycle files of one date partition into a single file
+
+        The merged file is written under a hidden temporary name and a manifest
+        listing the parts it replaces is committed before any part is removed,
+        so readers never see rows twice and an interrupted compaction is
+        finished (or discarded) by the next call. Asset names are
+        canonicalized on the way through.
+
+        Args:
+            kind: "sentiment" or "signals"
+            date: Partition date as YYYY-MM-DD
+
+        Returns:
+            True if the partition was compacted, False otherwise
+        """
+        directory = self._kind_dir(kind) / f"date={date}"
+        try:
+            self._recover_compaction(directory)
+
+            parts = sorted(directory.glob("part-*.parquet"))
+            if len(parts) < 2:
+                return False
+
+            table = pa.concat_tables([pq.read_table(part, schema=SCHEMAS[kind]) for part in parts])
+            assets = [self.canonical_asset(asset) for asset in table["asset"].to_pylist()]
+            table = table.set_column(table.schema.get_field_index("asset"), "asset",
+                                     pa.array(assets, pa.string()))
+            pq.write_table(table.sort_by("timestamp"), directory / COMPACT_TMP, compression="zstd")
+
+            # Committing the manifest is the point of no return; from here on the
+            # compaction is completed even if this process dies
+            manifest = {"name": self._part_name(), "parts": [part.name for part in parts]}
+            manifest_tmp = directory / f"{COMPACT_MANIFEST}.tmp"
+            manifest_tmp.write_text(json.dumps(manifest))
+            os.replace(manifest_tmp, directory / COMPACT_MANIFEST)
+
+            self._recover_compaction(directory)
+            logger.info("Compacted %s files in %s/date=%s", len(parts), kind, date)
+            return True
+        except Exception as e:
+            logger.error("Failed to compact %s/date=%s: %s", kind, date, e)
+            return False
+
+    @staticmethod
+    def _recover_compaction(directory: Path):
+        """Finish a committed compaction, or drop the merged file of one that never committed"""
+        manifest_path = directory / COMPACT_MANIFEST
+        tmp_path = directory / COMPACT_TMP
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            for name in manifest["parts"]:
+                (directory / name).unlink(missing_ok=True)
+            if tmp_path.exists():
+                os.replace(tmp_path, directory / manifest["name"])
+            manifest_path.unlink()
+        elif tmp_path.exists():
+            tmp_path.unlink()
+
+    def compact_closed_partitions(self) -> int:
+        """
+        Compact every partition before today's UTC date that still has several files
+
+        Returns:
+            Number of partitions compacted
+        """
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        compacted = 0
+        for kind in SCHEMAS:
+            path = self._kind_dir(kind)
+            if not path.exists():
+                continue
+            for directory in path.glob("date=*"):
+                date = directory.name[len("date="):]
+                if date < today and self.compact(kind, date):
+                    compacted += 1
+        return compacted
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import logging
+import threading
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from agent.services.store import ResultStore, RESOURCES
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    204: "No Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    501: "Not Implemented",
+}
+
+MAX_HEADER_LINES = 100
+# Largest request body read and discarded to keep a connection alive; none of the endpoints use one
+MAX_DISCARDED_BODY = 64 * 1024
+
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT_INTERVAL = 15
+# Events buffered per stream before a slow client is disconnected
+MAX_PENDING_EVENTS = 100
+
+
+class Subscriber:
+    """An open server-sent events stream"""
+
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self.overflowed = False
+
+
+class ApiServer:
+    def __init__(self, store: ResultStore, host: str = "127.0.0.1", port: int = 8000,
+                 max_age: int = 30):
+        """
+        Initialize the HTTP API server
+
+        Args:
+            store: Store holding the latest agent results
+            host: Interface to bind
+            port: Port to bind
+            max_age: Seconds clients may reuse a response without revalidating
+        """
+        self.store = store
+        self.host = host
+        self.port = port
+        self.max_age = max_age
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.started = threading.Event()
+        self.subscribers = set()
+        # Open connections (handler task -> writer), and those waiting for their next request
+        self.connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.idle = set()
+
+    def start(self):
+        """Start serving on a background thread"""
+        self.thread = threading.Thread(target=self._run, name="api-server", daemon=True)
+        self.thread.start()
+        self.started.wait()
+
+    def stop(self):
+        """Stop the server and wait for its thread to exit"""
+        self.store.remove_listener(self._on_update)
+        if self.loop and self.server:
+            self.loop.call_soon_threadsafe(self._shutdown)
+            self.thread.join(timeout=5)
+
+    def _shutdown(self):
+        # End open event streams so their connections close with the server
+        for subscriber in list(self.subscribers):
+            self._offer(subscriber, None)
+        self.server.close()
+        # Idle keep-alive connections would otherwise wait for a request that never comes
+        for writer in list(self.idle):
+            writer.close()
+
+    def _on_update(self, event_type: str, payload: str, version: int):
+        # Called from the agent thread; hand the event over to the server loop
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._broadcast, (event_type, payload, version))
+
+    def _broadcast(self, event):
+        for subscriber in list(self.subscribers):
+            self._offer(subscriber, event)
+
+    def _offer(self, subscriber: Subscriber, event):
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client can't keep up; drop it so it reconnects and resyncs
+            subscriber.overflowed = True
+            self.subscribers.discard(subscriber)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        except Exception as e:
+            logger.error("API server error: %s", e)
+        finally:
+            self.started.set()
+            self.loop.close()
+
+    async def _serve(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.store.add_listener(self._on_update)
+        logger.info("API server listening on http://%s:%s", self.host, self.port)
+        self.started.set()
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+        # Give closing event streams and requests in progress a moment to finish,
+        # then cancel what is left so no handler outlives the loop
+        if self.connections:
+            _, pending = await asyncio.wait(list(self.connections), timeout=2)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        try:
+            await asyncio.wait_for(self.server.wait_closed(), timeout=2)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self.connections[task] = writer
+        try:
+            while True:
+                self.idle.add(writer)
+                try:
+                    request_line = await reader.readline()
+                finally:
+                    self.idle.discard(writer)
+                if not request_line:
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, keep_alive=False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+                # Chunked bodies aren't supported; without reading the body the
+                # connection can't be reused, so answer and close
+                if "transfer-encoding" in headers:
+                    await self._respond(writer, 501, keep_alive=False)
+                    break
+
+                # Consume any body so it isn't parsed as the next request on a kept-alive connection
+                length = headers.get("content-length", "0")
+                if not length.isdigit():
+                    await self._respond(writer, 400, keep_alive=False)
+                    break
+                if int(length) > MAX_DISCARDED_BODY:
+                    await self._respond(writer, 413, keep_alive=False)
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                if target.split("?", 1)[0].rstrip("/") == "/api/events" and method == "GET":
+                    # The event stream holds the connection until the client or server goes away
+                    await self._stream_events(writer, headers)
+                    break
+
+                await self._dispatch(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error("Error handling API request: %s", e)
+        finally:
+            self.connections.pop(task, None)
+            writer.close()
+
+    async def _dispatch(self, writer: asyncio.StreamWriter, method: str, target: str,
+                        headers: Dict[str, str], keep_alive: bool):
+        path = target.split("?", 1)[0].rstrip("/")
+
+        if method == "OPTIONS":
+            await self._respond(writer, 204, keep_alive=keep_alive)
+            return
+        if method not in ("GET", "HEAD"):
+            await self._respond(writer, 405, keep_alive=keep_alive)
+            return
+
+        if path == "/api/status":
+            body = json.dumps({
+                "version": self.store.version,
+                "updated_at": self.store.updated_at.isoformat(),
+            }).encode("utf-8")
+            await self._respond(writer, 200, body, {"Cache-Control": "no-cache"},
+                                keep_alive=keep_alive, head=method == "HEAD")
+            return
+
+        resource = path[len("/api/"):] if path.startswith("/api/") else None
+        if resource not in RESOURCES:
+            await self._respond(writer, 404, keep_alive=keep_alive)
+            return
+
+        body, etag, updated_at = self.store.snapshot(resource)
+        cache_headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(updated_at, usegmt=True),
+            "Cache-Control": f"public, max-age={self.max_age}, stale-while-revalidate={self.max_age}",
+        }
+
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            await self._respond(writer, 304, extra_headers=cache_headers, keep_alive=keep_alive)
+            return
+
+        await self._respond(writer, 200, body, cache_headers, keep_alive=keep_alive, head=method == "HEAD")
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, headers: Dict[str, str]):
+        """Push new results to the client as server-sent events"""
+        subscriber = Subscriber()
+        self.subscribers.add(subscriber)
+        try:
+            head = [
+                "HTTP/1.1 200 OK",
+                "Content-Type: text/event-stream",
+                "Cache-Control: no-cache",
+                "Connection: keep-alive",
+                "Access-Control-Allow-Origin: *",
+            ]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+            writer.write(f"retry: 5000\nid: {self.store.version}\n\n".encode("utf-8"))
+
+            # A reconnecting client that missed updates must refetch the full resources. An ID
+            # ahead of ours means the agent restarted and its version began again from 0
+            last_event_id = headers.get("last-event-id", "")
+            if last_event_id.isdigit() and int(last_event_id) != self.store.version:
+                writer.write(f"event: resync\nid: {self.store.version}\ndata: {{}}\n\n".encode("utf-8"))
+            await writer.drain()
+
+            while not subscriber.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                    await writer.drain()
+                    continue
+
+                if event is None:
+                    break
+                event_type, payload, version = event
+                writer.write(f"id: {version}\nevent: {event_type}\ndata: {payload}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self.subscribers.discard(subscriber)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes = b"",
+                       extra_headers: Optional[Dict[str, str]] = None, keep_alive: bool = True,
+                       head: bool = False):
+        headers = {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "If-None-Match",
+            "Access-Control-Expose-Headers": "ETag",
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        if status == 200:
+            headers["Content-Type"] = "application/json"
+        if status not in (204, 304):
+            headers["Content-Length"] = str(len(body))
+        headers.update(extra_headers or {})
+
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body and not head and status not in (204, 304):
+            writer.write(body)
+        await writer.drain()
@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from agent.model.sentiment import SentimentAnalysis, TradingSignal
+
+logger = logging.getLogger(__name__)
+
+# Article IDs kept after compaction to seed the news services' processed_ids
+MAX_SEEN_IDS = 10000
+
+# Compact once the journal grows past this size
+COMPACT_BYTES = 4 * 1024 * 1024
+
+# Per-signal steps, in pipeline order
+STEPS = ("image", "tweet", "chain")
+
+STARTED = "started"
+DONE = "done"
+
+
+def _article_to_json(article: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(article)
+    if isinstance(data.get("published"), datetime):
+        data["published"] = data["published"].isoformat()
+    return data
+
+
+def _article_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    article = dict(data)
+    if isinstance(article.get("published"), str):
+        try:
+            article["published"] = datetime.fromisoformat(article["published"])
+        except ValueError:
+            pass
+    return article
+
+
+class Cycle:
+    def __init__(self, journal: Optional["CycleJournal"], cycle_id: str, articles: List[Dict[str, Any]],
+                 resumed: bool = False):
+        """
+        Progress of one batch of articles through the pipeline
+
+        Every completed step is written to the journal before the pipeline moves
+        on, so a restarted agent can pick up exactly where it stopped.
+
+        Args:
+            journal: Journal to write to, or None to track progress in memory only
+            cycle_id: Unique identifier of the cycle
+            articles: Articles in the batch
+            resumed: True if the cycle was replayed from the journal
+        """
+        self.journal = journal
+        self.cycle_id = cycle_id
+        self.articles = articles
+        self.resumed = resumed
+        self.analyses: List[SentimentAnalysis] = []
+        self.analyses_done = False
+        self.signals: List[TradingSignal] = []
+        self.signals_done = False
+        # Signal index -> step -> STARTED/DONE
+        self.steps: Dict[int, Dict[str, str]] = {}
+        # Raw journal lines, kept for unfinished cycles across compaction
+        self.lines: List[str] = []
+
+    def _write(self, event: str, **data):
+        if self.journal:
+            self.lines.append(self.journal.append(event, cycle=self.cycle_id, **data))
+
+    def record_analysis(self, analysis: SentimentAnalysis):
+        self.analyses.append(analysis)
+        self._write("analysis", analysis=analysis.model_dump(mode="json"))
+
+    def finish_analyses(self):
+        self.analyses_done = True
+        self._write("analyses_done")
+
+    def record_signal(self, signal: TradingSignal) -> int:
+        """Record a generated signal and return its index within the cycle"""
+        self.signals.append(signal)
+        index = len(self.signals) - 1
+        self._write("signal", index=index, signal=signal.model_dump(mode="json"))
+        return index
+
+    def finish_signals(self):
+        self.signals_done = True
+        self._write("signals_done")
+
+    def step_state(self, index: int, step: str) -> Optional[str]:
+        return self.steps.get(index, {}).get(step)
+
+    def start_step(self, index: int, step: str):
+        """Mark a side effect that can't be safely repeated as in progress"""
+        self.steps.setdefault(index, {})[step] = STARTED
+        self._write("step", index=index, step=step, status=STARTED)
+
+    def finish_step(self, index: int, step: str, **data):
+        self.steps.setdefault(index, {})[step] = DONE
+        self._write("step", index=index, step=step, status=DONE, **data)
+
+    def is_published(self, index: int) -> bool:
+        return all(self.step_state(index, step) == DONE for step in STEPS)
+
+    def finish(self):
+        if self.journal:
+            self.journal.finish_cycle(self)
+
+    def replay(self, record: Dict[str, Any]):
+        """Apply one journal record to the in-memory state"""
+        event = record["event"]
+        if event == "analysis":
+            self.analyses.append(SentimentAnalysis(**record["analysis"]))
+        elif event == "analyses_done":
+            self.analyses_done = True
+        elif event == "signal":
+            self.signals.append(TradingSignal(**record["signal"]))
+        elif event == "signals_done":
+            self.signals_done = True
+        elif event == "step":
+            index = record["index"]
+            self.steps.setdefault(index, {})[record["step"]] = record["status"]
+            if record["step"] == "image" and record.get("image_url"):
+                self.signals[index].image_url = record["image_url"]
+
+
+class CycleJournal:
+    def __init__(self, path: str):
+        """
+        Open (or create) the write-ahead journal
+
+        The journal is an append-only JSON Lines file. Each record is flushed
+        and fsynced before the step it describes is considered done. Opening
+        it replays the file to find the article IDs already handled and the
+        cycles that were interrupted.
+
+        Args:
+            path: Path of the journal file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # Insertion-ordered so compaction keeps the most recent IDs
+        self.seen: Dict[str, None] = {}
+        self.pending: Dict[str, Cycle] = {}
+
+        self._replay()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def _replay(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, "rb") as journal_file:
+            content = journal_file.read()
+
+        valid_length = 0
+        for raw_line in content.splitlines(keepends=True):
+            try:
+                if not raw_line.endswith(b"\n"):
+                    raise ValueError("incomplete record")
+                line = raw_line.decode("utf-8").rstrip("\n")
+                self._apply(json.loads(line), line)
+            except Exception as e:
+                # Only the record being written when the process died can be torn
+                logger.warning("Ignoring journal tail after %s bytes: %s", valid_length, e)
+                break
+            valid_length += len(raw_line)
+
+        if valid_length < len(content):
+            with open(self.path, "r+b") as journal_file:
+                journal_file.truncate(valid_length)
+
+        if self.pending:
+            logger.info("Journal has %s interrupted cycles to resume", len(self.pending))
+
+    def _apply(self, record: Dict[str, Any], line: str):
+        event = record["event"]
+        if event == "seen":
+            self.seen.update(dict.fromkeys(record["ids"]))
+        elif event == "cycle":
+            articles = [_article_from_json(article) for article in record["articles"]]
+            self.seen.update(dict.fromkeys(article["id"] for article in articles))
+            cycle = Cycle(self, record["cycle"], articles, resumed=True)
+            cycle.lines.append(line)
+            self.pending[cycle.cycle_id] = cycle
+        elif event == "cycle_done":
+            self.pending.pop(record["cycle"], None)
+        else:
+            cycle = self.pending.get(record.get("cycle"))
+            if cycle is not None:
+                cycle.replay(record)
+                cycle.lines.append(line)
+
+    def append(self, event: str, **data) -> str:
+        """
+        Durably append one record
+
+        Returns:
+            The JSON line written
+        """
+        line = json.dumps({"event": event, **data}, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        return line
+
+    def start_cycle(self, articles: List[Dict[str, Any]]) -> Cycle:
+        """
+        Record the start of a cycle before any paid work is done
+
+        Args:
+            articles: Articles in the batch
+
+        Returns:
+            Cycle tracking the batch's progress
+        """
+        cycle = Cycle(self, uuid.uuid4().hex, articles)
+        line = self.append("cycle", cycle=cycle.cycle_id,
+                           articles=[_article_to_json(article) for article in articles])
+        cycle.lines.append(line)
+        self.seen.update(dict.fromkeys(article["id"] for article in articles))
+        self.pending[cycle.cycle_id] = cycle
+        return cycle
+
+    def finish_cycle(self, cycle: Cycle):
+        self.append("cycle_done", cycle=cycle.cycle_id)
+        self.pending.pop(cycle.cycle_id, None)
+        if self.path.stat().st_size > COMPACT_BYTES:
+            self.compact()
+
+    def pending_cycles(self) -> List[Cycle]:
+        """Cycles that were interrupted before finishing, oldest first"""
+        return list(self.pending.values())
+
+    def seen_ids(self) -> set:
+        """IDs of every article that entered a cycle"""
+        return set(self.seen)
+
+    def compact(self):
+        """Rewrite the journal with only the recent article IDs and unfinished cycles"""
+        with self.lock:
+            recent = list(self.seen)[-MAX_SEEN_IDS:]
+            self.seen = dict.fromkeys(recent)
+
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(json.dumps({"event": "seen", "ids": recent}) + "\n")
+                for cycle in self.pending.values():
+                    for line in cycle.lines:
+                        tmp_file.write(line + "\n")
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+
+            self.file.close()
+            os.replace(tmp_path, self.path)
+            self.file = open(self.path, "a", encoding="utf-8")
+
+        logger.info("Compacted journal to %s article IDs and %s open cycles", len(recent), len(self.pending))
+
+    def close(self):
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,92 @@
+import json
+from typing import Any, List
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally extract the elements of one array from a streamed JSON object
+
+    Function-call arguments arrive as text fragments such as
+    '{"analyses": [{"headline": "...' ; feed() returns every element of the
+    array under `key` whose closing brace has arrived, so callers can act on
+    it before the rest of the completion is generated.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.last_key = None
+        self.array_depth = None
+        self.item_start = None
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next fragment of the JSON text
+
+        Args:
+            chunk: Next piece of the streamed text
+
+        Returns:
+            Array elements completed by this fragment, in order
+        """
+        self.buffer += chunk
+        items = []
+        buffer = self.buffer
+
+        while self.pos < len(buffer):
+            char = buffer[self.pos]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        # Strings directly inside the top-level object are keys (or scalar values)
+                        self.last_key = json.loads(buffer[self.string_start:self.pos + 1])
+                    self.string_start = None
+            elif char == '"':
+                self.in_string = True
+                self.string_start = self.pos
+            elif char in "{[":
+                if (char == "[" and self.depth == 1 and self.array_depth is None
+                        and not self.finished and self.last_key == self.key):
+                    self.array_depth = self.depth + 1
+                elif char == "{" and self.depth == self.array_depth:
+                    self.item_start = self.pos
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.array_depth is not None:
+                    if char == "}" and self.depth == self.array_depth and self.item_start is not None:
+                        items.append(json.loads(buffer[self.item_start:self.pos + 1]))
+                        self.item_start = None
+                    elif char == "]" and self.depth == self.array_depth - 1:
+                        self.array_depth = None
+                        self.finished = True
+
+            self.pos += 1
+
+        self._trim()
+        return items
+
+    def _trim(self):
+        # Drop text that can no longer be part of an item or key
+        starts = [start for start in (self.item_start, self.string_start) if start is not None]
+        cut = min(starts) if starts else self.pos
+        if cut > 0:
+            self.buffer = self.buffer[cut:]
+            self.pos -= cut
+            if self.item_start is not None:
+                self.item_start -= cut
+            if self.string_start is not None:
+                self.string_start -= cut
+
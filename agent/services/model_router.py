@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+HIGH = "high"
+NORMAL = "normal"
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 100):
+        """
+        Rolling latency samples per model
+
+        Args:
+            window: Number of recent samples kept per model
+        """
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+
+    def record(self, model: str, seconds: float):
+        with self.lock:
+            self.samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, model: str) -> int:
+        with self.lock:
+            return len(self.samples.get(model, ()))
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """Latency below which a fraction q of the samples fall, or None without samples"""
+        with self.lock:
+            values = sorted(self.samples.get(model, ()))
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            model: {"count": self.count(model), "p50": self.percentile(model, 0.5), "p95": self.percentile(model, 0.95)}
+            for model in list(self.samples)
+        }
+
+
+class ModelRouter:
+    def __init__(self, client: AsyncOpenAI, model: str = "gpt-4-turbo-preview", fast_model: str = "gpt-4o-mini",
+                 bulk_batch_size: int = 30, hedge_after: float = 20.0, min_samples: int = 10,
+                 timeout: float = 120.0):
+        """
+        Route chat completions between a primary and a fast model, hedging slow requests
+
+        High-priority requests always go to the primary model; large batches of
+        normal priority go to the fast model. If the chosen model has not
+        responded within its observed p95 latency, the same request is also
+        sent to the fast model, the first response wins and the other request
+        is cancelled. For streams, latency means time to the first chunk: once
+        output is flowing it can't be switched to another model.
+
+        Args:
+            client: Async OpenAI client (base_url may point at a local stub)
+            model: Primary model
+            fast_model: Lower-latency model used for bulk work and hedges
+            bulk_batch_size: Normal-priority batches at least this large use the fast model
+            hedge_after: Seconds before hedging while a model has fewer than min_samples samples
+            min_samples: Samples needed before the observed p95 replaces hedge_after
+            timeout: Seconds to wait for a response, or for the next chunk of a stream
+        """
+        self.client = client
+        self.model = model
+        self.fast_model = fast_model
+        self.bulk_batch_size = bulk_batch_size
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.timeout = timeout
+        self.latency = LatencyTracker()
+
+        # Requests run on a private event loop so losing requests can be cancelled
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="model-router", daemon=True)
+        self.thread.start()
+
+    def select(self, batch_size: int, priority: str = NORMAL) -> str:
+        """Pick the model for a request"""
+        if priority != HIGH and batch_size >= self.bulk_batch_size:
+            return self.fast_model
+        return self.model
+
+    def hedge_delay(self, model: str) -> float:
+        if self.latency.count(model) < self.min_samples:
+            return self.hedge_after
+        return self.latency.percentile(model, 0.95)
+
+    def _run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timed out or interrupted: don't leave the request running on the loop
+            future.cancel()
+            raise
+
+    async def _race(self, opener: Callable[[str], Awaitable[Any]], primary: str) -> Tuple[str, Any]:
+        """
+        Run opener(primary), adding opener(fast_model) if the primary is slower than its p95
+
+        A request that already runs on the fast model isn't hedged, since the
+        only other model is slower; if it fails it falls back to the main
+        model. When both names are the same model nothing is duplicated.
+
+        Returns:
+            (model, result) of the first attempt to succeed
+        """
+        async def attempt(model: str, started: float):
+            result = await opener(model)
+            self.latency.record(model, time.monotonic() - started)
+            return model, result
+
+        def launch(model: str) -> asyncio.Future:
+            started = time.monotonic()
+            task = asyncio.ensure_future(attempt(model, started))
+            tasks[task] = (model, started)
+            return task
+
+        fallback = self.model if primary == self.fast_model else self.fast_model
+        hedge = primary != self.fast_model
+
+        tasks: Dict[asyncio.Future, Tuple[str, float]] = {}
+        first = launch(primary)
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(primary) if hedge else None)
+
+        if not done:
+            logger.info("%s slower than %.1fs, hedging with %s", primary, self.hedge_delay(primary), self.fast_model)
+            launch(self.fast_model)
+        elif first.exception() is not None and fallback != primary:
+            logger.warning("Request to %s failed, falling back to %s: %s", primary, fallback, first.exception())
+            del tasks[first]
+            launch(fallback)
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    break
+            else:
+                # Every attempt failed; surface the first attempt's error
+                raise next(iter(tasks)).exception()
+        finally:
+            for task, (model, started) in tasks.items():
+                if task.done():
+                    continue
+                task.cancel()
+                # A cancelled request is at least this slow; keep the p95 honest
+                self.latency.record(model, time.monotonic() - started)
+                logger.info("Cancelled slower request to %s", model)
+
+        # Both may finish in the same tick; release the stream that lost
+        for task in done:
+            if task is not winner and task.exception() is None:
+                _, result = task.result()
+                if isinstance(result, tuple):
+                    await result[0].close()
+
+        return winner.result()
+
+    def complete(self, request: Dict[str, Any], batch_size: int = 1, priority: str = NORMAL) -> Any:
+        """
+        Create a chat completion on the routed model
+
+        Args:
+            request: Arguments for chat.completions.create, without model
+            batch_size: Number of items in the request
+            priority: HIGH or NORMAL
+
+        Returns:
+            The ChatCompletion of the winning attempt
+        """
+        async def opener(model: str):
+            return await self.client.chat.completions.create(model=model, **request)
+
+        model, response = self._run(self._race(opener, self.select(batch_size, priority)), self.timeout * 2)
+        return response
+
+    def stream(self, request: Dict[str, Any], batch_size: int = 1, priority: str = NORMAL) -> Iterator[Any]:
+        """
+        Stream a chat completion on the routed model
+
+        Args:
+            request: Arguments for chat.completions.create, without model or stream
+            batch_size: Number of items in the request
+            priority: HIGH or NORMAL
+
+        Yields:
+            ChatCompletionChunks of the winning attempt
+        """
+        async def opener(model: str):
+            stream = await self.client.chat.completions.create(model=model, stream=True, **request)
+            try:
+                first = await stream.__anext__()
+            except BaseException:
+                await stream.close()
+                raise
+            return stream, first
+
+        model, (stream, first) = self._run(self._race(opener, self.select(batch_size, priority)),
+                                           self.timeout * 2)
+        try:
+            yield first
+            while True:
+                try:
+                    chunk = self._run(stream.__anext__(), self.timeout)
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        finally:
+            self._run(stream.close(), self.timeout)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
@@ -0,0 +1,316 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+from eth_account import Account
+from moccasin.config import get_config, initialize_global_config
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+CONTRACT_NAME = "SentimentTracker"
+
+# The parts of the SentimentTracker ABI the recorder uses (see contract_detail.py)
+SENTIMENT_TRACKER_ABI = [
+    {
+        "stateMutability": "nonpayable", "type": "function", "name": "record_sentiment",
+        "inputs": [{"name": "cryptocurrency", "type": "string"}, {"name": "sentiment", "type": "int128"},
+                   {"name": "timestamp", "type": "uint256"}],
+        "outputs": [],
+    },
+    {
+        "stateMutability": "view", "type": "function", "name": "get_sentiment_history",
+        "inputs": [{"name": "cryptocurrency", "type": "string"}],
+        "outputs": [{"name": "", "type": "tuple[]", "components": [
+            {"name": "sentiment", "type": "int128"}, {"name": "timestamp", "type": "uint256"}]}],
+    },
+]
+
+
+def _moccasin_config():
+    try:
+        return get_config()
+    except Exception as e:
+        if "Global Config object not initialized" not in str(e):
+            raise
+        initialize_global_config()
+        return get_config()
+
+
+class NetworkRecorder:
+    def __init__(self, name: str, url: str, contract_address: str, account, chain_id: Optional[int] = None,
+                 rpc_timeout: float = 30, receipt_timeout: float = 120, backoff: float = 60,
+                 max_queue: int = 100):
+        """
+        Records sentiment on one network from its own thread
+
+        Each network has its own web3 connection, account and locally tracked
+        nonce, and submits its transactions one at a time from a dedicated
+        thread. A slow or unreachable RPC only backs up its own queue; after a
+        failure the network is skipped for `backoff` seconds so records don't
+        pile up behind a dead endpoint, and at most `max_queue` records wait
+        for a slow one; further records are skipped and counted.
+
+        Args:
+            name: Moccasin network name
+            url: JSON-RPC URL
+            contract_address: SentimentTracker address on this network
+            account: eth_account LocalAccount (e.g. a MoccasinAccount) that signs the transactions
+            chain_id: Chain ID, read from the RPC if not given
+            rpc_timeout: Seconds to wait for each RPC call
+            receipt_timeout: Seconds to wait for a transaction to be mined
+            backoff: Seconds to skip the network after a failure
+            max_queue: Records waiting or in flight before new ones are skipped
+        """
+        self.name = name
+        self.w3 = Web3(Web3.HTTPProvider(url, request_kwargs={"timeout": rpc_timeout}))
+        self.contract = self.w3.eth.contract(address=Web3.to_checksum_address(contract_address),
+                                             abi=SENTIMENT_TRACKER_ABI)
+        self.account = account
+        self.chain_id = chain_id
+        self.receipt_timeout = receipt_timeout
+        self.backoff = backoff
+        self.max_queue = max_queue
+        # Mirrors skip records while backing off or backed up; the primary always attempts them
+        self.skip_on_failure = True
+        self.nonce: Optional[int] = None
+        self.skip_until = 0.0
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"chain-{name}")
+
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=100)
+        self.recorded = 0
+        self.failed = 0
+        self.skipped = 0
+        # Records queued or in flight, and records discarded unsent by close()
+        self.queued = 0
+        self.dropped = 0
+        self.gas_used = 0
+        self.fees_wei = 0
+
+    def submit(self, cryptocurrency: str, sentiment: int, timestamp: int) -> Future:
+        """Queue a record on this network's thread; the future resolves to True once it is mined"""
+        with self.lock:
+            full = self.skip_on_failure and self.queued >= self.max_queue
+            if full:
+                self.skipped += 1
+            else:
+                self.queued += 1
+        if full:
+            logger.warning("Skipping %s record for %s: %s records already queued",
+                           self.name, cryptocurrency, self.max_queue)
+            future = Future()
+            future.set_result(False)
+            return future
+
+        future = self.executor.submit(self._record, cryptocurrency, sentiment, timestamp)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        with self.lock:
+            self.queued -= 1
+            if future.cancelled():
+                self.dropped += 1
+
+    def _next_nonce(self) -> int:
+        if self.nonce is None:
+            # Include our own transactions that are still in the mempool
+            self.nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
+        return self.nonce
+
+    def _record(self, cryptocurrency: str, sentiment: int, timestamp: int) -> bool:
+        if self.skip_on_failure and time.monotonic() < self.skip_until:
+            with self.lock:
+                self.skipped += 1
+            logger.warning("Skipping %s record for %s: network is backing off after a failure",
+                           self.name, cryptocurrency)
+            return False
+
+        started = time.monotonic()
+        try:
+            if self.chain_id is None:
+                self.chain_id = self.w3.eth.chain_id
+            transaction = self.contract.functions.record_sentiment(cryptocurrency, sentiment, timestamp) \
+                .build_transaction({"from": self.account.address, "nonce": self._next_nonce(),
+                                    "chainId": self.chain_id})
+            signed = self.account.sign_transaction(transaction)
+            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            # The nonce is used once the node accepted the transaction, even if it is never mined
+            self.nonce += 1
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.receipt_timeout)
+            if receipt["status"] != 1:
+                raise RuntimeError(f"transaction {tx_hash.hex()} reverted")
+        except Exception as e:
+            # Resynchronize the nonce from the chain on the next attempt
+            self.nonce = None
+            self.skip_until = time.monotonic() + self.backoff
+            with self.lock:
+                self.failed += 1
+            logger.error("Failed to record sentiment for %s on %s: %s", cryptocurrency, self.name, e)
+            return False
+
+        latency = time.monotonic() - started
+        gas_used = receipt["gasUsed"]
+        fee = gas_used * receipt.get("effectiveGasPrice", 0)
+        with self.lock:
+            self.recorded += 1
+            self.latencies.append(latency)
+            self.gas_used += gas_used
+            self.fees_wei += fee
+        logger.info("Recorded sentiment for %s on %s in %.2fs, %s gas (%.6f native)",
+                    cryptocurrency, self.name, latency, gas_used, Web3.from_wei(fee, "ether"))
+        return True
+
+    def get_sentiment_history(self, cryptocurrency: str) -> List[Dict[str, Any]]:
+        history = self.contract.functions.get_sentiment_history(cryptocurrency).call()
+        return [{'sentiment': record[0] / 100.0, 'timestamp': record[1]} for record in history]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                "recorded": self.recorded,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "dropped": self.dropped,
+                "queued": self.queued,
+                "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+                "latency_max": latencies[-1] if latencies else None,
+                "gas_used": self.gas_used,
+                "avg_gas": self.gas_used // self.recorded if self.recorded else None,
+                "fees": float(Web3.from_wei(self.fees_wei, "ether")),
+            }
+
+    def close(self):
+        """Stop after the record in flight; records still queued are discarded and counted as dropped"""
+        with self.lock:
+            dropped = self.dropped
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            dropped = self.dropped - dropped
+        if dropped:
+            logger.warning("Dropped %s queued records for %s on shutdown", dropped, self.name)
+
+
+class MultiChainRecorder:
+    def __init__(self, recorders: List[NetworkRecorder], report_interval: float = 600):
+        """
+        Record every sentiment on several networks at once
+
+        Stands in for BlockchainService. Each record is handed to every
+        network's own thread; record_sentiment waits only for the first
+        (primary) network, so the other networks never delay the pipeline or
+        each other. Mirrors skip records for a while after a failure; the
+        primary attempts every record, so its result is always a real one.
+
+        Args:
+            recorders: One recorder per network, primary first
+            report_interval: Seconds between per-network latency and gas summaries in the log
+        """
+        if not recorders:
+            raise ValueError("At least one network is required")
+        self.recorders = recorders
+        self.primary = recorders[0]
+        self.primary.skip_on_failure = False
+        self.report_interval = report_interval
+        self.last_report = time.monotonic()
+
+    @classmethod
+    def from_networks(cls, specs: List[Tuple[str, Optional[str]]], default_contract_address: Optional[str] = None,
+                      **options) -> "MultiChainRecorder":
+        """
+        Build recorders from moccasin network definitions
+
+        Networks that can't be set up are logged and left out.
+
+        Args:
+            specs: (network name, contract address or None) pairs; without an address the
+                   network's SentimentTracker from moccasin.toml is used, then default_contract_address
+            default_contract_address: Fallback contract address
+            **options: Passed to NetworkRecorder
+
+        Returns:
+            Recorder for the networks that could be set up, primary first
+        """
+        config = _moccasin_config()
+        recorders = []
+        for name, address in specs:
+            try:
+                network = config.networks.get_network(name)
+                if not address:
+                    named = (getattr(network, "contracts", None) or {}).get(CONTRACT_NAME)
+                    address = getattr(named, "address", None) or default_contract_address
+                if not address:
+                    raise ValueError(f"no {CONTRACT_NAME} address configured")
+
+                account = network.get_default_account()
+                private_key = os.getenv(f"{name.upper().replace('-', '_')}_PRIVATE_KEY")
+                if not getattr(account, "address", None) and private_key:
+                    account = Account.from_key(private_key)
+                if not getattr(account, "address", None):
+                    raise ValueError("no default account configured")
+
+                recorders.append(NetworkRecorder(name, network.url, address, account,
+                                                 chain_id=getattr(network, "chain_id", None), **options))
+                logger.info("Recording to %s at %s from %s", name, address, account.address)
+            except Exception as e:
+                logger.error("Failed to set up network %s, leaving it out: %s", name, e)
+        return cls(recorders)
+
+    def record_sentiment(self, contract_address: str, cryptocurrency: str,
+                         sentiment_score: float, timestamp: int) -> bool:
+        """
+        Record sentiment on every network
+
+        Args:
+            contract_address: Ignored; each network records to its own contract
+            cryptocurrency: Name of the cryptocurrency
+            sentiment_score: Sentiment score (-1.0 to 1.0)
+            timestamp: Unix timestamp
+
+        Returns:
+            True if the record was mined on the primary network
+        """
+        sentiment_int = int(sentiment_score * 100)
+        if sentiment_int < -100 or sentiment_int > 100:
+            logger.error("Sentiment score must be between -1.0 and 1.0, got %s", sentiment_score)
+            return False
+        timestamp_u256 = int(timestamp) & ((1 << 256) - 1)
+
+        futures = [recorder.submit(cryptocurrency, sentiment_int, timestamp_u256) for recorder in self.recorders]
+        success = futures[0].result()
+
+        if time.monotonic() - self.last_report >= self.report_interval:
+            self.last_report = time.monotonic()
+            self.log_stats()
+        return success
+
+    def get_sentiment_history(self, contract_address: str, cryptocurrency: str) -> list:
+        try:
+            return self.primary.get_sentiment_history(cryptocurrency)
+        except Exception as e:
+            logger.error("Failed to get sentiment history from %s: %s", self.primary.name, e)
+            return []
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-network counts, latency (seconds) and gas"""
+        return {recorder.name: recorder.stats() for recorder in self.recorders}
+
+    def log_stats(self):
+        for name, stats in self.stats().items():
+            logger.info("%s: %s recorded, %s failed, %s skipped, %s dropped, %s queued, latency p50 %s max %s, "
+                        "%s gas (avg %s), fees %.6f",
+                        name, stats["recorded"], stats["failed"], stats["skipped"], stats["dropped"], stats["queued"],
+                        "-" if stats["latency_p50"] is None else f"{stats['latency_p50']:.2f}s",
+                        "-" if stats["latency_max"] is None else f"{stats['latency_max']:.2f}s",
+                        stats["gas_used"], "-" if stats["avg_gas"] is None else stats["avg_gas"], stats["fees"])
+
+    def close(self):
+        for recorder in self.recorders:
+            recorder.close()
+        self.log_stats()
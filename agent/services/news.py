@@ -1,15 +1,114 @@
 import feedparser
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+import requests
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterable
+
+from agent.services.entities import EntityRouter
+from agent.services.feed_stream import RecordingReader, iter_feed_entries
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the feed server to respond
+FEED_TIMEOUT = 30
+
 
 class NewsService:
-    def __init__(self, feed_url: str):
+    def __init__(self, feed_url: str, entity_router: Optional[EntityRouter] = None, stop_at_seen: bool = True):
+        """
+        Initialize the feed poller
+
+        Args:
+            feed_url: RSS feed URL
+            entity_router: When set, articles are tagged with the tracked assets they
+                           mention and articles mentioning none are dropped
+            stop_at_seen: Stop reading the feed at the first already-processed entry;
+                          only correct for feeds ordered newest-first
+        """
         self.feed_url = feed_url
+        self.entity_router = entity_router
+        self.stop_at_seen = stop_at_seen
         self.processed_ids = set()
+        # Validators from the last response, sent back so unchanged feeds answer 304
+        self.etag = None
+        self.modified = None
+
+    def _fetch_entries(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Download and parse the unprocessed entries of the feed
+
+        The response is parsed as it streams in and, for newest-first feeds,
+        closed at the first entry already processed. Documents that aren't
+        well-formed XML are handed to feedparser instead: from the bytes kept
+        so far if the parse failed before the first entry, otherwise from a
+        second download, so only the head of the document is ever buffered.
+
+        Returns:
+            Unprocessed entries, or None if the feed has not been modified
+        """
+        # Same User-Agent as feedparser, which some feed servers allow-list
+        headers = {'User-Agent': feedparser.USER_AGENT}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.modified:
+            headers['If-Modified-Since'] = self.modified
+
+        with requests.get(self.feed_url, headers=headers, stream=True, timeout=FEED_TIMEOUT) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+
+            self.etag = response.headers.get('ETag')
+            self.modified = response.headers.get('Last-Modified')
+
+            response.raw.decode_content = True
+            reader = RecordingReader(response.raw)
+
+            def entries():
+                for entry in iter_feed_entries(reader):
+                    reader.stop()
+                    yield entry
+
+            try:
+                return self._unprocessed(entries(), self.stop_at_seen)
+            except ET.ParseError as e:
+                logger.warning("Feed is not well-formed XML (%s), parsing with feedparser: %s", e, self.feed_url)
+                if reader.recording:
+                    content = reader.read_all()
+                else:
+                    content = requests.get(self.feed_url, headers={'User-Agent': feedparser.USER_AGENT},
+                                           timeout=FEED_TIMEOUT).content
+                # feedparser can't stop early, so it always skips seen entries instead
+                return self._unprocessed(self._feedparser_entries(content), False)
+
+    def _feedparser_entries(self, content: bytes) -> Iterable[Dict[str, Any]]:
+        feed = feedparser.parse(content)
+        source = feed.feed.get('title', "Unknown")
+        for entry in feed.entries:
+            yield {
+                'id': entry.get('id') or entry.get('link', ""),
+                'title': entry.get('title', ""),
+                'summary': entry.get('summary', ""),
+                'link': entry.get('link', ""),
+                'published': datetime(*entry.published_parsed[:6]) if entry.get('published_parsed') else None,
+                'source': source,
+            }
+
+    def _unprocessed(self, entries: Iterable[Dict[str, Any]], stop_at_seen: bool) -> List[Dict[str, Any]]:
+        unprocessed = []
+        total = 0
+        for entry in entries:
+            total += 1
+            if entry['id'] in self.processed_ids:
+                if stop_at_seen:
+                    break
+                continue
+            unprocessed.append(entry)
+
+        if total == 0:
+            logger.error("No news items found in the feed")
+        return unprocessed
 
     def poll_feed(self) -> List[Dict[str, Any]]:
         """
@@ -19,44 +118,42 @@ class NewsService:
             List of dictionaries containing article information
         """
         try:
-            feed = feedparser.parse(self.feed_url)
+            entries = self._fetch_entries()
             new_items = []
-            
-            if not feed.entries:
-                logger.error("No news items found in the feed")
-                return []
 
-            for entry in feed.entries:
-                if entry.id in self.processed_ids:
-                    continue
+            if entries is None:
+                logger.debug("Feed not modified: %s", self.feed_url)
+                return []
 
+            for entry in entries:
                 try:
-                    # Extract publication date
-                    if hasattr(entry, 'published_parsed'):
-                        pub_date = datetime(*entry.published_parsed[:6])
-                    else:
-                        pub_date = datetime.now()
-                    
-                    # Create article data
                     article = {
-                        'id': entry.id,
-                        'title': entry.title,
-                        'summary': entry.summary if hasattr(entry, 'summary') else "",
-                        'link': entry.link,
-                        'published': pub_date,
-                        'source': feed.feed.title if hasattr(feed, 'feed') and hasattr(feed.feed, 'title') else "Unknown"
+                        'id': entry['id'],
+                        'title': entry['title'],
+                        'summary': entry['summary'],
+                        'link': entry['link'],
+                        # Naive UTC, like the parsed feed dates
+                        'published': entry['published'] or datetime.now(timezone.utc).replace(tzinfo=None),
+                        'source': entry['source']
                     }
                     
-                    logger.info(f"New article: {entry.title}")
-                    self.processed_ids.add(entry.id)
+                    self.processed_ids.add(entry['id'])
+
+                    if self.entity_router:
+                        article['entities'] = self.entity_router.tag(article)
+                        if not article['entities']:
+                            logger.debug("Skipping article without tracked assets: %s", entry['title'])
+                            continue
+
+                    logger.info("New article: %s", entry['title'])
                     new_items.append(article)
                     
                 except Exception as e:
-                    logger.error(f"Error parsing entry: {str(e)}")
+                    logger.error("Error parsing entry: %s", e)
                     continue
 
             return new_items
 
         except Exception as e:
-            logger.error(f"Error polling news feed: {str(e)}")
-            return [] 
\ No newline at end of file
+            logger.error("Error polling news feed: %s", e)
+            return []
\ No newline at end of file
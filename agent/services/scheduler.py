@@ -0,0 +1,241 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Any, Optional
+
+from agent.services.news import NewsService
+
+logger = logging.getLogger(__name__)
+
+# Number of recent publish timestamps used to estimate a feed's rate
+RATE_WINDOW = 20
+
+
+class FeedState:
+    """Polling state and publish-rate estimate for a single feed"""
+
+    def __init__(self, news_service: NewsService, prior_interval: float):
+        self.news_service = news_service
+        self.prior_interval = prior_interval
+        self.published = deque(maxlen=RATE_WINDOW)
+        self.next_poll_at = 0.0
+        self.interval = prior_interval
+
+    @property
+    def feed_url(self) -> str:
+        return self.news_service.feed_url
+
+    def observe(self, articles: List[Dict[str, Any]]):
+        """Record the publish timestamps of newly seen articles"""
+        for article in articles:
+            published = article.get('published')
+            if isinstance(published, datetime):
+                # Feed timestamps are naive UTC; timestamp() would read them as local time
+                if published.tzinfo is None:
+                    published = published.replace(tzinfo=timezone.utc)
+                self.published.append(published.timestamp())
+
+    def rate(self) -> float:
+        """
+        Estimate the feed's publish rate
+
+        Returns:
+            Articles per second, falling back to one article per prior interval
+        """
+        if len(self.published) < 2:
+            return 1.0 / self.prior_interval
+
+        timestamps = sorted(self.published)
+        span = timestamps[-1] - timestamps[0]
+        # Count the time since the last article too, so a feed that goes quiet slows down
+        span += max(0.0, time.time() - timestamps[-1])
+        if span <= 0:
+            return 1.0 / self.prior_interval
+        return (len(timestamps) - 1) / span
+
+
+class PollScheduler:
+    def __init__(self, news_services: List[NewsService],
+                 on_batch: Callable[[List[Dict[str, Any]]], None],
+                 min_interval: float, max_interval: float, budget_per_hour: float,
+                 jitter: float = 0.1, min_batch_size: int = 5, max_batch_latency: float = 300,
+                 burst_hours: float = 4,
+                 max_batches_per_hour: Optional[int] = None,
+                 on_stop: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """
+        Initialize the adaptive polling scheduler
+
+        Each feed is polled about once per article it is expected to publish,
+        so busy feeds are polled often and quiet ones rarely. Polls are paid
+        for from a token bucket that refills at budget_per_hour: requests saved
+        while feeds are quiet are spent during bursts, and the long-run
+        average never exceeds the budget.
+
+        Args:
+            news_services: One NewsService per feed
+            on_batch: Callback that processes a batch of new articles
+            min_interval: Shortest allowed interval between polls of one feed, in seconds
+            max_interval: Longest allowed interval between polls of one feed, in seconds
+            budget_per_hour: Average number of feed requests per hour across all feeds
+            jitter: Relative random jitter applied to each interval
+            min_batch_size: Number of queued articles that triggers analysis immediately
+            max_batch_latency: Maximum seconds an article may wait before analysis is triggered
+            burst_hours: Hours of budget that can be saved up for a burst
+            max_batches_per_hour: Cap on batches handed to on_batch in any hour, or None for no cap
+            on_stop: Callback that receives articles still queued when the scheduler stops;
+                     without it they are processed as a final batch
+        """
+        self.feeds = [FeedState(service, max_interval) for service in news_services]
+        self.on_batch = on_batch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget_per_hour = budget_per_hour
+        # Token bucket of feed requests, starting full
+        self.capacity = max(1.0, budget_per_hour * burst_hours)
+        self.tokens = self.capacity
+        self.refilled_at = time.monotonic()
+        self.jitter = jitter
+        self.min_batch_size = min_batch_size
+        self.max_batch_latency = max_batch_latency
+        self.max_batches_per_hour = max_batches_per_hour
+        self.on_stop = on_stop
+        # Monotonic times of the flushes in the last hour
+        self.flushes = deque()
+        self.pending = []
+        self.pending_since = None
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        """Request the scheduler to stop; interrupts any sleep in progress"""
+        self.stop_event.set()
+
+    def compute_intervals(self):
+        """Poll each feed about once per expected new article, within the interval limits"""
+        for feed in self.feeds:
+            rate = feed.rate()
+            interval = 1.0 / rate if rate > 0 else self.max_interval
+            feed.interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.refilled_at) * self.budget_per_hour / 3600.0)
+        self.refilled_at = now
+
+    def take_token(self) -> Optional[float]:
+        """
+        Spend one request from the budget
+
+        Returns:
+            None if a token was taken, otherwise the monotonic time the next one is available
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return None
+        if self.budget_per_hour <= 0:
+            return now + self.max_interval
+        return now + (1 - self.tokens) * 3600.0 / self.budget_per_hour
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def poll(self, feed: FeedState):
+        """Poll a single feed and queue any new articles"""
+        articles = feed.news_service.poll_feed()
+        feed.observe(articles)
+
+        if articles:
+            if not self.pending:
+                self.pending_since = time.monotonic()
+            self.pending.extend(articles)
+
+        self.compute_intervals()
+        feed.next_poll_at = time.monotonic() + self._jittered(feed.interval)
+        logger.info("Polled %s: %s new, next poll in %.0fs", feed.feed_url, len(articles), feed.interval)
+
+    def next_flush_allowed(self, now: Optional[float] = None) -> float:
+        """Monotonic time from which another batch fits in the hourly cap"""
+        if now is None:
+            now = time.monotonic()
+        while self.flushes and self.flushes[0] <= now - 3600:
+            self.flushes.popleft()
+        if self.max_batches_per_hour is None or len(self.flushes) < self.max_batches_per_hour:
+            return now
+        return self.flushes[0] + 3600
+
+    def batch_deadline(self) -> Optional[float]:
+        """Monotonic time at which the pending batch must be flushed, if any"""
+        if not self.pending:
+            return None
+        return max(self.pending_since + self.max_batch_latency, self.next_flush_allowed())
+
+    def batch_ready(self) -> bool:
+        if not self.pending:
+            return False
+        now = time.monotonic()
+        if now < self.next_flush_allowed(now):
+            return False
+        if len(self.pending) >= self.min_batch_size:
+            return True
+        return now >= self.batch_deadline()
+
+    def flush(self):
+        """Hand the pending articles to the batch callback"""
+        batch, self.pending, self.pending_since = self.pending, [], None
+        self.flushes.append(time.monotonic())
+        logger.info("Processing batch of %s articles", len(batch))
+        try:
+            self.on_batch(batch)
+        except Exception as e:
+            logger.error("Error processing article batch: %s", e)
+
+    def run(self):
+        """Run the scheduler until stop() is called"""
+        logger.info("Starting adaptive scheduler for %s feeds", len(self.feeds))
+
+        # Stagger the first polls so feeds don't all fire at once
+        now = time.monotonic()
+        for feed in self.feeds:
+            feed.next_poll_at = now + random.uniform(0, self.min_interval * self.jitter)
+
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+
+            # Most overdue first, so feeds take turns when the budget runs short
+            for feed in sorted(self.feeds, key=lambda feed: feed.next_poll_at):
+                if self.stop_event.is_set() or feed.next_poll_at > now:
+                    break
+                available_at = self.take_token()
+                if available_at is not None:
+                    for waiting in self.feeds:
+                        if waiting.next_poll_at <= now:
+                            waiting.next_poll_at = available_at
+                    break
+                self.poll(feed)
+
+            if self.batch_ready() and not self.stop_event.is_set():
+                self.flush()
+
+            wake_at = min(feed.next_poll_at for feed in self.feeds)
+            deadline = self.batch_deadline()
+            if deadline is not None:
+                wake_at = min(wake_at, deadline)
+
+            self.stop_event.wait(max(0.0, wake_at - time.monotonic()))
+
+        # Queued articles are already marked as processed, so they must not be dropped
+        if self.pending:
+            if self.on_stop:
+                batch, self.pending, self.pending_since = self.pending, [], None
+                logger.info("Scheduler stopped with %s unprocessed articles, handing them off", len(batch))
+                try:
+                    self.on_stop(batch)
+                except Exception as e:
+                    logger.error("Error saving unprocessed articles: %s", e)
+            else:
+                logger.info("Scheduler stopped with %s unprocessed articles, processing them", len(self.pending))
+                self.flush()
+        logger.info("Scheduler stopped")
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+from agent.model.sentiment import SentimentAnalysis, TradingSignal
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ("articles", "sentiment", "signals")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class ResultStore:
+    def __init__(self, max_articles: int = 200, max_analyses: int = 200):
+        """
+        Initialize the in-memory result store
+
+        Args:
+            max_articles: Number of most recent articles to keep
+            max_analyses: Number of most recent sentiment analyses to keep
+        """
+        self.lock = threading.Lock()
+        self.articles = deque(maxlen=max_articles)
+        self.analyses = deque(maxlen=max_analyses)
+        self.signals = {}  # Latest signal per cryptocurrency
+        self.version = 0
+        self.updated_at = datetime.now(timezone.utc)
+        self.snapshots = {}
+        self.listeners = []
+
+    def add_listener(self, listener: Callable[[str, str, int], None]):
+        """
+        Register a callback for new results
+
+        Args:
+            listener: Called with (event type, JSON-encoded delta, store version) after every update
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str, int], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def update(self, articles: Optional[List[Dict[str, Any]]] = None,
+               analyses: Optional[List[SentimentAnalysis]] = None,
+               signals: Optional[List[TradingSignal]] = None):
+        """
+        Add the results of a cycle to the store
+
+        Args:
+            articles: Newly fetched articles
+            analyses: Newly generated sentiment analyses
+            signals: Newly generated trading signals
+        """
+        with self.lock:
+            for article in articles or []:
+                self.articles.appendleft(article)
+            for analysis in analyses or []:
+                self.analyses.appendleft(analysis)
+            for signal in signals or []:
+                self.signals[signal.cryptocurrency] = signal
+
+            self.version += 1
+            self.updated_at = datetime.now(timezone.utc)
+            # Serialized bodies are rebuilt lazily on the next read
+            self.snapshots = {}
+            version = self.version
+
+        if not self.listeners:
+            return
+
+        # Deltas are encoded once and shared by every listener
+        events = []
+        if articles:
+            events.append(("articles", articles))
+        if analyses:
+            events.append(("sentiment", [analysis.model_dump(mode="json") for analysis in analyses]))
+        if signals:
+            events.append(("signals", [signal.model_dump(mode="json") for signal in signals]))
+
+        for event_type, data in events:
+            payload = json.dumps(data, default=_json_default)
+            for listener in list(self.listeners):
+                try:
+                    listener(event_type, payload, version)
+                except Exception as e:
+                    logger.error("Error notifying result listener: %s", e)
+
+    def _serialize(self, resource: str) -> bytes:
+        if resource == "articles":
+            data = list(self.articles)
+        elif resource == "sentiment":
+            data = [analysis.model_dump(mode="json") for analysis in self.analyses]
+        else:
+            data = [signal.model_dump(mode="json") for signal in
+                    sorted(self.signals.values(), key=lambda s: s.timestamp, reverse=True)]
+        return json.dumps(data, default=_json_default).encode("utf-8")
+
+    def snapshot(self, resource: str) -> Tuple[bytes, str, datetime]:
+        """
+        Get the serialized body of a resource
+
+        Args:
+            resource: One of "articles", "sentiment" or "signals"
+
+        Returns:
+            Tuple of (JSON body, ETag, last update time)
+        """
+        if resource not in RESOURCES:
+            raise KeyError(resource)
+
+        with self.lock:
+            if resource not in self.snapshots:
+                body = self._serialize(resource)
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                self.snapshots[resource] = (body, etag, self.updated_at)
+            return self.snapshots[resource]
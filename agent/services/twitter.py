@@ -35,7 +35,7 @@ class TwitterService:
             self.client = tweepy.API(auth)
             logger.info("Twitter client initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Twitter client: {str(e)}")
+            logger.error("Failed to initialize Twitter client: %s", e)
             self.client = None
             
     def post_tweet(self, text: str, image_url: Optional[str] = None) -> bool:
@@ -96,5 +96,5 @@ class TwitterService:
                 return True
                 
         except Exception as e:
-            logger.error(f"Failed to post tweet: {str(e)}")
+            logger.error("Failed to post tweet: %s", e)
             return False 
\ No newline at end of file
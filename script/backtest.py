@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import sys
+import os
+import logging
+import argparse
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.backtest import Backtester, StrategyConfig, expand_grid, load_prices, load_sentiment
+from agent.services.history import HistoryStore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = StrategyConfig()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Backtest sentiment-driven trading signals')
+    parser.add_argument('--prices', type=str, required=True, help='Price CSV, or directory of {asset}.csv files')
+    parser.add_argument('--sentiment-csv', type=str, help='CSV of recorded sentiment analyses')
+    parser.add_argument('--history-dir', type=str, default='data/history', help='History store to read sentiment from')
+    parser.add_argument('--frequency', type=str, nargs='+', default=[DEFAULTS.frequency], help='Bar sizes, e.g. 1h 4h 1d')
+    parser.add_argument('--lookback', type=int, nargs='+', default=[DEFAULTS.lookback], help='Bars of sentiment per decision')
+    parser.add_argument('--min-articles', type=int, nargs='+', default=[DEFAULTS.min_articles])
+    parser.add_argument('--min-confidence', type=float, nargs='+', default=[DEFAULTS.min_confidence])
+    parser.add_argument('--buy-threshold', type=float, nargs='+', default=[DEFAULTS.buy_threshold])
+    parser.add_argument('--sell-threshold', type=float, nargs='+', default=[DEFAULTS.sell_threshold])
+    parser.add_argument('--holding-period', type=int, nargs='+', default=[DEFAULTS.holding_period])
+    parser.add_argument('--fee-bps', type=float, nargs='+', default=[DEFAULTS.fee_bps])
+    parser.add_argument('--long-only', action='store_true', help='Stay flat on sell signals instead of shorting')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for large sweeps')
+    parser.add_argument('--top', type=int, default=20, help='Number of best configs to print')
+    parser.add_argument('--output', type=str, help='Write all results to this CSV')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    prices = load_prices(args.prices)
+    if args.sentiment_csv:
+        sentiment = load_sentiment(args.sentiment_csv)
+    else:
+        sentiment = HistoryStore(args.history_dir).load(columns=["asset", "sentiment_score", "confidence"])
+    logger.info("Loaded %s price rows and %s sentiment rows", len(prices), len(sentiment))
+
+    configs = expand_grid({
+        "frequency": args.frequency,
+        "lookback": args.lookback,
+        "min_articles": args.min_articles,
+        "min_confidence": args.min_confidence,
+        "buy_threshold": args.buy_threshold,
+        "sell_threshold": args.sell_threshold,
+        "holding_period": args.holding_period,
+        "fee_bps": args.fee_bps,
+        "allow_short": [not args.long_only],
+    })
+
+    start = time.perf_counter()
+    results = Backtester(sentiment, prices).sweep(configs, workers=args.workers)
+    logger.info("Evaluated %s configs in %.2fs", len(configs), time.perf_counter() - start)
+
+    print(results.head(args.top).to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+        logger.info("Wrote results to %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.model.batch import SentimentBatch
+from agent.model.sentiment import SentimentAnalysis
+
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "XRP", "Cardano", "Dogecoin", "Polkadot", "Chainlink"]
+SOURCES = ["coindesk.com", "cointelegraph.com", "decrypt.co", "theblock.co"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark SentimentAnalysis models against SentimentBatch')
+    parser.add_argument('--count', type=int, default=1_000_000, help='Number of records')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def make_records(count, seed):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [{
+        "headline": f"Headline {i} about {rng.choice(ASSETS)}",
+        "source": rng.choice(SOURCES),
+        "timestamp": start + timedelta(seconds=i),
+        "sentiment_score": rng.uniform(-1, 1),
+        "confidence": rng.random(),
+        "entities": rng.sample(ASSETS, rng.randint(1, 3)),
+        "summary": f"Summary {i}",
+    } for i in range(count)]
+
+
+def measure(label, count, build):
+    """Time build(), then rebuild it under tracemalloc to report the memory it retains"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_million = retained / count * 1_000_000 / 2 ** 20
+    print(f"{label:<34} {elapsed:8.2f}s {elapsed / count * 1e6:8.2f}us/rec {per_million:10.1f} MiB/1M")
+    return result
+
+
+def main():
+    args = parse_args()
+    records = make_records(args.count, args.seed)
+    print(f"{args.count} records")
+    print(f"{'':<34} {'time':>9} {'per record':>13} {'memory':>15}")
+
+    models = measure("SentimentAnalysis(**record)", args.count,
+                     lambda: [SentimentAnalysis(**record) for record in records])
+    del records
+    fields = [dict(model) for model in models]
+    measure("SentimentAnalysis.model_construct", args.count,
+            lambda: [SentimentAnalysis.model_construct(**values) for values in fields])
+    del fields
+    batch = measure("SentimentBatch.from_models", args.count, lambda: SentimentBatch.from_models(models))
+    print(f"{'SentimentBatch.nbytes':<34} {batch.nbytes / len(batch) * 1_000_000 / 2 ** 20:43.1f} MiB/1M")
+    measure("SentimentBatch.to_models", args.count, lambda: batch.to_models())
+    measure("SentimentBatch.to_frame", args.count, lambda: batch.to_frame())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import gc
+import io
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import feedparser
+
+from agent.services.feed_stream import iter_feed_entries
+
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "XRP", "Cardano", "Dogecoin", "Polkadot", "Chainlink"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark feedparser against the streaming feed parser')
+    parser.add_argument('--items', type=int, default=2000, help='Number of items in the feed')
+    parser.add_argument('--new', type=int, default=10, help='Items not seen before, at the top of the feed')
+    parser.add_argument('--summary-bytes', type=int, default=1500, help='Approximate size of each description')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs; the best is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def make_feed(items, summary_bytes, seed):
+    """Build a newest-first RSS 2.0 document with HTML descriptions, like most news feeds"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+             '<title>Benchmark News</title><link>https://example.com</link>']
+    for i in reversed(range(items)):
+        asset = rng.choice(ASSETS)
+        words = " ".join(rng.choice(ASSETS).lower() for _ in range(summary_bytes // 8))
+        parts.append(
+            f"<item><title>{escape(f'{asset} story {i}')}</title>"
+            f"<link>https://example.com/news/{i}</link>"
+            f'<guid isPermaLink="false">story-{i}</guid>'
+            f"<pubDate>{format_datetime(start + timedelta(minutes=i))}</pubDate>"
+            f"<description><![CDATA[<p>{words}</p>]]></description></item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def with_feedparser(content, seen):
+    feed = feedparser.parse(content)
+    return [entry.id for entry in feed.entries if entry.id not in seen]
+
+
+def with_stream(content, seen):
+    new = []
+    for entry in iter_feed_entries(io.BytesIO(content)):
+        if entry['id'] in seen:
+            break
+        new.append(entry['id'])
+    return new
+
+
+def measure(label, repeat, run):
+    """Best wall time of run(), then its peak traced memory in a separate pass"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<34} {best * 1000:9.1f}ms {peak / 2 ** 20:9.1f} MiB {len(result):7d}")
+    return result
+
+
+def main():
+    args = parse_args()
+    content = make_feed(args.items, args.summary_bytes, args.seed)
+    print(f"{args.items} items, {len(content) / 2 ** 20:.1f} MiB document")
+    print(f"{'':<34} {'time':>11} {'peak memory':>13} {'entries':>7}")
+
+    nothing_seen = set()
+    measure("feedparser, first poll", args.repeat, lambda: with_feedparser(content, nothing_seen))
+    first = measure("streaming, first poll", args.repeat, lambda: with_stream(content, nothing_seen))
+
+    # Everything but the newest items was processed by an earlier poll
+    seen = set(first[args.new:])
+    expected = measure("feedparser, later poll", args.repeat, lambda: with_feedparser(content, seen))
+    found = measure("streaming, later poll", args.repeat, lambda: with_stream(content, seen))
+    assert found == expected, "streaming parser disagrees with feedparser"
+
+
+if __name__ == "__main__":
+    main()
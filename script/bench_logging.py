@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import logging
+import random
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.logging_config import TEXT_FORMAT, configure_logging
+
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "XRP", "Cardano", "Dogecoin", "Polkadot", "Chainlink"]
+
+logger = logging.getLogger("vypersense.bench")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark per-cycle logging overhead in the pipeline thread')
+    parser.add_argument('--cycles', type=int, default=200)
+    parser.add_argument('--articles', type=int, default=50, help='Articles per cycle')
+    parser.add_argument('--signals', type=int, default=10, help='Signals per cycle')
+    parser.add_argument('--disk-latency', type=float, default=0.0,
+                        help='Milliseconds added to every log file flush, to model a slow or busy disk')
+    parser.add_argument('--json', action='store_true', help='Use the JSON formatter for the queued setup')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per setup; the best is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def make_cycles(args):
+    rng = random.Random(args.seed)
+    return [{
+        "articles": [{"id": f"story-{c}-{i}", "title": f"{rng.choice(ASSETS)} story {c}-{i}",
+                      "entities": rng.sample(ASSETS, rng.randint(0, 2))} for i in range(args.articles)],
+        "signals": [{"cryptocurrency": rng.choice(ASSETS), "signal_type": rng.choice(["buy", "sell", "hold"]),
+                     "confidence": rng.random()} for _ in range(args.signals)],
+    } for c in range(args.cycles)]
+
+
+def cycle_eager(cycle):
+    """The log calls of one pipeline cycle, written as f-strings"""
+    logger.info("Starting new cycle")
+    for article in cycle["articles"]:
+        logger.debug(f"Checking article {article['id']}: {article}")
+        if not article["entities"]:
+            logger.debug(f"Skipping article without tracked assets: {article['title']}")
+            continue
+        logger.info(f"New article: {article['title']}")
+    logger.info(f"Fetched {len(cycle['articles'])} new articles")
+    for signal in cycle["signals"]:
+        logger.info(f"Processing signal for {signal['cryptocurrency']}: {signal['signal_type'].upper()}")
+        logger.debug(f"Signal details: {signal}")
+        logger.info(f"Recorded sentiment for {signal['cryptocurrency']} on blockchain")
+
+
+def cycle_lazy(cycle):
+    """The same log calls with %-style arguments"""
+    logger.info("Starting new cycle")
+    for article in cycle["articles"]:
+        logger.debug("Checking article %s: %s", article['id'], article)
+        if not article["entities"]:
+            logger.debug("Skipping article without tracked assets: %s", article['title'])
+            continue
+        logger.info("New article: %s", article['title'])
+    logger.info("Fetched %s new articles", len(cycle['articles']))
+    for signal in cycle["signals"]:
+        logger.info("Processing signal for %s: %s", signal['cryptocurrency'], signal['signal_type'].upper())
+        logger.debug("Signal details: %s", signal)
+        logger.info("Recorded sentiment for %s on blockchain", signal['cryptocurrency'])
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def slow_down(handler, latency):
+    """Make every flush of a file handler take `latency` seconds longer"""
+    if latency and isinstance(handler, logging.FileHandler):
+        flush = handler.flush
+        handler.flush = lambda: (time.sleep(latency), flush())
+
+
+def synchronous(log_file, devnull, latency):
+    reset_root()
+    logging.basicConfig(level=logging.INFO, format=TEXT_FORMAT,
+                        handlers=[logging.StreamHandler(devnull), logging.FileHandler(log_file)])
+    for handler in logging.getLogger().handlers:
+        slow_down(handler, latency)
+    return None
+
+
+def queued(log_file, devnull, latency, json_format):
+    listener = configure_logging(log_file, json_format=json_format, stream=devnull)
+    for handler in listener.handlers:
+        slow_down(handler, latency)
+    return listener
+
+
+def run(label, args, cycles, setup, body):
+    """Best time spent in the calling thread per cycle, plus the time to drain any queue afterwards"""
+    best = drain = float('inf')
+    for _ in range(args.repeat):
+        listener = setup()
+        start = time.perf_counter()
+        for cycle in cycles:
+            body(cycle)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        if listener:
+            listener.stop()
+        if elapsed < best:
+            best, drain = elapsed, time.perf_counter() - start
+        reset_root()
+
+    per_cycle = best / len(cycles) * 1e6
+    drain_note = f"{drain * 1e3:8.1f}ms drain" if drain > 1e-3 else ""
+    print(f"{label:<40} {per_cycle:10.1f}us/cycle {drain_note}")
+
+
+def disabled_call_cost(count=200_000):
+    """Cost of a debug call below the logger level, eager versus lazy formatting"""
+    reset_root()
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    article = {"id": "story-1", "title": "Bitcoin story", "entities": ["Bitcoin"], "summary": "x" * 200}
+
+    start = time.perf_counter()
+    for _ in range(count):
+        logger.debug(f"Checking article {article['id']}: {article}")
+    eager = (time.perf_counter() - start) / count * 1e9
+
+    start = time.perf_counter()
+    for _ in range(count):
+        logger.debug("Checking article %s: %s", article['id'], article)
+    lazy = (time.perf_counter() - start) / count * 1e9
+    reset_root()
+
+    print(f"{'disabled debug call, f-string':<40} {eager:10.0f}ns/call")
+    print(f"{'disabled debug call, %-style':<40} {lazy:10.0f}ns/call")
+
+
+def main():
+    args = parse_args()
+    cycles = make_cycles(args)
+    latency = args.disk_latency / 1000
+    devnull = open(os.devnull, "w")
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = os.path.join(directory, "vypersense.log")
+        print(f"{args.cycles} cycles of {args.articles} articles and {args.signals} signals, level INFO, "
+              f"{args.disk_latency}ms per flush")
+
+        def sync_setup():
+            return synchronous(log_file, devnull, latency)
+
+        def queued_setup():
+            return queued(log_file, devnull, latency, args.json)
+
+        run("before: synchronous handlers, f-strings", args, cycles, sync_setup, cycle_eager)
+        run("synchronous handlers, %-style", args, cycles, sync_setup, cycle_lazy)
+        run("queued handlers, f-strings", args, cycles, queued_setup, cycle_eager)
+        run("after: queued handlers, %-style", args, cycles, queued_setup, cycle_lazy)
+
+    disabled_call_cost()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -40,7 +40,7 @@ def deploy(network: Network, constructor_args: list) -> Dict[str, Any]:
         Dictionary with contract deployment information
     """
     name = constructor_args[0] if constructor_args else "CryptoSentimentTracker"
-    logger.info(f"Deploying SentimentTracker contract with name '{name}'...")
+    logger.info("Deploying SentimentTracker contract with name '%s'...", name)
     
     # Deploy the contract
     contract = network.deploy_contract(
@@ -48,8 +48,8 @@ def deploy(network: Network, constructor_args: list) -> Dict[str, Any]:
         constructor_args=constructor_args
     )
     
-    logger.info(f"SentimentTracker contract deployed at: {contract.address}")
-    logger.info(f"Transaction hash: {contract.tx_hash}")
+    logger.info("SentimentTracker contract deployed at: %s", contract.address)
+    logger.info("Transaction hash: %s", contract.tx_hash)
     
     return {
         "address": contract.address,
@@ -59,7 +59,7 @@ def deploy(network: Network, constructor_args: list) -> Dict[str, Any]:
 def main():
     args = parse_args()
     
-    logger.info(f"Deploying SentimentTracker contract to {args.network} network...")
+    logger.info("Deploying SentimentTracker contract to %s network...", args.network)
     
     # Get the network configuration
     config = get_config()
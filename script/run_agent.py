@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import logging
-import time
+import signal
 from datetime import datetime
 import argparse
 import sys
@@ -12,22 +12,29 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from agent.config import (
     FEED_URL, OPENAI_API_KEY, TWITTER_API_KEY, TWITTER_API_SECRET,
     TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET, TOP_CRYPTOCURRENCIES,
-    POLLING_INTERVAL
+    FEED_URLS, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL, POLL_BUDGET_PER_HOUR, POLL_BURST_HOURS, POLL_JITTER,
+    MIN_BATCH_SIZE, MAX_BATCH_LATENCY, MAX_BATCHES_PER_HOUR, API_HOST, API_PORT, API_CACHE_MAX_AGE,
+    HISTORY_DIR, COORDINATION_DB, ASSET_ALIASES, FILTER_UNTRACKED_ARTICLES, JOURNAL_PATH,
+    OPENAI_BASE_URL, OPENAI_MODEL, OPENAI_FAST_MODEL, OPENAI_BULK_BATCH_SIZE, OPENAI_HEDGE_AFTER, OPENAI_TIMEOUT,
+    LOG_FILE, LOG_LEVEL, LOG_JSON, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_WHEN, CHAIN_NETWORKS
 )
+from agent.logging_config import configure_logging
 from agent.services.news import NewsService
+from agent.services.entities import EntityRouter, group_by_asset
+from agent.services.scheduler import PollScheduler
+from agent.services.store import ResultStore
+from agent.services.http_api import ApiServer
+from agent.services.history import HistoryStore
+from agent.services.journal import CycleJournal, Cycle, STARTED, DONE
+from agent.services.coordination import (
+    Coordinator, ChainWriter, QueuedChainRecorder, ClaimedTwitterService, default_worker_id
+)
 from agent.services.ai_service import AIService
+from agent.services.model_router import ModelRouter
+from openai import AsyncOpenAI
 from agent.services.twitter import TwitterService
 from agent.services.blockchain import BlockchainService
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('vypersense.log')
-    ]
-)
+from agent.services.multichain import MultiChainRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -35,22 +42,65 @@ logger = logging.getLogger(__name__)
 def parse_args():
     parser = argparse.ArgumentParser(description='VyperSense - AI-powered cryptocurrency sentiment analysis')
     parser.add_argument('--network', type=str, default='polygon-amoy', help='Blockchain network to use')
+    parser.add_argument('--networks', type=str, default=','.join(CHAIN_NETWORKS),
+                        help='Comma-separated networks (NAME or NAME=ADDRESS) to record to in parallel, primary first')
     parser.add_argument('--deploy-contract', action='store_true', help='Deploy a new sentiment tracker contract')
     parser.add_argument('--contract-address', type=str, help='Address of an existing sentiment tracker contract')
     parser.add_argument('--no-twitter', action='store_true', help='Disable Twitter posting')
     parser.add_argument('--no-blockchain', action='store_true', help='Disable blockchain integration')
     parser.add_argument('--run-once', action='store_true', help='Run once and exit')
+    parser.add_argument('--no-history', action='store_true', help='Disable the local sentiment/signal history store')
+    parser.add_argument('--no-journal', action='store_true', help='Disable the crash-recovery journal')
+    parser.add_argument('--num-workers', type=int, default=1, help='Total number of cooperating worker processes')
+    parser.add_argument('--worker-index', type=int, default=0, help='Index of this worker (0 to num-workers - 1)')
+    parser.add_argument('--coordination-db', type=str, default=COORDINATION_DB, help='SQLite database shared by workers')
+    parser.add_argument('--serve', action='store_true', help='Serve the latest results over an HTTP API')
+    parser.add_argument('--host', type=str, default=API_HOST, help='Interface for the HTTP API')
+    parser.add_argument('--port', type=int, default=API_PORT, help='Port for the HTTP API')
+    parser.add_argument('--log-json', action='store_true', default=LOG_JSON, help='Write logs as JSON lines')
     return parser.parse_args()
 
 
+def setup_logging(args):
+    """Start the background logging thread; each worker rotates its own file"""
+    log_file = LOG_FILE
+    if log_file and args.num_workers > 1:
+        root, extension = os.path.splitext(LOG_FILE)
+        log_file = f"{root}-{args.worker_index}{extension}"
+    return configure_logging(log_file, level=LOG_LEVEL, json_format=args.log_json, max_bytes=LOG_MAX_BYTES,
+                             backup_count=LOG_BACKUP_COUNT, rotate_when=LOG_ROTATE_WHEN)
+
+
 def main():
     args = parse_args()
+    log_listener = setup_logging(args)
     
     # Initialize services
     logger.info("Initializing VyperSense...")
     
-    news_service = NewsService(FEED_URL)
-    ai_service = AIService(OPENAI_API_KEY)
+    feed_urls = FEED_URLS or [FEED_URL]
+
+    # In worker mode, split the feeds between workers when there are enough of them;
+    # otherwise every worker polls every feed and article claims prevent double-processing
+    coordinator = None
+    if args.num_workers > 1:
+        coordinator = Coordinator(args.coordination_db, default_worker_id(args.worker_index))
+        if len(feed_urls) >= args.num_workers:
+            feed_urls = feed_urls[args.worker_index::args.num_workers]
+        logger.info("Worker %s/%s polling %s feeds", args.worker_index + 1, args.num_workers, len(feed_urls))
+
+    # One matcher shared by all feeds; compiled once
+    entity_router = EntityRouter(ASSET_ALIASES) if FILTER_UNTRACKED_ARTICLES else None
+    news_services = [NewsService(feed_url, entity_router) for feed_url in feed_urls]
+    router = ModelRouter(
+        AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, timeout=OPENAI_TIMEOUT),
+        model=OPENAI_MODEL,
+        fast_model=OPENAI_FAST_MODEL,
+        bulk_batch_size=OPENAI_BULK_BATCH_SIZE,
+        hedge_after=OPENAI_HEDGE_AFTER,
+        timeout=OPENAI_TIMEOUT
+    )
+    ai_service = AIService(OPENAI_API_KEY, base_url=OPENAI_BASE_URL, router=router)
     
     # Initialize Twitter service if enabled
     twitter_service = None
@@ -72,93 +122,307 @@ def main():
     # Set the contract address for polygon-amoy network
     if args.network == 'polygon-amoy' and not contract_address:
         contract_address = "0x22633574A82ffC4d5d88ccAb7887799c188544e3"
-        logger.info(f"Using polygon-amoy network with contract address: {contract_address}")
+        logger.info("Using polygon-amoy network with contract address: %s", contract_address)
     
-    if not args.no_blockchain:
+    multichain = None
+    networks = [spec.strip() for spec in args.networks.split(',') if spec.strip()]
+    if not args.no_blockchain and networks:
+        # Every record goes to each network from its own thread, with its own account and nonces
+        specs = [tuple(spec.split('=', 1)) if '=' in spec else (spec, None) for spec in networks]
+        if args.deploy_contract:
+            logger.warning("--deploy-contract is ignored with --networks; configure each network's contract")
+        try:
+            multichain = MultiChainRecorder.from_networks(specs, default_contract_address=args.contract_address)
+            blockchain_service = multichain
+            contract_address = str(multichain.primary.contract.address)
+            logger.info("Recording to %s networks, primary %s", len(multichain.recorders), multichain.primary.name)
+        except Exception as e:
+            logger.error("Failed to set up multi-network recording: %s", e)
+    elif not args.no_blockchain:
         blockchain_service = BlockchainService()
         
         # Set the active network
         if blockchain_service.set_network(args.network):
-            logger.info(f"Using blockchain network: {args.network}")
+            logger.info("Using blockchain network: %s", args.network)
         else:
-            logger.error(f"Failed to set blockchain network: {args.network}")
+            logger.error("Failed to set blockchain network: %s", args.network)
         
         # Deploy a new contract if requested
         if args.deploy_contract and not contract_address:
             contract_address = blockchain_service.deploy_sentiment_tracker("VyperSenseTracker")
             if contract_address:
-                logger.info(f"Deployed new sentiment tracker contract at {contract_address}")
+                logger.info("Deployed new sentiment tracker contract at %s", contract_address)
             else:
                 logger.error("Failed to deploy sentiment tracker contract")
         
         if contract_address:
-            logger.info(f"Using sentiment tracker contract at {contract_address}")
+            logger.info("Using sentiment tracker contract at %s", contract_address)
         else:
             logger.warning("No contract address provided, blockchain recording disabled")
+
+    # Workers queue chain records for a single elected writer so nonces never collide,
+    # and claim tweets so each one is posted once
+    chain_writer = None
+    if coordinator:
+        if twitter_service:
+            twitter_service = ClaimedTwitterService(twitter_service, coordinator)
+        if blockchain_service and contract_address:
+            chain_writer = ChainWriter(coordinator, blockchain_service)
+            chain_writer.start()
+            blockchain_service = QueuedChainRecorder(coordinator)
+
+    history_store = None
+    if not args.no_history:
+        history_store = HistoryStore(HISTORY_DIR, entity_router or EntityRouter(ASSET_ALIASES))
+        logger.info("Recording history to %s", HISTORY_DIR)
+
+    # Replay the journal: articles already handled are not fetched again,
+    # and interrupted cycles are resumed below
+    journal = None
+    if not args.no_journal:
+        journal_path = JOURNAL_PATH
+        if coordinator:
+            root, extension = os.path.splitext(JOURNAL_PATH)
+            journal_path = f"{root}-{args.worker_index}{extension}"
+        journal = CycleJournal(journal_path)
+        seen_ids = journal.seen_ids()
+        for news_service in news_services:
+            news_service.processed_ids.update(seen_ids)
+        logger.info("Journaling cycles to %s (%s articles already handled)", journal_path, len(seen_ids))
+
+    # Start the HTTP API if serve mode is enabled
+    result_store = None
+    api_server = None
+    if args.serve:
+        result_store = ResultStore()
+        api_server = ApiServer(result_store, args.host, args.port, max_age=API_CACHE_MAX_AGE)
+        api_server.start()
     
     # Main loop
     logger.info("Starting main loop...")
     
     try:
-        while True:
+        if journal:
+            resume_cycles(
+                journal,
+                ai_service,
+                twitter_service,
+                blockchain_service,
+                contract_address,
+                result_store,
+                history_store,
+                coordinator
+            )
+
+        if args.run_once:
             run_cycle(
-                news_service, 
+                news_services, 
                 ai_service, 
                 twitter_service, 
                 blockchain_service, 
-                contract_address
+                contract_address,
+                result_store,
+                history_store,
+                coordinator,
+                journal
             )
-            
-            if args.run_once:
-                logger.info("Run once mode enabled, exiting")
-                break
-                
-            logger.info(f"Sleeping for {POLLING_INTERVAL} seconds...")
-            time.sleep(POLLING_INTERVAL)
+            if chain_writer:
+                chain_writer.flush()
+            logger.info("Run once mode enabled, exiting")
+            return
+
+        scheduler = PollScheduler(
+            news_services,
+            lambda articles: process_articles(
+                articles,
+                ai_service,
+                twitter_service,
+                blockchain_service,
+                contract_address,
+                result_store,
+                history_store,
+                coordinator,
+                journal
+            ),
+            min_interval=MIN_POLL_INTERVAL,
+            max_interval=MAX_POLL_INTERVAL,
+            budget_per_hour=POLL_BUDGET_PER_HOUR,
+            jitter=POLL_JITTER,
+            min_batch_size=MIN_BATCH_SIZE,
+            max_batch_latency=MAX_BATCH_LATENCY,
+            burst_hours=POLL_BURST_HOURS,
+            max_batches_per_hour=MAX_BATCHES_PER_HOUR,
+            # Journal articles still queued at shutdown so the next start resumes them;
+            # without a journal the scheduler processes them before returning
+            on_stop=(lambda articles: defer_articles(articles, journal, coordinator)) if journal else None
+        )
+        # Stop cleanly on SIGTERM; the scheduler's sleeps wake up immediately
+        signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+        scheduler.run()
             
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down")
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         raise
+    finally:
+        if chain_writer:
+            chain_writer.stop()
+        if journal:
+            journal.close()
+        if api_server:
+            api_server.stop()
+        if multichain:
+            multichain.close()
+        log_listener.stop()
 
 
-def run_cycle(news_service, ai_service, twitter_service, blockchain_service, contract_address):
+def run_cycle(news_services, ai_service, twitter_service, blockchain_service, contract_address,
+              result_store=None, history_store=None, coordinator=None, journal=None):
     """Run a single cycle of the agent"""
     logger.info("Starting new cycle")
     
     # Step 1: Fetch news articles
     logger.info("Fetching news articles...")
-    articles = news_service.poll_feed()
-    logger.info(f"Fetched {len(articles)} new articles")
+    articles = []
+    for news_service in news_services:
+        articles.extend(news_service.poll_feed())
+    logger.info("Fetched %s new articles", len(articles))
     
     if not articles:
         logger.info("No new articles to process")
         return
-    
-    # Step 2: Analyze sentiment
-    logger.info("Analyzing sentiment...")
-    sentiment_analyses = ai_service.analyze_sentiment(articles)
-    logger.info(f"Generated {len(sentiment_analyses)} sentiment analyses")
-    
-    if not sentiment_analyses:
+
+    process_articles(articles, ai_service, twitter_service, blockchain_service, contract_address,
+                     result_store, history_store, coordinator, journal)
+
+
+def process_articles(articles, ai_service, twitter_service, blockchain_service, contract_address,
+                     result_store=None, history_store=None, coordinator=None, journal=None):
+    """Analyze a batch of articles and publish the resulting signals"""
+    # Skip articles another worker has already taken
+    if coordinator:
+        articles = [article for article in articles if coordinator.claim(f"article:{article['id']}")]
+        if not articles:
+            logger.info("All articles already claimed by other workers")
+            return
+
+    # Journal the batch before any paid work so a crash can resume it
+    cycle = journal.start_cycle(articles) if journal else Cycle(None, None, articles)
+    run_pipeline(cycle, ai_service, twitter_service, blockchain_service, contract_address,
+                 result_store, history_store, coordinator)
+
+
+def defer_articles(articles, journal, coordinator=None):
+    """Journal a batch without processing it, so the next start resumes it"""
+    if coordinator:
+        articles = [article for article in articles if coordinator.claim(f"article:{article['id']}")]
+    if articles:
+        cycle = journal.start_cycle(articles)
+        logger.info("Journaled %s unprocessed articles as cycle %s", len(articles), cycle.cycle_id)
+
+
+def resume_cycles(journal, ai_service, twitter_service, blockchain_service, contract_address,
+                  result_store=None, history_store=None, coordinator=None):
+    """Finish the cycles an earlier run was interrupted in, repeating only the steps that never completed"""
+    for cycle in journal.pending_cycles():
+        logger.info("Resuming interrupted cycle %s: %s articles, %s analyses, %s signals already done",
+                    cycle.cycle_id, len(cycle.articles), len(cycle.analyses), len(cycle.signals))
+        run_pipeline(cycle, ai_service, twitter_service, blockchain_service, contract_address,
+                     result_store, history_store, coordinator)
+
+
+def run_pipeline(cycle, ai_service, twitter_service, blockchain_service, contract_address,
+                 result_store=None, history_store=None, coordinator=None):
+    """Run the remaining stages of a cycle"""
+    articles = cycle.articles
+    if result_store:
+        result_store.update(articles=articles, analyses=cycle.analyses)
+
+    # Step 2: Analyze sentiment, publishing each analysis as soon as it is complete
+    if not cycle.analyses_done:
+        # Articles analyzed before an interruption are not sent again; analyses
+        # journaled before they carried an article ID fall back to the title
+        analyzed_ids = {analysis.article_id for analysis in cycle.analyses if analysis.article_id}
+        analyzed_titles = {analysis.headline for analysis in cycle.analyses if not analysis.article_id}
+        remaining = [article for article in articles
+                     if article['id'] not in analyzed_ids and article['title'] not in analyzed_titles]
+
+        logger.info("Analyzing sentiment...")
+        for analysis in ai_service.stream_sentiment(remaining):
+            cycle.record_analysis(analysis)
+            if result_store:
+                result_store.update(analyses=[analysis])
+
+        if history_store:
+            history_store.append(analyses=cycle.analyses)
+        cycle.finish_analyses()
+    logger.info("Generated %s sentiment analyses", len(cycle.analyses))
+
+    # The paid analysis is done; never hand these articles to another worker
+    if coordinator:
+        for article in articles:
+            coordinator.complete(f"article:{article['id']}")
+
+    if not cycle.analyses:
         logger.info("No sentiment analyses generated")
+        cycle.finish()
         return
     
-    # Step 3: Generate trading signals
-    logger.info("Generating trading signals...")
-    trading_signals = ai_service.generate_trading_signals(sentiment_analyses, TOP_CRYPTOCURRENCIES)
-    logger.info(f"Generated {len(trading_signals)} trading signals")
+    # Step 3: Generate trading signals, handling each one while the rest are still generated
+    if not cycle.signals_done:
+        # Only ask about the assets this batch mentions when articles were tagged,
+        # and not about assets that already got a signal before an interruption
+        groups = group_by_asset(articles, TOP_CRYPTOCURRENCIES)
+        if groups and logger.isEnabledFor(logging.INFO):
+            logger.info("Articles per asset: %s",
+                        ", ".join(f"{asset}={len(grouped)}" for asset, grouped in groups.items()))
+        covered = {signal.cryptocurrency for signal in cycle.signals}
+        focus = [asset for asset in (list(groups) or TOP_CRYPTOCURRENCIES) if asset not in covered]
+
+        logger.info("Generating trading signals...")
+        if focus:
+            for signal in ai_service.stream_trading_signals(cycle.analyses, focus):
+                index = cycle.record_signal(signal)
+                if result_store:
+                    result_store.update(signals=[signal])
+                publish_signal(cycle, index, ai_service, twitter_service, blockchain_service, contract_address,
+                               result_store)
+        cycle.finish_signals()
+    logger.info("Generated %s trading signals", len(cycle.signals))
+
+    # Finish signals whose publishing was interrupted
+    for index, signal in enumerate(cycle.signals):
+        if not cycle.is_published(index):
+            if result_store:
+                result_store.update(signals=[signal])
+            publish_signal(cycle, index, ai_service, twitter_service, blockchain_service, contract_address,
+                           result_store)
     
-    if not trading_signals:
+    if not cycle.signals:
         logger.info("No trading signals generated")
+        cycle.finish()
         return
+
+    # Step 7: Keep the cycle's signals in the local history
+    if history_store:
+        history_store.append(signals=cycle.signals)
+    cycle.finish()
+
+    if history_store:
+        # Only one worker compacts at a time
+        if not coordinator or coordinator.acquire_lease("history-compaction"):
+            history_store.compact_closed_partitions()
+
+
+def publish_signal(cycle, index, ai_service, twitter_service, blockchain_service, contract_address,
+                   result_store=None):
+    """Visualize, tweet and record a single trading signal, skipping steps the journal shows as done"""
+    signal = cycle.signals[index]
+    logger.info("Processing signal for %s: %s", signal.cryptocurrency, signal.signal_type.upper())
     
-    # Process each trading signal
-    for signal in trading_signals:
-        logger.info(f"Processing signal for {signal.cryptocurrency}: {signal.signal_type.upper()}")
-        
-        # Step 4: Generate visualization
+    # Step 4: Generate visualization
+    if cycle.step_state(index, "image") != DONE:
         image_url = None
         if signal.confidence > 0.6:  # Only generate images for high-confidence signals
             logger.info("Generating visualization...")
@@ -166,10 +430,19 @@ def run_cycle(news_service, ai_service, twitter_service, blockchain_service, con
             if image_url:
                 logger.info("Visualization generated successfully")
                 signal.image_url = image_url
+                if result_store:
+                    result_store.update(signals=[signal])
             else:
                 logger.warning("Failed to generate visualization")
-        
-        # Step 5: Post to Twitter
+        cycle.finish_step(index, "image", image_url=image_url)
+    
+    # Step 5: Post to Twitter
+    tweet_state = cycle.step_state(index, "tweet")
+    if tweet_state == STARTED:
+        # The tweet may have gone out before the interruption; never risk posting it twice
+        logger.warning("Tweet for %s was interrupted before it was confirmed, not retrying", signal.cryptocurrency)
+        cycle.finish_step(index, "tweet")
+    elif tweet_state is None:
         if twitter_service:
             # Prepare tweet text
             emoji = "🟢" if signal.signal_type == "buy" else "🔴" if signal.signal_type == "sell" else "🟡"
@@ -182,26 +455,44 @@ def run_cycle(news_service, ai_service, twitter_service, blockchain_service, con
             )
             
             logger.info("Posting to Twitter...")
-            success = twitter_service.post_tweet(tweet_text, image_url)
+            cycle.start_step(index, "tweet")
+            success = twitter_service.post_tweet(tweet_text, signal.image_url)
             if success:
                 logger.info("Posted to Twitter successfully")
             else:
                 logger.warning("Failed to post to Twitter")
-        
-        # Step 6: Record on blockchain
+        cycle.finish_step(index, "tweet")
+    
+    # Step 6: Record on blockchain
+    chain_state = cycle.step_state(index, "chain")
+    if chain_state != DONE:
         if blockchain_service and contract_address:
-            logger.info("Recording sentiment on blockchain...")
             timestamp = int(signal.timestamp.timestamp())
-            success = blockchain_service.record_sentiment(
-                contract_address,
-                signal.cryptocurrency,
-                signal.sentiment_score,
-                timestamp
-            )
-            if success:
-                logger.info("Recorded sentiment on blockchain successfully")
+            if chain_state == STARTED and is_recorded(blockchain_service, contract_address,
+                                                      signal.cryptocurrency, timestamp):
+                logger.info("Sentiment for %s was recorded before the interruption", signal.cryptocurrency)
             else:
-                logger.warning("Failed to record sentiment on blockchain")
+                logger.info("Recording sentiment on blockchain...")
+                cycle.start_step(index, "chain")
+                success = blockchain_service.record_sentiment(
+                    contract_address,
+                    signal.cryptocurrency,
+                    signal.sentiment_score,
+                    timestamp
+                )
+                if success:
+                    logger.info("Recorded sentiment on blockchain successfully")
+                else:
+                    logger.warning("Failed to record sentiment on blockchain")
+        cycle.finish_step(index, "chain")
+
+
+def is_recorded(blockchain_service, contract_address, cryptocurrency, timestamp):
+    """Check the contract for a record submitted before a crash (queued records are deduplicated instead)"""
+    get_history = getattr(blockchain_service, "get_sentiment_history", None)
+    if get_history is None:
+        return False
+    return any(record['timestamp'] == timestamp for record in get_history(contract_address, cryptocurrency))
 
 
 if __name__ == "__main__":
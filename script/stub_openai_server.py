@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+# Characters of function-call arguments per streamed chunk
+CHUNK_SIZE = 24
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the OpenAI chat completions API with injectable latency')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency', type=str, action='append', default=[],
+                        help='Per-model latency as MODEL=SECONDS[:JITTER], repeatable, e.g. gpt-4-turbo-preview=3:1')
+    parser.add_argument('--default-latency', type=float, default=0.5, help='Latency of models not listed')
+    parser.add_argument('--tail-rate', type=float, default=0.0, help='Fraction of requests that hit a latency spike')
+    parser.add_argument('--tail-latency', type=float, default=30.0, help='Extra seconds added to spiking requests')
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help='Seconds between streamed chunks')
+    return parser.parse_args()
+
+
+def parse_latencies(values):
+    latencies = {}
+    for value in values:
+        model, _, spec = value.partition('=')
+        mean, _, jitter = spec.partition(':')
+        latencies[model] = (float(mean), float(jitter or 0))
+    return latencies
+
+
+def payload_after(text, opener):
+    """Decode the JSON list embedded at the end of a prompt"""
+    start = text.find(opener)
+    return json.loads(text[start:]) if start >= 0 else []
+
+
+def fake_arguments(request):
+    """Build plausible function-call arguments for the agent's two functions"""
+    function = request.get('function_call', {}).get('name') or request['functions'][0]['name']
+    messages = request.get('messages', [])
+    system = next((m['content'] for m in messages if m['role'] == 'system'), '')
+    user = next((m['content'] for m in messages if m['role'] == 'user'), '')
+    rng = random.Random(user)
+
+    if function == 'analyze_crypto_sentiment':
+        analyses = []
+        for article in payload_after(user, '['):
+            analyses.append({
+                'article_id': article.get('id', ''),
+                'headline': article.get('title', ''),
+                'source': article.get('source', ''),
+                'sentiment_score': round(rng.uniform(-1, 1), 2),
+                'confidence': round(rng.uniform(0.3, 1), 2),
+                'entities': article.get('mentioned_assets') or ['Bitcoin'],
+                'summary': 'Stub sentiment analysis',
+            })
+        return function, {'analyses': analyses}
+
+    match = re.search(r'Focus on these top cryptocurrencies: (.*?)\.\n', system)
+    assets = [asset.strip() for asset in match.group(1).split(',')] if match else ['Bitcoin']
+    signals = [{
+        'cryptocurrency': asset,
+        'signal_type': rng.choice(['buy', 'sell', 'hold']),
+        'confidence': round(rng.uniform(0.3, 1), 2),
+        'sentiment_score': round(rng.uniform(-1, 1), 2),
+        'reasoning': 'Stub trading signal',
+        'sources': ['stub'],
+    } for asset in assets]
+    return function, {'signals': signals}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latencies = {}
+    default_latency = 0.5
+    tail_rate = 0.0
+    tail_latency = 30.0
+    chunk_delay = 0.02
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_POST(self):
+        if not self.path.endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        model = request.get('model', '')
+        mean, jitter = self.latencies.get(model, (self.default_latency, 0))
+        delay = max(0.0, random.uniform(mean - jitter, mean + jitter))
+        if random.random() < self.tail_rate:
+            delay += self.tail_latency
+
+        logger.info("%s: responding in %.2fs (stream=%s)", model, delay, bool(request.get('stream')))
+        time.sleep(delay)
+
+        function, arguments = fake_arguments(request)
+        try:
+            if request.get('stream'):
+                self.stream(model, function, json.dumps(arguments))
+            else:
+                self.complete(model, function, json.dumps(arguments))
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("%s: client cancelled the request", model)
+
+    def complete(self, model, function, arguments):
+        body = json.dumps({
+            'id': f'chatcmpl-{uuid.uuid4().hex}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': None,
+                            'function_call': {'name': function, 'arguments': arguments}},
+                'finish_reason': 'function_call',
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, model, function, arguments):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f'chatcmpl-{uuid.uuid4().hex}'
+        created = int(time.time())
+
+        def send(delta, finish_reason=None):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        send({'role': 'assistant', 'function_call': {'name': function, 'arguments': ''}})
+        for start in range(0, len(arguments), CHUNK_SIZE):
+            time.sleep(self.chunk_delay)
+            send({'function_call': {'arguments': arguments[start:start + CHUNK_SIZE]}})
+        send({}, 'function_call')
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main():
+    args = parse_args()
+    StubHandler.latencies = parse_latencies(args.latency)
+    StubHandler.default_latency = args.default_latency
+    StubHandler.tail_rate = args.tail_rate
+    StubHandler.tail_latency = args.tail_latency
+    StubHandler.chunk_delay = args.chunk_delay
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    logger.info("Stub OpenAI API on http://%s:%s/v1 (set OPENAI_BASE_URL to this)", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -137,7 +137,6 @@ const RssFeedManager = ({ onRefresh }) => {
       
       // Clear cache to refresh feed data
       clearCacheItem(`rss_feed_${feedObj.id}`);
-      clearCacheItem('rss_all_feeds');
       
       // Refresh parent component if needed
       if (onRefresh) onRefresh();
@@ -158,7 +157,6 @@ const RssFeedManager = ({ onRefresh }) => {
       
       // Clear cache to refresh feed data
       clearCacheItem(`rss_feed_${id}`);
-      clearCacheItem('rss_all_feeds');
       
       // Refresh parent component if needed
       if (onRefresh) onRefresh();
@@ -174,7 +172,6 @@ const RssFeedManager = ({ onRefresh }) => {
     feeds.forEach(feed => {
       clearCacheItem(`rss_feed_${feed.id}`);
     });
-    clearCacheItem('rss_all_feeds');
     
     // Refresh parent component if needed
     if (onRefresh) onRefresh();
@@ -39,6 +39,7 @@ import CryptoMarketData from '../components/CryptoMarketData';
 import RssFeedManager from '../components/RssFeedManager';
 import { getCryptoIconPath } from '../utils/cryptoIcons';
 import { clearCache } from '../utils/cacheService';
+import { subscribeToAgentEvents, mergeArticles, mergeAnalyses, mergeSignals } from '../utils/agentEvents';
 
 const Dashboard = () => {
   const theme = useTheme();
@@ -60,6 +61,28 @@ const Dashboard = () => {
     fetchData();
   }, []);
 
+  // Apply results pushed by the agent instead of re-fetching everything
+  useEffect(() => {
+    return subscribeToAgentEvents((type, items) => {
+      switch (type) {
+        case 'articles':
+          setNewsArticles(current => mergeArticles(current, items).slice(0, 8));
+          break;
+        case 'sentiment':
+          setSentimentData(current => mergeAnalyses(current, items));
+          break;
+        case 'signals':
+          setTradingSignals(current => mergeSignals(current, items));
+          break;
+        case 'resync':
+          fetchData();
+          break;
+        default:
+          break;
+      }
+    });
+  }, []);
+
   const fetchData = async () => {
     setLoading(true);
     setError(null);
@@ -40,6 +40,7 @@ import {
 } from '@mui/icons-material';
 import { Web3Context } from '../utils/Web3Context';
 import api from '../utils/api';
+import { subscribeToAgentEvents, mergeAnalyses } from '../utils/agentEvents';
 
 const SentimentAnalysis = () => {
   const theme = useTheme();
@@ -60,6 +61,17 @@ const SentimentAnalysis = () => {
     fetchData();
   }, []);
 
+  // Apply analyses pushed by the agent; the filter effect below refreshes the visible list
+  useEffect(() => {
+    return subscribeToAgentEvents((type, items) => {
+      if (type === 'sentiment') {
+        setSentimentData(current => mergeAnalyses(current, items));
+      } else if (type === 'resync') {
+        fetchData();
+      }
+    });
+  }, []);
+
   const fetchData = async () => {
     setRefreshing(true);
     setError(null);
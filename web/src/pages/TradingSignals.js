@@ -44,6 +44,7 @@ import {
 } from '@mui/icons-material';
 import { Web3Context } from '../utils/Web3Context';
 import api from '../utils/api';
+import { subscribeToAgentEvents, mergeSignals } from '../utils/agentEvents';
 
 const TradingSignals = () => {
   const theme = useTheme();
@@ -73,6 +74,17 @@ const TradingSignals = () => {
     fetchData();
   }, []);
 
+  // Apply signals pushed by the agent; the filter effect below refreshes the visible list
+  useEffect(() => {
+    return subscribeToAgentEvents((type, items) => {
+      if (type === 'signals') {
+        setSignals(current => mergeSignals(current, items));
+      } else if (type === 'resync') {
+        fetchData();
+      }
+    });
+  }, []);
+
   const fetchData = async () => {
     setLoading(true);
     setError(null);
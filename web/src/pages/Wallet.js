@@ -586,7 +586,7 @@ const Wallet = () => {
                               Confidence
                             </Typography>
                             <Typography variant="h4" sx={{ fontWeight: 'bold' }}>
-                              {(sentimentData.confidence * 100).toFixed(0)}%
+                              {sentimentData.confidence !== null ? `${(sentimentData.confidence * 100).toFixed(0)}%` : 'N/A'}
                             </Typography>
                             <Typography variant="body2" color="text.secondary" sx={{ mt: 1 }}>
                               Last Updated: {formatDate(sentimentData.timestamp)}
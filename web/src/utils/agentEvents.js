@@ -0,0 +1,104 @@
+/**
+ * Live updates pushed by the agent over server-sent events
+ * One EventSource is shared by every subscribed page
+ */
+import { normalizeAgentArticle, normalizeAgentAnalysis, normalizeAgentSignal } from './api';
+
+const AGENT_API_URL = process.env.REACT_APP_AGENT_API_URL;
+
+// Number of analyses the agent returns on a full fetch (ResultStore max_analyses)
+const MAX_ANALYSES = 200;
+
+// Event types emitted by the agent and how to normalize their payloads
+const EVENT_NORMALIZERS = {
+  articles: normalizeAgentArticle,
+  sentiment: normalizeAgentAnalysis,
+  signals: normalizeAgentSignal,
+  resync: null,
+};
+
+let eventSource = null;
+const listeners = new Set();
+
+const handleEvent = (type) => (event) => {
+  let data;
+  try {
+    data = JSON.parse(event.data);
+  } catch (error) {
+    console.error(`Invalid ${type} event from agent:`, error);
+    return;
+  }
+
+  const normalize = EVENT_NORMALIZERS[type];
+  const payload = normalize ? data.map(normalize) : data;
+  listeners.forEach(listener => listener(type, payload));
+};
+
+/**
+ * Subscribe to agent updates
+ * @param {Function} listener - Called with (type, items) where type is 'articles', 'sentiment', 'signals' or 'resync'
+ * @returns {Function} - Unsubscribe function
+ */
+export const subscribeToAgentEvents = (listener) => {
+  if (!AGENT_API_URL || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  listeners.add(listener);
+
+  if (!eventSource) {
+    eventSource = new EventSource(`${AGENT_API_URL}/api/events`);
+    Object.keys(EVENT_NORMALIZERS).forEach(type => {
+      eventSource.addEventListener(type, handleEvent(type));
+    });
+    eventSource.onerror = () => {
+      // EventSource reconnects on its own and sends Last-Event-ID so the agent can ask for a resync
+      console.warn('Agent event stream interrupted, reconnecting...');
+    };
+  }
+
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && eventSource) {
+      eventSource.close();
+      eventSource = null;
+    }
+  };
+};
+
+/**
+ * Prepend new articles, skipping ones already shown
+ * @param {Array} current - Articles currently displayed
+ * @param {Array} incoming - Newly pushed articles
+ * @returns {Array} - Merged articles, newest first
+ */
+export const mergeArticles = (current, incoming) => {
+  const incomingIds = new Set(incoming.map(article => article.id));
+  return [...incoming, ...current.filter(article => !incomingIds.has(article.id))];
+};
+
+// One analysis per article; older agents don't send the article ID
+const analysisKey = (analysis) => analysis.article_id || `${analysis.source}|${analysis.headline}`;
+
+/**
+ * Prepend new sentiment analyses, replacing earlier ones for the same article
+ * @param {Array} current - Analyses currently displayed
+ * @param {Array} incoming - Newly pushed analyses
+ * @returns {Array} - Merged analyses, newest first, no more than a full fetch returns
+ */
+export const mergeAnalyses = (current, incoming) => {
+  const incomingKeys = new Set(incoming.map(analysisKey));
+  return [...incoming, ...current.filter(analysis => !incomingKeys.has(analysisKey(analysis)))]
+    .slice(0, MAX_ANALYSES);
+};
+
+/**
+ * Replace signals for cryptocurrencies that received a new one
+ * @param {Array} current - Signals currently displayed
+ * @param {Array} incoming - Newly pushed signals
+ * @returns {Array} - Merged signals, one per cryptocurrency
+ */
+export const mergeSignals = (current, incoming) => {
+  const updated = new Set(incoming.map(signal => signal.cryptocurrency));
+  return [...incoming, ...current.filter(signal => !updated.has(signal.cryptocurrency))];
+};
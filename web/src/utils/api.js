@@ -1,26 +1,24 @@
 import axios from 'axios';
 import { ethers } from 'ethers';
-import { getCachedData, setCachedData, hasCachedData, clearCacheItem, clearCache } from './cacheService';
+import { cachedFetch, clearCacheByPrefix, clearCache } from './cacheService';
 import { fetchAllRssArticles } from './rssService';
 import { fetchCryptoMarketData, fetchCryptoHistory } from './liveCoinWatchApi';
 import { getSymbolFromName } from './cryptoIcons';
+import { SENTIMENT_TRACKER_ABI, readSentimentSnapshot, clearSnapshots } from './chainReader';
 
 // Constants
 const OPENAI_API_KEY = process.env.REACT_APP_OPENAI_API_KEY;
+// Base URL of the agent's HTTP API (script/run_agent.py --serve), e.g. http://localhost:8000
+const AGENT_API_URL = process.env.REACT_APP_AGENT_API_URL;
 const CONTRACT_ADDRESS = '0x22633574A82ffC4d5d88ccAb7887799c188544e3';
 const POLYGON_AMOY_RPC = 'https://rpc-amoy.polygon.technology';
 const POLYGON_AMOY_EXPLORER = 'https://www.oklink.com/amoy/address';
 const MAX_RETRIES = 3;
 const RETRY_DELAY = 1000; // 1 second
-
-// ABI for the SentimentTracker contract
-const SENTIMENT_TRACKER_ABI = [
-  "function recordSentiment(string memory cryptocurrency, int8 sentiment, uint8 confidence) external",
-  "function getSentiment(string memory cryptocurrency) external view returns (int8 sentiment, uint8 confidence, uint256 timestamp)",
-  "function getAllCryptocurrencies() external view returns (string[] memory)",
-  "function getSentimentHistory(string memory cryptocurrency) external view returns (tuple(int8 sentiment, uint256 timestamp)[] memory)",
-  "function owner() external view returns (address)"
-];
+// Analyses of a given set of articles don't change; reuse them across reloads for 6 hours
+const OPENAI_CACHE_OPTIONS = { ttl: 6 * 60 * 60 * 1000, staleTtl: 0 };
+// Daily history is keyed by the hour it was requested in, so reloads within the hour hit the cache
+const HISTORY_KEY_RESOLUTION = 60 * 60 * 1000;
 
 // Top cryptocurrencies to focus on
 const TOP_CRYPTOCURRENCIES = [
@@ -48,9 +46,50 @@ const retryOperation = async (operation, maxRetries = MAX_RETRIES, delay = RETRY
   throw lastError;
 };
 
+// Add a symbol to each entity for icon display
+const withEntitySymbols = (analysis) => ({
+  ...analysis,
+  entities: analysis.entities.map(entity => {
+    if (typeof entity === 'object' && entity.name) {
+      return {
+        name: entity.name,
+        symbol: entity.symbol || getSymbolFromName(entity.name) || entity.name
+      };
+    }
+    return {
+      name: entity,
+      symbol: getSymbolFromName(entity) || entity
+    };
+  })
+});
+
+// Add a symbol for the cryptocurrency for icon display
+const withSignalSymbol = (signal) => ({
+  ...signal,
+  symbol: getSymbolFromName(signal.cryptocurrency) || signal.cryptocurrency
+});
+
+// Fetch precomputed results shared by all viewers from the agent's HTTP API.
+// The browser revalidates with If-None-Match using the ETag/Cache-Control headers the agent sends.
+const fetchAgentResource = async (resource) => {
+  const response = await axios.get(`${AGENT_API_URL}/api/${resource}`);
+  return response.data;
+};
+
+export const isAgentApiEnabled = () => Boolean(AGENT_API_URL);
+
+// Convert agent JSON (ISO date strings, bare entity names) into the shapes the pages use
+export const normalizeAgentArticle = (article) => ({ ...article, published: new Date(article.published) });
+export const normalizeAgentAnalysis = (analysis) => withEntitySymbols({ ...analysis, timestamp: new Date(analysis.timestamp) });
+export const normalizeAgentSignal = (signal) => withSignalSymbol({ ...signal, timestamp: new Date(signal.timestamp) });
+
 // News Service - Updated to use RSS service with caching
 export const fetchNewsArticles = async () => {
   try {
+    if (AGENT_API_URL) {
+      const articles = await fetchAgentResource('articles');
+      return articles.map(normalizeAgentArticle);
+    }
     return await fetchAllRssArticles(20);
   } catch (error) {
     console.error('Error fetching news articles:', error);
@@ -60,6 +99,12 @@ export const fetchNewsArticles = async () => {
 
 // AI Service - Updated to use caching
 export const analyzeSentiment = async (articles) => {
+  if (AGENT_API_URL) {
+    // The agent has already analyzed the latest articles; reuse its results
+    const analyses = await fetchAgentResource('sentiment');
+    return analyses.map(normalizeAgentAnalysis);
+  }
+
   if (!OPENAI_API_KEY) {
     console.error('OpenAI API key is missing');
     throw new Error('OpenAI API key is missing');
@@ -73,12 +118,7 @@ export const analyzeSentiment = async (articles) => {
   const articleIds = articles.map(a => a.id).join('_');
   const cacheKey = `sentiment_analysis_${articleIds}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
-  return retryOperation(async () => {
+  return cachedFetch(cacheKey, () => retryOperation(async () => {
     const response = await axios.post(
       'https://api.openai.com/v1/chat/completions',
       {
@@ -161,33 +201,22 @@ export const analyzeSentiment = async (articles) => {
     
     const result = JSON.parse(response.data.choices[0].message.function_call.arguments);
     
-    const analyses = result.analyses.map(analysis => ({
+    const analyses = result.analyses.map(analysis => withEntitySymbols({
       ...analysis,
-      timestamp: new Date(),
-      // Add symbol for each entity for icon display
-      entities: analysis.entities.map(entity => {
-        if (typeof entity === 'object' && entity.name) {
-          return {
-            name: entity.name,
-            symbol: entity.symbol || getSymbolFromName(entity.name) || entity.name
-          };
-        }
-        return {
-          name: entity,
-          symbol: getSymbolFromName(entity) || entity
-        };
-      })
+      timestamp: new Date()
     }));
     
-    // Cache the result
-    setCachedData(cacheKey, analyses);
-    
     return analyses;
-  });
+  }), OPENAI_CACHE_OPTIONS);
 };
 
 // Trading Signals - Updated to use caching
 export const generateTradingSignals = async (sentimentAnalyses) => {
+  if (AGENT_API_URL) {
+    const signals = await fetchAgentResource('signals');
+    return signals.map(normalizeAgentSignal);
+  }
+
   if (!OPENAI_API_KEY) {
     console.error('OpenAI API key is missing');
     throw new Error('OpenAI API key is missing');
@@ -201,12 +230,7 @@ export const generateTradingSignals = async (sentimentAnalyses) => {
   const analysisTimes = sentimentAnalyses.map(a => a.timestamp?.getTime()).join('_');
   const cacheKey = `trading_signals_${analysisTimes}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
-  return retryOperation(async () => {
+  return cachedFetch(cacheKey, () => retryOperation(async () => {
     const response = await axios.post(
       'https://api.openai.com/v1/chat/completions',
       {
@@ -290,18 +314,13 @@ export const generateTradingSignals = async (sentimentAnalyses) => {
     
     const result = JSON.parse(response.data.choices[0].message.function_call.arguments);
     
-    const signals = result.signals.map(signal => ({
+    const signals = result.signals.map(signal => withSignalSymbol({
       ...signal,
-      timestamp: new Date(),
-      // Add symbol for cryptocurrency for icon display
-      symbol: getSymbolFromName(signal.cryptocurrency) || signal.cryptocurrency
+      timestamp: new Date()
     }));
     
-    // Cache the result
-    setCachedData(cacheKey, signals);
-    
     return signals;
-  });
+  }), OPENAI_CACHE_OPTIONS);
 };
 
 // Fetch market data for cryptocurrencies
@@ -322,7 +341,7 @@ export const fetchMarketData = async (cryptos = TOP_CRYPTOCURRENCIES) => {
 export const fetchHistoricalData = async (crypto, days = 30) => {
   try {
     const symbol = getSymbolFromName(crypto) || crypto;
-    const end = Date.now();
+    const end = Math.floor(Date.now() / HISTORY_KEY_RESOLUTION) * HISTORY_KEY_RESOLUTION;
     const start = end - (days * 24 * 60 * 60 * 1000);
     
     return await fetchCryptoHistory(symbol, 'USD', start, end, '1d');
@@ -332,25 +351,25 @@ export const fetchHistoricalData = async (crypto, days = 30) => {
   }
 };
 
-// Clear cache for specific data type
+// Clear cache for specific data type (cache keys embed feed IDs, article IDs and codes, so clear by prefix)
 export const refreshData = (dataType) => {
   switch (dataType) {
     case 'news':
       // Clear all RSS feed caches
-      clearCacheItem('rss_all_feeds');
+      clearCacheByPrefix('rss_');
       break;
     case 'sentiment':
       // Clear sentiment analysis cache
-      clearCacheItem('sentiment_analysis');
+      clearCacheByPrefix('sentiment_analysis_');
       break;
     case 'signals':
       // Clear trading signals cache
-      clearCacheItem('trading_signals');
+      clearCacheByPrefix('trading_signals_');
       break;
     case 'market':
       // Clear market data cache
-      clearCacheItem('lcw_market');
-      clearCacheItem('lcw_overview');
+      clearCacheByPrefix('lcw_market_');
+      clearCacheByPrefix('lcw_overview_');
       break;
     case 'all':
       // Clear all caches
@@ -371,27 +390,51 @@ export const getContract = (provider) => {
   return new ethers.Contract(CONTRACT_ADDRESS, SENTIMENT_TRACKER_ABI, provider);
 };
 
-// Get all cryptocurrencies from the contract
+// Read the tracked cryptocurrencies from the contract in one batched request, cached per block
+const readTrackedSentiment = (includeHistory = false) => readSentimentSnapshot(TOP_CRYPTOCURRENCIES, {
+  rpcUrl: POLYGON_AMOY_RPC,
+  contractAddress: CONTRACT_ADDRESS,
+  includeHistory
+});
+
+// Get the tracked cryptocurrencies that have sentiment recorded on the contract
+// (the contract has no list of names, so only tracked ones can be discovered)
 export const getAllCryptocurrencies = async (provider) => {
-  const contract = getContract(provider);
   try {
-    return await contract.getAllCryptocurrencies();
+    const snapshot = await readTrackedSentiment();
+    return TOP_CRYPTOCURRENCIES.filter(crypto => snapshot.assets[crypto].latest);
   } catch (error) {
     console.error('Error getting all cryptocurrencies:', error);
     return [];
   }
 };
 
-// Get sentiment for a cryptocurrency
+// Get the latest sentiment for every tracked cryptocurrency, and optionally their histories
+export const getSentimentSnapshot = async (includeHistory = false) => {
+  try {
+    return await readTrackedSentiment(includeHistory);
+  } catch (error) {
+    console.error('Error reading sentiment snapshot:', error);
+    return null;
+  }
+};
+
+// Get sentiment for a cryptocurrency (confidence isn't stored on chain)
 export const getSentiment = async (provider, cryptocurrency) => {
-  const contract = getContract(provider);
   try {
-    const [sentiment, confidence, timestamp] = await contract.getSentiment(cryptocurrency);
-    return {
-      sentiment: Number(sentiment),
-      confidence: Number(confidence),
-      timestamp: new Date(Number(timestamp) * 1000)
-    };
+    const snapshot = await readTrackedSentiment();
+    const entry = snapshot.assets[cryptocurrency];
+    if (entry) {
+      return entry.latest ? { ...entry.latest, confidence: null } : null;
+    }
+
+    // Not a tracked cryptocurrency; read it on its own
+    const single = await readSentimentSnapshot([cryptocurrency], {
+      rpcUrl: POLYGON_AMOY_RPC,
+      contractAddress: CONTRACT_ADDRESS
+    });
+    const { latest } = single.assets[cryptocurrency];
+    return latest ? { ...latest, confidence: null } : null;
   } catch (error) {
     console.error(`Error getting sentiment for ${cryptocurrency}:`, error);
     return null;
@@ -400,32 +443,33 @@ export const getSentiment = async (provider, cryptocurrency) => {
 
 // Get sentiment history for a cryptocurrency
 export const getSentimentHistory = async (provider, cryptocurrency) => {
-  const contract = getContract(provider);
   try {
-    const history = await contract.getSentimentHistory(cryptocurrency);
-    return history.map(item => ({
-      sentiment: Number(item.sentiment),
-      timestamp: new Date(Number(item.timestamp) * 1000)
-    }));
+    const assets = TOP_CRYPTOCURRENCIES.includes(cryptocurrency) ? TOP_CRYPTOCURRENCIES : [cryptocurrency];
+    const snapshot = await readSentimentSnapshot(assets, {
+      rpcUrl: POLYGON_AMOY_RPC,
+      contractAddress: CONTRACT_ADDRESS,
+      includeHistory: true
+    });
+    return snapshot.assets[cryptocurrency].history;
   } catch (error) {
     console.error(`Error getting sentiment history for ${cryptocurrency}:`, error);
     return [];
   }
 };
 
-// Record sentiment for a cryptocurrency
+// Record sentiment for a cryptocurrency (the contract stores the score and a timestamp, not confidence)
 export const recordSentiment = async (signer, cryptocurrency, sentimentScore, confidence) => {
   const contract = new ethers.Contract(CONTRACT_ADDRESS, SENTIMENT_TRACKER_ABI, signer);
   
   try {
     // Convert sentiment score from -1.0 to 1.0 range to -100 to 100 range
-    const sentimentInt = Math.round(sentimentScore * 100);
-    
-    // Convert confidence from 0.0 to 1.0 range to 0 to 100 range
-    const confidenceInt = Math.round(confidence * 100);
+    const sentimentInt = Math.max(-100, Math.min(100, Math.round(sentimentScore * 100)));
+    const timestamp = Math.floor(Date.now() / 1000);
     
-    const tx = await contract.recordSentiment(cryptocurrency, sentimentInt, confidenceInt);
-    return await tx.wait();
+    const tx = await contract.record_sentiment(cryptocurrency, sentimentInt, timestamp);
+    const receipt = await tx.wait();
+    clearSnapshots();
+    return receipt;
   } catch (error) {
     console.error(`Error recording sentiment for ${cryptocurrency}:`, error);
     throw error;
@@ -439,6 +483,7 @@ export const getExplorerUrl = (address) => {
 
 // Default export
 const apiService = {
+  isAgentApiEnabled,
   fetchNewsArticles,
   analyzeSentiment,
   generateTradingSignals,
@@ -449,6 +494,7 @@ const apiService = {
   getContract,
   getAllCryptocurrencies,
   getSentiment,
+  getSentimentSnapshot,
   getSentimentHistory,
   recordSentiment,
   getExplorerUrl
@@ -1,46 +1,205 @@
 /**
  * Cache service for API responses
- * Caches data for 2 minutes or until manually invalidated
+ *
+ * Two tiers:
+ * - an in-memory LRU bounded to MAX_ENTRIES items, each with its own TTL
+ * - an IndexedDB tier that survives reloads, so repeat visits render from cache
+ *
+ * cachedFetch() serves fresh entries directly, serves stale entries (within
+ * their stale window) while refreshing them in the background, and shares one
+ * in-flight request between concurrent callers of the same key.
  */
 
-// Cache storage
+// Maximum number of entries kept in memory
+const MAX_ENTRIES = 200;
+
+// Default time an entry is fresh (2 minutes)
+const DEFAULT_TTL = 2 * 60 * 1000;
+
+// Default time after expiry during which a stale entry may still be served (1 hour)
+const DEFAULT_STALE_TTL = 60 * 60 * 1000;
+
+const DB_NAME = 'vypersense-cache';
+const DB_VERSION = 1;
+const STORE_NAME = 'entries';
+
+// Memory tier; Map iteration order doubles as recency order (oldest first)
 const cache = new Map();
 
-// Cache expiration time in milliseconds (2 minutes)
-const CACHE_EXPIRATION = 2 * 60 * 1000;
+// Pending fetches by key, shared by concurrent callers
+const inFlight = new Map();
 
-/**
- * Get data from cache
- * @param {string} key - Cache key
- * @returns {any|null} - Cached data or null if not found or expired
- */
-export const getCachedData = (key) => {
-  if (!cache.has(key)) {
+let dbPromise = null;
+
+// Open the IndexedDB tier once; resolves to null where IndexedDB is unavailable
+const openDatabase = () => {
+  if (dbPromise) {
+    return dbPromise;
+  }
+
+  dbPromise = new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') {
+      resolve(null);
+      return;
+    }
+
+    try {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      request.onupgradeneeded = () => {
+        request.result.createObjectStore(STORE_NAME, { keyPath: 'key' });
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.error('Error opening cache database:', request.error);
+        resolve(null);
+      };
+    } catch (error) {
+      console.error('Error opening cache database:', error);
+      resolve(null);
+    }
+  });
+
+  return dbPromise;
+};
+
+// Run one request against the object store; resolves to its result, or null on failure
+const withStore = async (mode, operation) => {
+  const db = await openDatabase();
+  if (!db) {
     return null;
   }
 
-  const cachedItem = cache.get(key);
-  const now = Date.now();
+  return new Promise((resolve) => {
+    try {
+      const transaction = db.transaction(STORE_NAME, mode);
+      const request = operation(transaction.objectStore(STORE_NAME));
+      transaction.oncomplete = () => resolve(request ? request.result : null);
+      transaction.onerror = () => {
+        console.error('Cache database error:', transaction.error);
+        resolve(null);
+      };
+    } catch (error) {
+      console.error('Cache database error:', error);
+      resolve(null);
+    }
+  });
+};
+
+// Key range covering every key that starts with prefix
+const prefixRange = (prefix) => IDBKeyRange.bound(prefix, `${prefix}\uffff`);
+
+const isFresh = (entry, now = Date.now()) => now - entry.storedAt <= entry.ttl;
+
+const isUsable = (entry, now = Date.now()) => now - entry.storedAt <= entry.ttl + entry.staleTtl;
+
+// Insert into the memory tier as most recently used, evicting the least recently used
+const remember = (entry) => {
+  cache.delete(entry.key);
+  cache.set(entry.key, entry);
+
+  while (cache.size > MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value);
+  }
+};
+
+// Look up an entry in memory, marking it as recently used
+const recall = (key) => {
+  const entry = cache.get(key);
+  if (!entry) {
+    return null;
+  }
 
-  // Check if cache has expired
-  if (now - cachedItem.timestamp > CACHE_EXPIRATION) {
+  if (!isUsable(entry)) {
     cache.delete(key);
     return null;
   }
 
-  return cachedItem.data;
+  remember(entry);
+  return entry;
+};
+
+// Look up an entry in memory, then in IndexedDB
+const lookup = async (key) => {
+  const entry = recall(key);
+  if (entry) {
+    return entry;
+  }
+
+  const stored = await withStore('readonly', store => store.get(key));
+  if (!stored || !isUsable(stored)) {
+    return null;
+  }
+
+  remember(stored);
+  return stored;
+};
+
+/**
+ * Get data from cache
+ * @param {string} key - Cache key
+ * @returns {any|null} - Cached data or null if not in memory or expired
+ */
+export const getCachedData = (key) => {
+  const entry = recall(key);
+  return entry && isFresh(entry) ? entry.data : null;
 };
 
 /**
  * Set data in cache
  * @param {string} key - Cache key
- * @param {any} data - Data to cache
+ * @param {any} data - Data to cache (must be structured-cloneable to persist)
+ * @param {Object} options - ttl and staleTtl in milliseconds, persist to also store in IndexedDB
  */
-export const setCachedData = (key, data) => {
-  cache.set(key, {
-    data,
-    timestamp: Date.now(),
-  });
+export const setCachedData = (key, data, { ttl = DEFAULT_TTL, staleTtl = DEFAULT_STALE_TTL, persist = true } = {}) => {
+  const entry = { key, data, storedAt: Date.now(), ttl, staleTtl };
+  remember(entry);
+
+  if (persist) {
+    withStore('readwrite', store => store.put(entry));
+  }
+};
+
+/**
+ * Fetch through the cache
+ *
+ * Fresh entries are returned without a request. Stale entries are returned
+ * immediately and refreshed in the background. Otherwise the fetcher runs,
+ * shared with any caller already waiting on the same key.
+ *
+ * @param {string} key - Cache key
+ * @param {Function} fetcher - Async function producing the data
+ * @param {Object} options - ttl, staleTtl and persist, as for setCachedData
+ * @returns {Promise<any>} - Cached or fetched data
+ */
+export const cachedFetch = async (key, fetcher, options = {}) => {
+  const revalidate = () => {
+    if (inFlight.has(key)) {
+      return inFlight.get(key);
+    }
+
+    const promise = (async () => {
+      try {
+        const data = await fetcher();
+        setCachedData(key, data, options);
+        return data;
+      } finally {
+        inFlight.delete(key);
+      }
+    })();
+
+    inFlight.set(key, promise);
+    return promise;
+  };
+
+  const entry = await lookup(key);
+  if (entry) {
+    if (!isFresh(entry)) {
+      revalidate().catch(error => console.error(`Error revalidating ${key}:`, error));
+    }
+    return entry.data;
+  }
+
+  return revalidate();
 };
 
 /**
@@ -48,6 +207,7 @@ export const setCachedData = (key, data) => {
  */
 export const clearCache = () => {
   cache.clear();
+  withStore('readwrite', store => store.clear());
 };
 
 /**
@@ -56,10 +216,22 @@ export const clearCache = () => {
  */
 export const clearCacheItem = (key) => {
   cache.delete(key);
+  withStore('readwrite', store => store.delete(key));
 };
 
 /**
- * Get all cache keys
+ * Clear every cached item whose key starts with a prefix
+ * @param {string} prefix - Key prefix, e.g. 'rss_feed_'
+ */
+export const clearCacheByPrefix = (prefix) => {
+  Array.from(cache.keys())
+    .filter(key => key.startsWith(prefix))
+    .forEach(key => cache.delete(key));
+  withStore('readwrite', store => store.delete(prefixRange(prefix)));
+};
+
+/**
+ * Get all cache keys held in memory
  * @returns {string[]} - Array of cache keys
  */
 export const getCacheKeys = () => {
@@ -67,10 +239,28 @@ export const getCacheKeys = () => {
 };
 
 /**
- * Check if cache has a valid (non-expired) item
+ * Check if cache has a valid (non-expired) item in memory
  * @param {string} key - Cache key
  * @returns {boolean} - True if cache has valid item
  */
 export const hasCachedData = (key) => {
   return getCachedData(key) !== null;
-}; 
\ No newline at end of file
+};
+
+// Drop persisted entries that are past their stale window
+const pruneExpired = () => withStore('readwrite', (store) => {
+  const request = store.openCursor();
+  request.onsuccess = () => {
+    const cursor = request.result;
+    if (!cursor) {
+      return;
+    }
+    if (!isUsable(cursor.value)) {
+      cursor.delete();
+    }
+    cursor.continue();
+  };
+  return null;
+});
+
+pruneExpired();
@@ -0,0 +1,172 @@
+import axios from 'axios';
+import { ethers } from 'ethers';
+
+/**
+ * Batched reads of the SentimentTracker contract
+ *
+ * Every view call for every asset goes out as one JSON-RPC batch of eth_call
+ * requests pinned to a single block, so all values come from the same chain
+ * state. Results are cached by block number: until a new block arrives, reads
+ * are served from memory and only the cheap eth_blockNumber poll hits the node.
+ */
+
+// ABI of src/SentimentTracker.vy, as deployed (see contract_detail.py)
+export const SENTIMENT_TRACKER_ABI = [
+  "event SentimentRecorded(string cryptocurrency, int128 sentiment, uint256 timestamp)",
+  "function record_sentiment(string cryptocurrency, int128 sentiment, uint256 timestamp)",
+  "function get_sentiment_history(string cryptocurrency) view returns (tuple(int128 sentiment, uint256 timestamp)[])",
+  "function get_latest_sentiment(string cryptocurrency) view returns (int128, uint256)",
+  "function get_average_sentiment(string cryptocurrency, uint256 time_period) view returns (int128)",
+  "function name() view returns (string)",
+  "function owner() view returns (address)"
+];
+
+// The contract stores sentiment scores multiplied by 100
+const SENTIMENT_SCALE = 100;
+
+// Polygon produces a block about every 2 seconds; don't ask for the block number more often
+const BLOCK_POLL_INTERVAL = 2000;
+
+// Snapshots kept per contract and asset set, newest last
+const MAX_SNAPSHOTS = 20;
+
+const trackerInterface = new ethers.Interface(SENTIMENT_TRACKER_ABI);
+
+// rpcUrl -> { blockNumber, checkedAt, promise }
+const blockCache = new Map();
+
+// `${rpcUrl}|${contractAddress}|${blockNumber}|${assets}|${history}` -> Promise of a snapshot
+const snapshots = new Map();
+
+let nextRequestId = 1;
+
+// Send one JSON-RPC batch and return the responses in request order
+const sendBatch = async (rpcUrl, calls) => {
+  const requests = calls.map(({ method, params }) => ({
+    jsonrpc: '2.0',
+    id: nextRequestId++,
+    method,
+    params
+  }));
+
+  const response = await axios.post(rpcUrl, requests, {
+    headers: { 'content-type': 'application/json' }
+  });
+
+  // Batch responses may arrive in any order
+  const byId = new Map((Array.isArray(response.data) ? response.data : [response.data])
+    .map(item => [item.id, item]));
+  return requests.map(request => byId.get(request.id) || { error: { message: 'Missing response' } });
+};
+
+/**
+ * Get the latest block number, polling the node at most every BLOCK_POLL_INTERVAL
+ * @param {string} rpcUrl - JSON-RPC endpoint
+ * @returns {Promise<number>} - Latest block number
+ */
+export const getBlockNumber = async (rpcUrl) => {
+  const cached = blockCache.get(rpcUrl);
+  if (cached && Date.now() - cached.checkedAt < BLOCK_POLL_INTERVAL) {
+    return cached.promise;
+  }
+
+  const promise = sendBatch(rpcUrl, [{ method: 'eth_blockNumber', params: [] }])
+    .then(([response]) => {
+      if (response.error) {
+        throw new Error(response.error.message);
+      }
+      return Number(response.result);
+    });
+
+  blockCache.set(rpcUrl, { checkedAt: Date.now(), promise });
+  promise.catch(() => blockCache.delete(rpcUrl));
+  return promise;
+};
+
+// Decode one eth_call response, or return null if the call reverted or failed
+const decodeCall = (functionName, response) => {
+  if (response.error || !response.result || response.result === '0x') {
+    return null;
+  }
+  try {
+    return trackerInterface.decodeFunctionResult(functionName, response.result);
+  } catch (error) {
+    console.error(`Error decoding ${functionName}:`, error);
+    return null;
+  }
+};
+
+const toRecord = (sentiment, timestamp) => ({
+  sentiment: Number(sentiment) / SENTIMENT_SCALE,
+  timestamp: new Date(Number(timestamp) * 1000)
+});
+
+const readBlock = async (rpcUrl, contractAddress, blockNumber, assets, includeHistory) => {
+  const blockTag = ethers.toQuantity(blockNumber);
+  const call = (functionName, args = []) => ({
+    method: 'eth_call',
+    params: [
+      { to: contractAddress, data: trackerInterface.encodeFunctionData(functionName, args) },
+      blockTag
+    ]
+  });
+
+  const calls = assets.map(asset => call('get_latest_sentiment', [asset]));
+  if (includeHistory) {
+    calls.push(...assets.map(asset => call('get_sentiment_history', [asset])));
+  }
+
+  const responses = await sendBatch(rpcUrl, calls);
+
+  const data = {};
+  assets.forEach((asset, index) => {
+    const latest = decodeCall('get_latest_sentiment', responses[index]);
+    const entry = {
+      // (0, 0) means nothing has been recorded for the asset
+      latest: latest && Number(latest[1]) > 0 ? toRecord(latest[0], latest[1]) : null
+    };
+
+    if (includeHistory) {
+      const history = decodeCall('get_sentiment_history', responses[assets.length + index]);
+      entry.history = history ? history[0].map(item => toRecord(item.sentiment, item.timestamp)) : [];
+    }
+
+    data[asset] = entry;
+  });
+
+  return { blockNumber, assets: data };
+};
+
+/**
+ * Read the latest sentiment (and optionally the history) of several assets in one batched request
+ * @param {string[]} assets - Cryptocurrency names as recorded on chain (e.g. 'Bitcoin')
+ * @param {Object} options - rpcUrl and contractAddress, includeHistory to also read full histories
+ * @returns {Promise<Object>} - { blockNumber, assets: { [name]: { latest, history? } } }, where
+ *   latest is { sentiment, timestamp } or null and sentiment is between -1 and 1
+ */
+export const readSentimentSnapshot = async (assets, { rpcUrl, contractAddress, includeHistory = false }) => {
+  const blockNumber = await getBlockNumber(rpcUrl);
+  const key = [rpcUrl, contractAddress.toLowerCase(), blockNumber, assets.join(','), includeHistory].join('|');
+
+  if (snapshots.has(key)) {
+    return snapshots.get(key);
+  }
+
+  const promise = readBlock(rpcUrl, contractAddress, blockNumber, assets, includeHistory);
+  snapshots.set(key, promise);
+  promise.catch(() => snapshots.delete(key));
+
+  while (snapshots.size > MAX_SNAPSHOTS) {
+    snapshots.delete(snapshots.keys().next().value);
+  }
+
+  return promise;
+};
+
+/**
+ * Drop cached snapshots, e.g. after recording a new sentiment
+ */
+export const clearSnapshots = () => {
+  snapshots.clear();
+  blockCache.clear();
+};
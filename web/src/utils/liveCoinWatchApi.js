@@ -1,5 +1,11 @@
 import axios from 'axios';
-import { getCachedData, setCachedData, hasCachedData } from './cacheService';
+import { cachedFetch } from './cacheService';
+
+// Prices are fresh for a minute and may be shown stale for 10 minutes while they refresh
+const MARKET_CACHE_OPTIONS = { ttl: 60 * 1000, staleTtl: 10 * 60 * 1000 };
+
+// Closed history candles don't change; keep them for an hour, usable for a day
+const HISTORY_CACHE_OPTIONS = { ttl: 60 * 60 * 1000, staleTtl: 24 * 60 * 60 * 1000 };
 
 // LiveCoinWatch API base URL
 const LCW_API_BASE_URL = 'https://api.livecoinwatch.com';
@@ -25,32 +31,26 @@ const lcwAxios = axios.create({
 export const fetchCryptoOverview = async (codes = [], currency = 'USD') => {
   const cacheKey = `lcw_overview_${codes.join('_')}_${currency}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
   try {
-    const response = await lcwAxios.post('/coins/list', {
-      currency,
-      sort: 'rank',
-      order: 'ascending',
-      offset: 0,
-      limit: 50,
-      meta: true,
-    });
-    
-    let result = response.data;
-    
-    // Filter by codes if provided
-    if (codes.length > 0) {
-      result = result.filter(coin => codes.includes(coin.code));
-    }
-    
-    // Cache the result
-    setCachedData(cacheKey, result);
-    
-    return result;
+    return await cachedFetch(cacheKey, async () => {
+      const response = await lcwAxios.post('/coins/list', {
+        currency,
+        sort: 'rank',
+        order: 'ascending',
+        offset: 0,
+        limit: 50,
+        meta: true,
+      });
+      
+      let result = response.data;
+      
+      // Filter by codes if provided
+      if (codes.length > 0) {
+        result = result.filter(coin => codes.includes(coin.code));
+      }
+      
+      return result;
+    }, MARKET_CACHE_OPTIONS);
   } catch (error) {
     console.error('Error fetching crypto overview:', error);
     throw error;
@@ -66,22 +66,15 @@ export const fetchCryptoOverview = async (codes = [], currency = 'USD') => {
 export const fetchCryptoData = async (code, currency = 'USD') => {
   const cacheKey = `lcw_crypto_${code}_${currency}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
   try {
-    const response = await lcwAxios.post('/coins/single', {
-      currency,
-      code,
-      meta: true,
-    });
-    
-    // Cache the result
-    setCachedData(cacheKey, response.data);
-    
-    return response.data;
+    return await cachedFetch(cacheKey, async () => {
+      const response = await lcwAxios.post('/coins/single', {
+        currency,
+        code,
+        meta: true,
+      });
+      return response.data;
+    }, MARKET_CACHE_OPTIONS);
   } catch (error) {
     console.error(`Error fetching data for ${code}:`, error);
     throw error;
@@ -100,24 +93,17 @@ export const fetchCryptoData = async (code, currency = 'USD') => {
 export const fetchCryptoHistory = async (code, currency = 'USD', start, end, interval = '1d') => {
   const cacheKey = `lcw_history_${code}_${currency}_${start}_${end}_${interval}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
   try {
-    const response = await lcwAxios.post('/coins/single/history', {
-      currency,
-      code,
-      start,
-      end,
-      interval,
-    });
-    
-    // Cache the result
-    setCachedData(cacheKey, response.data);
-    
-    return response.data;
+    return await cachedFetch(cacheKey, async () => {
+      const response = await lcwAxios.post('/coins/single/history', {
+        currency,
+        code,
+        start,
+        end,
+        interval,
+      });
+      return response.data;
+    }, HISTORY_CACHE_OPTIONS);
   } catch (error) {
     console.error(`Error fetching history for ${code}:`, error);
     throw error;
@@ -133,33 +119,27 @@ export const fetchCryptoHistory = async (code, currency = 'USD', start, end, int
 export const fetchCryptoMarketData = async (codes = [], currency = 'USD') => {
   const cacheKey = `lcw_market_${codes.join('_')}_${currency}`;
   
-  // Check cache first
-  if (hasCachedData(cacheKey)) {
-    return getCachedData(cacheKey);
-  }
-  
   try {
-    const response = await lcwAxios.post('/coins/list', {
-      currency,
-      sort: 'rank',
-      order: 'ascending',
-      offset: 0,
-      limit: 50,
-      meta: true,
-      delta: '24h',
-    });
-    
-    let result = response.data;
-    
-    // Filter by codes if provided
-    if (codes.length > 0) {
-      result = result.filter(coin => codes.includes(coin.code));
-    }
-    
-    // Cache the result
-    setCachedData(cacheKey, result);
-    
-    return result;
+    return await cachedFetch(cacheKey, async () => {
+      const response = await lcwAxios.post('/coins/list', {
+        currency,
+        sort: 'rank',
+        order: 'ascending',
+        offset: 0,
+        limit: 50,
+        meta: true,
+        delta: '24h',
+      });
+      
+      let result = response.data;
+      
+      // Filter by codes if provided
+      if (codes.length > 0) {
+        result = result.filter(coin => codes.includes(coin.code));
+      }
+      
+      return result;
+    }, MARKET_CACHE_OPTIONS);
   } catch (error) {
     console.error('Error fetching crypto market data:', error);
     throw error;
@@ -1,5 +1,8 @@
 import axios from 'axios';
-import { getCachedData, setCachedData, hasCachedData, clearCacheItem } from './cacheService';
+import { cachedFetch } from './cacheService';
+
+// Feeds are fresh for 5 minutes and may be shown stale for a day while they refresh
+const RSS_CACHE_OPTIONS = { ttl: 5 * 60 * 1000, staleTtl: 24 * 60 * 60 * 1000 };
 
 // Default RSS feeds
 const DEFAULT_RSS_FEEDS = [
@@ -83,31 +86,25 @@ export const removeRssFeed = (feedId) => {
 export const fetchFeedArticles = async (feed) => {
   const cacheKey = `rss_feed_${feed.id}`;
   
-  // Clear the cache to ensure we get fresh data
-  clearCacheItem(cacheKey);
-  
   try {
-    // Use rss2json.com API to convert RSS to JSON
-    const response = await axios.get(`https://api.rss2json.com/v1/api.json?rss_url=${encodeURIComponent(feed.url)}`);
-    
-    if (!response.data || response.data.status !== 'ok') {
-      throw new Error(`Failed to fetch RSS feed: ${feed.url}`);
-    }
-    
-    const articles = response.data.items.map(item => ({
-      id: item.guid || item.link,
-      title: item.title,
-      summary: item.description,
-      link: item.link,
-      published: new Date(item.pubDate),
-      source: feed.name,
-      imageUrl: item.thumbnail || item.enclosure?.url || null,
-    }));
-    
-    // Cache the result
-    setCachedData(cacheKey, articles);
-    
-    return articles;
+    return await cachedFetch(cacheKey, async () => {
+      // Use rss2json.com API to convert RSS to JSON
+      const response = await axios.get(`https://api.rss2json.com/v1/api.json?rss_url=${encodeURIComponent(feed.url)}`);
+      
+      if (!response.data || response.data.status !== 'ok') {
+        throw new Error(`Failed to fetch RSS feed: ${feed.url}`);
+      }
+      
+      return response.data.items.map(item => ({
+        id: item.guid || item.link,
+        title: item.title,
+        summary: item.description,
+        link: item.link,
+        published: new Date(item.pubDate),
+        source: feed.name,
+        imageUrl: item.thumbnail || item.enclosure?.url || null,
+      }));
+    }, RSS_CACHE_OPTIONS);
   } catch (error) {
     console.error(`Error fetching RSS feed ${feed.name}:`, error);
     return [];
@@ -121,28 +118,19 @@ export const fetchFeedArticles = async (feed) => {
  */
 export const fetchAllRssArticles = async (limit = 10) => {
   const feeds = getRssFeeds();
-  const cacheKey = `rss_all_feeds_${feeds.map(f => f.id).join('_')}_${limit}`;
-  
-  // Clear the cache to ensure we get fresh data
-  clearCacheItem(cacheKey);
   
   try {
-    // Fetch articles from all feeds in parallel
+    // Fetch articles from all feeds in parallel; each feed is cached on its own
     const articlesPromises = feeds.map(feed => fetchFeedArticles(feed));
     const articlesArrays = await Promise.all(articlesPromises);
     
     // Flatten and sort by date (newest first)
-    const allArticles = articlesArrays
+    return articlesArrays
       .flat()
       .sort((a, b) => b.published - a.published)
       .slice(0, limit);
-    
-    // Cache the result
-    setCachedData(cacheKey, allArticles);
-    
-    return allArticles;
   } catch (error) {
     console.error('Error fetching all RSS feeds:', error);
     return [];
   }
-}; 
\ No newline at end of file
+};